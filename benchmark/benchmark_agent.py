@@ -1,8 +1,14 @@
-from openai import pydantic_function_tool
 from openai.types.chat import ChatCompletionFunctionToolParam
 
 from examples.sgr_deep_research.agents import ResearchSGRToolCallingAgent
-from sgr_agent_core.tools import ExtractPageContentTool, FinalAnswerTool, ReasoningTool, WebSearchTool
+from sgr_agent_core.tools import (
+    BatchWebSearchTool,
+    ExtractPageContentTool,
+    FinalAnswerTool,
+    ReasoningTool,
+    WebSearchTool,
+    function_tools,
+)
 
 
 class BenchmarkAgent(ResearchSGRToolCallingAgent):
@@ -34,9 +40,10 @@ class BenchmarkAgent(ResearchSGRToolCallingAgent):
         if self._context.searches_used >= self.max_searches:
             tools -= {
                 WebSearchTool,
+                BatchWebSearchTool,
             }
 
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return function_tools(tools, description="")
 
     async def execute(
         self,
@@ -7,7 +7,7 @@ generating report files.
 
 from typing import Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionFunctionToolParam
 
 from sgr_agent_core.agent_config import AgentConfig
@@ -16,6 +16,7 @@ from sgr_agent_core.agents.sgr_tool_calling_agent import SGRToolCallingAgent
 from sgr_agent_core.agents.tool_calling_agent import ToolCallingAgent
 from sgr_agent_core.tools import (
     BaseTool,
+    BatchWebSearchTool,
     ClarificationTool,
     ExtractPageContentTool,
     FinalAnswerTool,
@@ -23,6 +24,7 @@ from sgr_agent_core.tools import (
     NextStepToolStub,
     ReasoningTool,
     WebSearchTool,
+    function_tools,
 )
 
 
@@ -64,6 +66,7 @@ class ResearchSGRAgentNoReporting(SGRAgent):
         if self._context.searches_used >= self.config.search.max_searches:
             tools -= {
                 WebSearchTool,
+                BatchWebSearchTool,
             }
         return NextStepToolsBuilder.build_NextStepTools(list(tools))
 
@@ -106,8 +109,9 @@ class ResearchToolCallingAgentNoReporting(ToolCallingAgent):
         if self._context.searches_used >= self.config.search.max_searches:
             tools -= {
                 WebSearchTool,
+                BatchWebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return function_tools(tools, description="")
 
 
 class ResearchSGRToolCallingAgentNoReporting(SGRToolCallingAgent):
@@ -149,5 +153,6 @@ class ResearchSGRToolCallingAgentNoReporting(SGRToolCallingAgent):
         if self._context.searches_used >= self.config.search.max_searches:
             tools -= {
                 WebSearchTool,
+                BatchWebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return function_tools(tools, description="")
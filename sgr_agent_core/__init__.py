@@ -13,21 +13,25 @@ from sgr_agent_core.agent_config import GlobalConfig
 from sgr_agent_core.agent_definition import (
     AgentConfig,
     AgentDefinition,
+    AgentStoreConfig,
     ExecutionConfig,
+    HTTPClientConfig,
     LLMConfig,
     PromptsConfig,
+    SchedulerConfig,
     SearchConfig,
 )
 from sgr_agent_core.agent_factory import AgentFactory
 from sgr_agent_core.agents import *  # noqa: F403
 from sgr_agent_core.base_agent import BaseAgent
-from sgr_agent_core.base_tool import BaseTool, MCPBaseTool
+from sgr_agent_core.base_tool import BaseTool, MCPBaseTool, function_tools
 from sgr_agent_core.models import (
     AgentContext,
     AgentStatesEnum,
     AgentStatistics,
     SearchResult,
     SourceData,
+    TokenUsage,
 )
 from sgr_agent_core.next_step_tool import NextStepToolsBuilder, NextStepToolStub
 from sgr_agent_core.services import AgentRegistry, MCP2ToolConverter, PromptLoader, ToolRegistry
@@ -41,12 +45,14 @@ __all__ = [
     "BaseAgent",
     "BaseTool",
     "MCPBaseTool",
+    "function_tools",
     # Models
     "AgentStatesEnum",
     "AgentStatistics",
     "AgentContext",
     "SearchResult",
     "SourceData",
+    "TokenUsage",
     # Services
     "AgentRegistry",
     "ToolRegistry",
@@ -55,10 +61,13 @@ __all__ = [
     # Configuration
     "AgentConfig",
     "AgentDefinition",
+    "AgentStoreConfig",
     "LLMConfig",
     "PromptsConfig",
+    "SchedulerConfig",
     "SearchConfig",
     "ExecutionConfig",
+    "HTTPClientConfig",
     "GlobalConfig",
     # Next step tools
     "NextStepToolStub",
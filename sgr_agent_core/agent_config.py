@@ -4,9 +4,16 @@ from pathlib import Path
 from typing import ClassVar, Self
 
 import yaml
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from sgr_agent_core.agent_definition import AgentConfig, Definitions
+from sgr_agent_core.agent_definition import (
+    AgentConfig,
+    AgentStoreConfig,
+    Definitions,
+    HTTPClientConfig,
+    SchedulerConfig,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +22,16 @@ class GlobalConfig(BaseSettings, AgentConfig, Definitions):
     _instance: ClassVar[Self | None] = None
     _initialized: ClassVar[bool] = False
 
+    storage: AgentStoreConfig = Field(default_factory=AgentStoreConfig, description="API server agent storage settings")
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig, description="API server admission control")
+    llm_client: HTTPClientConfig = Field(
+        default_factory=HTTPClientConfig, description="Connection pool settings for shared LLM clients"
+    )
+    search_client: HTTPClientConfig = Field(
+        default_factory=lambda: HTTPClientConfig(max_connections=20, timeout=60),
+        description="Connection pool settings for shared search clients",
+    )
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
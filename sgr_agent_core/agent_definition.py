@@ -4,7 +4,7 @@ import logging
 import os
 from functools import cached_property
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Literal, Self
 
 import yaml
 from fastmcp.mcp_config import MCPConfig
@@ -27,6 +27,19 @@ class LLMConfig(BaseModel, extra="allow"):
         return self.model_dump(exclude={"api_key", "base_url", "proxy"})
 
 
+class HTTPClientConfig(BaseModel, extra="allow"):
+    """Connection pool settings for shared HTTP clients."""
+
+    max_connections: int = Field(default=100, gt=0, description="Maximum number of open connections per client")
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum number of idle keep-alive connections"
+    )
+    keepalive_expiry: float = Field(default=30.0, ge=0, description="Seconds to keep an idle connection open")
+    http2: bool = Field(default=False, description="Enable HTTP/2 (requires the 'h2' package: httpx[http2])")
+    timeout: float = Field(default=600.0, gt=0, description="Request timeout in seconds")
+    connect_timeout: float = Field(default=10.0, gt=0, description="Connection timeout in seconds")
+
+
 class SearchConfig(BaseModel, extra="allow"):
     tavily_api_key: str | None = Field(default=None, description="Tavily API key")
     tavily_api_base_url: str = Field(default="https://api.tavily.com", description="Tavily API base URL")
@@ -34,6 +47,35 @@ class SearchConfig(BaseModel, extra="allow"):
     max_searches: int = Field(default=4, ge=0, description="Maximum number of searches")
     max_results: int = Field(default=10, ge=1, description="Maximum number of search results")
     content_limit: int = Field(default=3500, gt=0, description="Content character limit per source")
+    rank_passages: bool = Field(
+        default=False,
+        description="Fill content_limit with the page passages most relevant to the search query and reasoning "
+        "(local BM25) instead of the page head",
+    )
+    passage_size: int = Field(default=600, gt=0, description="Approximate passage size in characters for ranking")
+
+    cache_enabled: bool = Field(default=False, description="Cache search results")
+    cache_ttl: float = Field(default=3600, gt=0, description="Seconds to keep cached search results")
+    cache_max_entries: int = Field(default=1000, gt=0, description="Maximum number of results kept in memory")
+    cache_path: str | None = Field(
+        default="data/search_cache.sqlite3", description="SQLite file for the on-disk cache tier, None for memory only"
+    )
+    cache_max_disk_entries: int = Field(default=100_000, gt=0, description="Maximum number of results kept on disk")
+
+    extract_cache_enabled: bool = Field(
+        default=False, description="Keep extracted pages in a compressed on-disk cache and load them lazily"
+    )
+    extract_cache_dir: str = Field(default="data/extract_cache", description="Directory of the extracted pages cache")
+    extract_cache_ttl: float = Field(default=86400, gt=0, description="Seconds to keep an extracted page")
+    extract_cache_grace: float = Field(
+        default=86400, ge=0, description="Seconds to keep expired page content after its last use by an agent"
+    )
+
+    prefetch_enabled: bool = Field(
+        default=False, description="Start extracting top search results in the background right after a search"
+    )
+    prefetch_top_k: int = Field(default=3, gt=0, description="Number of top search results to prefetch per search")
+    prefetch_max_concurrent: int = Field(default=2, gt=0, description="Maximum concurrent prefetches per agent")
 
 
 class PromptsConfig(BaseModel, extra="allow"):
@@ -106,12 +148,143 @@ class ExecutionConfig(BaseModel, extra="allow"):
     max_clarifications: int = Field(default=3, ge=0, description="Maximum number of clarifications")
     max_iterations: int = Field(default=10, gt=0, description="Maximum number of iterations")
     mcp_context_limit: int = Field(default=15000, gt=0, description="Maximum context length from MCP server response")
+    stable_prompt_prefix: bool = Field(
+        default=True,
+        description="Render system prompt and initial request once per agent so the request prefix stays "
+        "byte-identical between steps (provider prompt caching)",
+    )
+    max_parallel_tool_calls: int = Field(
+        default=4,
+        gt=0,
+        description="Maximum number of concurrency-safe tool calls of one LLM response run at once (ToolCallingAgent)",
+    )
+    speculative_tools: bool = Field(
+        default=False,
+        description="Start read-only tools (search, extract) as soon as their arguments are complete in the "
+        "streamed LLM response; the call is kept if the final response confirms it and cancelled otherwise",
+    )
+    fused_step: bool = Field(
+        default=False,
+        description="Request reasoning and the typed next tool in a single schema-constrained LLM call "
+        "(SGRToolCallingAgent). Falls back to separate calls if the output does not validate",
+    )
+
+    tokenizer: str = Field(
+        default="estimate",
+        description="Token counter for context budgets: 'estimate' (offline, calibrated for BPE vocabularies) or "
+        "'tiktoken:<encoding>' (requires the 'tiktoken' package)",
+    )
+    context_budget_tokens: int = Field(
+        default=5000,
+        gt=0,
+        description="Maximum prompt tokens sent to the LLM (SGRToolCallingAgent). "
+        "Up to the model context window minus llm.max_tokens",
+    )
+    tool_output_max_tokens: int = Field(
+        default=200, gt=0, description="Tool results in the prompt are truncated to this many tokens"
+    )
+    keep_last_messages: int = Field(
+        default=2, ge=0, description="Number of latest non-system messages kept in the prompt"
+    )
+    image_tokens: int = Field(default=765, ge=0, description="Tokens counted per image in multimodal messages")
+    compaction_enabled: bool = Field(
+        default=False, description="Replace old tool results in the prompt with summaries once it gets too long"
+    )
+    compaction_threshold_tokens: int = Field(
+        default=12000, gt=0, description="Prompt size in tokens above which old tool results are compacted"
+    )
+    compaction_keep_last: int = Field(
+        default=4, ge=0, description="Number of latest conversation messages never compacted"
+    )
+    compaction_summary_tokens: int = Field(default=150, gt=0, description="Maximum tokens of a tool result summary")
+    compaction_summarizer: Literal["extractive", "llm"] = Field(
+        default="extractive",
+        description="'extractive' keeps key lines of the tool result, 'llm' asks compaction_model for a summary",
+    )
+    compaction_model: str | None = Field(
+        default=None, description="Cheaper model for 'llm' summaries on the agent LLM endpoint, None for llm.model"
+    )
 
     logs_dir: str | None = Field(
         default="logs", description="Directory for saving bot logs. Set to None or empty string to disable logging."
     )
+    stream_coalesce_ms: float = Field(
+        default=0,
+        ge=0,
+        description="Merge text deltas streamed within this many milliseconds into one SSE frame, 0 to disable",
+    )
+    stream_coalesce_bytes: int = Field(
+        default=4096, gt=0, description="Send merged text deltas once they reach this many bytes"
+    )
+    stream_max_buffered_bytes: int | None = Field(
+        default=1024 * 1024, gt=0, description="Bytes of SSE frames buffered for a slow client, None for unbounded"
+    )
+    stream_overflow: Literal["block", "coalesce", "drop", "detach"] = Field(
+        default="coalesce",
+        description="When the stream buffer is full: 'block' the agent, 'coalesce' or 'drop' text deltas, "
+        "or 'detach' the client",
+    )
+    stream_usage: bool = Field(
+        default=True, description="Request token usage in streamed LLM responses (stream_options.include_usage)"
+    )
+    stream_replay_bytes: int = Field(
+        default=1024 * 1024, gt=0, description="Bytes of recent SSE frames kept to replay to subscribers and reconnects"
+    )
+    log_compression: Literal["none", "gzip", "zstd"] = Field(
+        default="none",
+        description="Compression of agent JSONL logs ('zstd' requires the 'zstandard' package, falls back to gzip)",
+    )
     reports_dir: str = Field(default="reports", description="Directory for saving reports")
 
+    @field_validator("tokenizer")
+    @classmethod
+    def tokenizer_validator(cls, v: str) -> str:
+        kind, _, encoding = v.partition(":")
+        if kind not in ("estimate", "tiktoken"):
+            raise ValueError(f"Unknown tokenizer '{v}', expected 'estimate' or 'tiktoken:<encoding>'")
+        if kind == "tiktoken" and encoding and importlib.util.find_spec("tiktoken") is not None:
+            import tiktoken
+
+            if encoding not in tiktoken.list_encoding_names():
+                raise ValueError(
+                    f"Unknown tiktoken encoding '{encoding}', expected one of {tiktoken.list_encoding_names()}"
+                )
+        return v
+
+
+class AgentStoreConfig(BaseModel, extra="allow"):
+    """Limits for agents kept in the API server memory.
+
+    Running agents are never evicted, limits apply only to finished
+    agents and agents waiting for clarification.
+    """
+
+    max_finished_agents: int = Field(default=1000, ge=0, description="Maximum number of finished agents to keep")
+    finished_ttl: float = Field(default=3600, gt=0, description="Seconds to keep a finished agent after last access")
+    max_waiting_agents: int = Field(default=200, ge=0, description="Maximum number of agents waiting for clarification")
+    waiting_ttl: float = Field(
+        default=86400, gt=0, description="Seconds an agent may wait for clarification before being dropped"
+    )
+    max_memory_mb: float | None = Field(
+        default=512, gt=0, description="Approximate memory budget for finished agents in MB. Set to None to disable"
+    )
+
+    persistence: Literal["none", "sqlite"] = Field(
+        default="none", description="Backend for agent state checkpoints. 'none' keeps agents in memory only"
+    )
+    sqlite_path: str = Field(default="data/agents.sqlite3", description="Database file for the sqlite backend")
+
+
+class SchedulerConfig(BaseModel, extra="allow"):
+    """Admission control for agent execution in the API server."""
+
+    max_concurrent_agents: int = Field(default=32, gt=0, description="Maximum number of agents executing at once")
+    max_queue_size: int = Field(default=100, ge=0, description="Maximum number of agents waiting for a free slot")
+    definition_limits: dict[str, int] = Field(
+        default_factory=dict, description="Maximum number of concurrently executing agents per agent definition name"
+    )
+    retry_after: int = Field(default=5, gt=0, description="Retry-After seconds returned when the queue is full")
+
 
 class AgentConfig(BaseModel):
     llm: LLMConfig = Field(default_factory=LLMConfig, description="LLM settings")
@@ -1,5 +1,6 @@
 """Agent Factory for dynamic agent creation from definitions."""
 
+import importlib.util
 import logging
 from typing import Type, TypeVar
 
@@ -8,9 +9,17 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
 from sgr_agent_core.agent_config import GlobalConfig
-from sgr_agent_core.agent_definition import AgentDefinition, LLMConfig
+from sgr_agent_core.agent_definition import AgentDefinition, HTTPClientConfig, LLMConfig
 from sgr_agent_core.base_agent import BaseAgent
-from sgr_agent_core.services import AgentRegistry, MCP2ToolConverter, ToolRegistry
+from sgr_agent_core.services import (
+    AgentRegistry,
+    AgentStateBackend,
+    LogWriter,
+    MCP2ToolConverter,
+    SQLiteAgentStateBackend,
+    TavilySearchService,
+    ToolRegistry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +33,78 @@ class AgentFactory:
     and create instances with the appropriate configuration.
     """
 
+    _state_backend: AgentStateBackend | None = None
+    _clients: dict[tuple[str, str | None, str | None], AsyncOpenAI] = {}
+
+    @classmethod
+    def get_state_backend(cls) -> AgentStateBackend | None:
+        """Get the agent state backend configured in GlobalConfig.storage.
+
+        Returns:
+            Shared backend instance or None if persistence is disabled
+        """
+        if cls._state_backend is None:
+            storage_config = GlobalConfig().storage
+            if storage_config.persistence == "sqlite":
+                cls._state_backend = SQLiteAgentStateBackend(storage_config.sqlite_path)
+        return cls._state_backend
+
+    @classmethod
+    def set_state_backend(cls, backend: AgentStateBackend | None) -> None:
+        """Use a custom agent state backend (e.g. a networked store) for
+        all agents created afterward."""
+        cls._state_backend = backend
+
     @classmethod
-    def _create_client(cls, llm_config: LLMConfig) -> AsyncOpenAI:
+    def _create_client(cls, llm_config: LLMConfig, http_config: HTTPClientConfig | None = None) -> AsyncOpenAI:
         """Create OpenAI client from configuration.
 
         Args:
             llm_config: LLM configuration
+            http_config: Connection pool settings, GlobalConfig.llm_client by default
 
         Returns:
             Configured AsyncOpenAI client
         """
-        client_kwargs = {"base_url": llm_config.base_url, "api_key": llm_config.api_key}
-        if llm_config.proxy:
-            client_kwargs["http_client"] = httpx.AsyncClient(proxy=llm_config.proxy)
+        http_config = http_config or GlobalConfig().llm_client
+        http2 = http_config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 is enabled but the 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        http_client = httpx.AsyncClient(
+            proxy=llm_config.proxy,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=http_config.max_connections,
+                max_keepalive_connections=http_config.max_keepalive_connections,
+                keepalive_expiry=http_config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(http_config.timeout, connect=http_config.connect_timeout),
+            follow_redirects=True,
+        )
+        return AsyncOpenAI(base_url=llm_config.base_url, api_key=llm_config.api_key, http_client=http_client)
+
+    @classmethod
+    def get_client(cls, llm_config: LLMConfig) -> AsyncOpenAI:
+        """Get a shared OpenAI client for the LLM configuration.
 
-        return AsyncOpenAI(**client_kwargs)
+        Agents with the same endpoint, key and proxy reuse one client and
+        its connection pool, so TCP/TLS connections are kept alive between
+        requests.
+
+        Args:
+            llm_config: LLM configuration
+
+        Returns:
+            Pooled AsyncOpenAI client
+        """
+        key = (llm_config.base_url, llm_config.api_key, llm_config.proxy)
+        client = cls._clients.get(key)
+        if client is None or client.is_closed():
+            client = cls._clients[key] = cls._create_client(llm_config)
+            logger.info(f"Created LLM client for {llm_config.base_url} ({len(cls._clients)} clients in pool)")
+        return client
 
     @classmethod
     async def create(cls, agent_def: AgentDefinition, task_messages: list[ChatCompletionMessageParam]) -> Agent:
@@ -92,8 +158,9 @@ class AgentFactory:
                 task_messages=task_messages,
                 def_name=agent_def.name,
                 toolkit=tools,
-                openai_client=cls._create_client(agent_def.llm),
+                openai_client=cls.get_client(agent_def.llm),
                 agent_config=agent_def,
+                state_backend=cls.get_state_backend(),
             )
             logger.info(
                 f"Created agent '{agent_def.name}' "
@@ -105,6 +172,48 @@ class AgentFactory:
             logger.error(f"Failed to create agent '{agent_def.name}': {e}", exc_info=True)
             raise ValueError(f"Failed to create agent: {e}") from e
 
+    @classmethod
+    async def restore(cls, agent_id: str) -> Agent | None:
+        """Restore an agent from its last checkpoint.
+
+        The agent is recreated from its definition and then gets the saved
+        context, conversation and task messages back.
+
+        Args:
+            agent_id: ID of the agent to restore
+
+        Returns:
+            Restored agent instance or None if there is no checkpoint or definition
+        """
+        backend = cls.get_state_backend()
+        if backend is None:
+            return None
+        snapshot = await backend.load(agent_id)
+        if snapshot is None:
+            return None
+
+        agent_def = next(filter(lambda ad: ad.name == snapshot.def_name, cls.get_definitions_list()), None)
+        if agent_def is None:
+            logger.warning(f"Cannot restore agent '{agent_id}': definition '{snapshot.def_name}' not found")
+            return None
+
+        agent = await cls.create(agent_def, snapshot.task_messages)
+        agent.restore_snapshot(snapshot)
+        logger.info(f"Restored agent '{agent.id}' in state '{agent._context.state}'")
+        return agent
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Release shared resources used by created agents."""
+        clients, cls._clients = cls._clients, {}
+        for client in clients.values():
+            await client.close()
+        await TavilySearchService.close_clients()
+        await LogWriter.shutdown()
+        if cls._state_backend is not None:
+            await cls._state_backend.close()
+            cls._state_backend = None
+
     @classmethod
     def get_definitions_list(cls) -> list[AgentDefinition]:
         """Get all agent definitions from config.
@@ -1,9 +1,12 @@
-from typing import Type
+import json
+from typing import Type, get_args
 
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionChunk
 
 from sgr_agent_core.agent_definition import AgentConfig
 from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.incremental_json import IncrementalJSONParser
 from sgr_agent_core.next_step_tool import NextStepToolsBuilder
 from sgr_agent_core.tools import (
     BaseTool,
@@ -39,16 +42,46 @@ class SGRAgent(BaseAgent):
         tools = set(self.toolkit)
         return NextStepToolsBuilder.build_NextStepTools(list(tools))
 
+    @staticmethod
+    def _parse_function(response_format: Type[NextStepToolStub], raw: str) -> BaseTool | None:
+        """Validate a complete streamed `function` value against the tools
+        union."""
+        annotation = response_format.model_fields["function"].annotation
+        try:
+            tool_name = json.loads(raw).get("tool_name_discriminator")
+            for tool_class in get_args(annotation) or (annotation,):
+                if tool_class.tool_name == tool_name:
+                    return tool_class.model_validate_json(raw)
+        except ValueError:
+            pass
+        return None
+
+    def _speculate(
+        self, parser: IncrementalJSONParser, chunk: ChatCompletionChunk, response_format: Type[NextStepToolStub]
+    ) -> None:
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        for path, raw in parser.feed(content or ""):
+            if path == ("function",) and (tool := self._parse_function(response_format, raw)) is not None:
+                self._start_speculative_call(f"{self._context.iteration}-action", tool)
+
     async def _reasoning_phase(self) -> NextStepToolStub:
+        response_format = await self._prepare_tools()
+        parser = IncrementalJSONParser() if self.config.execution.speculative_tools else None
         async with self.openai_client.chat.completions.stream(
-            response_format=await self._prepare_tools(),
+            response_format=response_format,
             messages=await self._prepare_context(),
             **self.config.llm.to_openai_client_kwargs(),
+            **self._stream_kwargs(),
         ) as stream:
             async for event in stream:
                 if event.type == "chunk":
                     self.streaming_generator.add_chunk(event.chunk)
-        reasoning: NextStepToolStub = (await stream.get_final_completion()).choices[0].message.parsed  # type: ignore
+                    await self.streaming_generator.drain()
+                    if parser is not None:
+                        self._speculate(parser, event.chunk, response_format)
+        completion = await stream.get_final_completion()
+        self._record_llm_call(completion.usage)
+        reasoning: NextStepToolStub = completion.choices[0].message.parsed  # type: ignore
         # we are not fully sure if it should be in conversation or not. Looks like not necessary data
         # self.conversation.append({"role": "assistant", "content": reasoning.model_dump_json(exclude={"function"})})
         self.streaming_generator.add_tool_call(
@@ -83,7 +116,7 @@ class SGRAgent(BaseAgent):
         return tool
 
     async def _action_phase(self, tool: BaseTool) -> str:
-        result = await tool(self._context, self.config)
+        result = await self._call_tool(tool, f"{self._context.iteration}-action")
         self.conversation.append(
             {"role": "tool", "content": result, "tool_call_id": f"{self._context.iteration}-action"}
         )
@@ -715,10 +715,10 @@ from pydantic import BaseModel, Field
 from sgr_agent_core.agent_config import AgentConfig
 from sgr_agent_core.base_agent import BaseAgent
 from sgr_agent_core.models import AgentStatesEnum
-from sgr_agent_core.tools import BaseTool, FinalAnswerTool, ReasoningTool
+from sgr_agent_core.next_step_tool import NextStepToolsBuilder
+from sgr_agent_core.tools import BaseTool, FinalAnswerTool, NextStepToolStub, ReasoningTool
 
 
-collection_name=getattr(self.config.global_config, "default_memory_collection", "default")
 
 class ToolSelection(BaseModel):
     """
@@ -744,17 +744,14 @@ class SGRToolCallingAgent(BaseAgent):
 
     Key additions in this version:
       - Uses extra_body={"response_format": ...} so the shim actually receives response_format
-      - Reduces context size aggressively (windowing + tool truncation + char budget)
+      - Reduces context size aggressively (windowing + tool truncation + token budget),
+        budgets are set in execution config (context_budget_tokens, tool_output_max_tokens, keep_last_messages)
       - Avoids sending tools/tool_choice to the shim (these just bloat payloads)
+      - Optional fused step (execution.fused_step): reasoning and typed tool args in one call
     """
 
     name: str = "sgr_tool_calling_agent"
 
-    # ---- Context controls (tune these) ----
-    _KEEP_LAST_NON_SYSTEM: int = 2         # keep last N user/assistant/tool messages (after filtering)
-    _TOOL_MAX_CHARS: int = 800            # truncate each tool message content to this many chars
-    _CHAR_BUDGET: int = 20_000             # total content chars budget (rough proxy for tokens)
-
     def __init__(
         self,
         task_messages: list,
@@ -786,6 +783,9 @@ class SGRToolCallingAgent(BaseAgent):
         self._tool_by_name.setdefault(ReasoningTool.tool_name.lower(), ReasoningTool)       # type: ignore[arg-type]
         self._tool_by_name.setdefault(FinalAnswerTool.tool_name.lower(), FinalAnswerTool)   # type: ignore[arg-type]
 
+        # Action selected by the fused call, consumed by _select_action_phase
+        self._fused_action: BaseTool | None = None
+
 
     # -----------------------------
     # OpenAI request kwargs hygiene
@@ -805,81 +805,75 @@ class SGRToolCallingAgent(BaseAgent):
     # -----------------------------
     # Context reduction helpers
     # -----------------------------
-    def _trim_messages_window(self, messages: list[dict], keep_last_non_system: int) -> list[dict]:
-        system = [m for m in messages if m.get("role") == "system"]
-        non_system = [m for m in messages if m.get("role") != "system"]
-        return system + non_system[-keep_last_non_system:]
-
-    def _truncate_tool_messages(self, messages: list[dict], tool_max_chars: int) -> list[dict]:
+    def _truncate_tool_messages(self, messages: list[dict], tool_max_tokens: int) -> list[dict]:
         out: list[dict] = []
         for m in messages:
-            if m.get("role") == "tool":
-                content = m.get("content") or ""
-                if isinstance(content, str) and len(content) > tool_max_chars:
-                    m2 = dict(m)
-                    m2["content"] = content[:tool_max_chars] + "\n...[tool output truncated]..."
-                    out.append(m2)
-                else:
-                    out.append(m)
+            content = m.get("content") or ""
+            if (
+                m.get("role") == "tool"
+                and isinstance(content, str)
+                and self.token_counter.count_text(content) > tool_max_tokens
+            ):
+                m2 = dict(m)
+                m2["content"] = (
+                    self.token_counter.tokenizer.truncate(content, tool_max_tokens) + "\n...[tool output truncated]..."
+                )
+                out.append(m2)
             else:
                 out.append(m)
         return out
 
-    def _clip_to_char_budget(self, messages: list[dict], budget_chars: int) -> list[dict]:
+    def _clip_to_token_budget(self, messages: list[dict], budget_tokens: int) -> list[dict]:
         """
-        Approximate token budgeting by limiting total content characters.
-
-        Keeps all system messages, then adds most recent non-system messages until budget is met.
+        Keep all system messages, then add most recent non-system messages until the token budget is met.
         """
         system = [m for m in messages if m.get("role") == "system"]
         rest = [m for m in messages if m.get("role") != "system"]
 
-        def clen(x: dict) -> int:
-            c = x.get("content") or ""
-            return len(c) if isinstance(c, str) else 0
-
-        out_system = list(system)
-        total = sum(clen(m) for m in out_system)
+        total = self.token_counter.count_messages(system)
 
         kept_rest_rev: list[dict] = []
         for m in reversed(rest):
-            c = m.get("content") or ""
-            c_len = len(c) if isinstance(c, str) else 0
-            if total + c_len <= budget_chars:
+            m_tokens = self.token_counter.count_message(m)
+            if total + m_tokens <= budget_tokens:
                 kept_rest_rev.append(m)
-                total += c_len
+                total += m_tokens
             else:
                 # If nothing fits (rare), keep a clipped tail of the newest message
+                c = m.get("content")
                 if not kept_rest_rev and isinstance(c, str) and c:
                     m2 = dict(m)
                     # Keep last portion; often latest message is most important
-                    tail = c[-max(1000, budget_chars - total) :]
-                    m2["content"] = tail
+                    tail_tokens = max(250, budget_tokens - total - self.token_counter.message_overhead)
+                    m2["content"] = self.token_counter.tokenizer.truncate(c, tail_tokens, keep="tail")
                     kept_rest_rev.append(m2)
                 break
 
         kept_rest = list(reversed(kept_rest_rev))
-        return out_system + kept_rest
+        return system + kept_rest
 
     async def _prepare_small_context(self) -> list[dict]:
         """
-        Pull context from BaseAgent, then aggressively shrink it to avoid context overflow.
+        Take a small window of the BaseAgent context, then shrink it further to avoid context overflow.
+
+        Only the window is copied and processed, so this costs the same at every step however long
+        the conversation gets.
         """
-        messages = await self._prepare_context()
+        execution = self.config.execution
 
-        # 1) Truncate tool outputs (often huge)
-        messages = self._truncate_tool_messages(messages, self._TOOL_MAX_CHARS)
+        # 1) Window to the last N turns (plus all system messages)
+        messages = self._context_window(execution.keep_last_messages)
 
-        # 2) Window to the last N turns (plus all system messages)
-        messages = self._trim_messages_window(messages, self._KEEP_LAST_NON_SYSTEM)
+        # 2) Truncate tool outputs (often huge)
+        messages = self._truncate_tool_messages(messages, execution.tool_output_max_tokens)
 
-        # 3) Enforce a global budget (rough proxy for tokens)
-        messages = self._clip_to_char_budget(messages, self._CHAR_BUDGET)
+        # 3) Enforce a global token budget
+        messages = self._clip_to_token_budget(messages, execution.context_budget_tokens)
 
         # # Inject memory at the end (so it stays in-window)
         # messages = await self._maybe_inject_memory(messages)
 
-        # messages = self._clip_to_char_budget(messages, self._CHAR_BUDGET)
+        # messages = self._clip_to_token_budget(messages, execution.context_budget_tokens)
 
         return messages
 
@@ -1034,6 +1028,7 @@ class SGRToolCallingAgent(BaseAgent):
             extra_body={"response_format": schema_payload},
             **self._openai_request_kwargs(),
         )
+        self._record_llm_call(completion.usage)
 
         msg = completion.choices[0].message
         content = msg.content or ""
@@ -1042,10 +1037,46 @@ class SGRToolCallingAgent(BaseAgent):
     # -----------------------------
     # Phases
     # -----------------------------
+    def _fused_toolkit(self) -> list[Type[BaseTool]]:
+        """Tools the fused call may select: the toolkit plus FinalAnswerTool, without ReasoningTool."""
+        return [t for t in {*self._toolkit, FinalAnswerTool} if t is not ReasoningTool]
+
+    async def _fused_phase(self) -> NextStepToolStub | None:
+        """
+        Ask the model for reasoning and the next tool with its typed args in ONE call.
+
+        The schema is the cached NextStepTools model for the toolkit (reasoning fields
+        plus a discriminated union of tools). Returns None if the output can't be
+        parsed or validated, so the caller can fall back to separate calls.
+        """
+        model = NextStepToolsBuilder.build_NextStepTools(self._fused_toolkit())
+        messages = await self._prepare_small_context()
+
+        try:
+            step_dict = await self._model_json(
+                messages=messages,
+                json_schema=model.model_json_schema(),
+                schema_name="NextStepTools",
+            )
+            return model.model_validate(step_dict)
+        except ValueError as e:  # invalid JSON or pydantic ValidationError
+            self.logger.warning(f"Fused step output rejected, falling back to separate calls: {e}")
+            return None
+
     async def _reasoning_phase(self) -> ReasoningTool:
         """
         Ask the model for ReasoningTool as strict JSON, then execute it.
+
+        In fused mode the selected tool is kept for _select_action_phase.
         """
+        if self.config.execution.fused_step:
+            step = await self._fused_phase()
+            if step is not None:
+                self._fused_action = step.function
+                reasoning = ReasoningTool.model_validate(step.model_dump(exclude={"function"}))
+                return await self._record_reasoning(reasoning)
+            self._context.fused_step_fallbacks += 1
+
         messages = await self._prepare_small_context()
 
         reasoning_dict = await self._model_json(
@@ -1054,7 +1085,9 @@ class SGRToolCallingAgent(BaseAgent):
             schema_name="ReasoningTool",
         )
         reasoning: ReasoningTool = ReasoningTool.model_validate(reasoning_dict)
+        return await self._record_reasoning(reasoning)
 
+    async def _record_reasoning(self, reasoning: ReasoningTool) -> ReasoningTool:
         # Record as an OpenAI-ish tool call for downstream compatibility
         self.conversation.append(
             {
@@ -1089,6 +1122,43 @@ class SGRToolCallingAgent(BaseAgent):
         return reasoning
 
     async def _select_action_phase(self, reasoning: ReasoningTool) -> BaseTool:
+        """
+        Use the tool from the fused call or ask the model to select one, then record it.
+        """
+        tool, self._fused_action = self._fused_action, None
+        if tool is None:
+            tool = await self._select_tool(reasoning)
+
+        if not isinstance(tool, BaseTool):
+            raise ValueError("Selected tool is not a valid BaseTool instance")
+
+        # Record selected tool call (OpenAI-ish)
+        self.conversation.append(
+            {
+                "role": "assistant",
+                "content": reasoning.remaining_steps[0] if reasoning.remaining_steps else "Completing",
+                "tool_calls": [
+                    {
+                        "type": "function",
+                        "id": f"{self._context.iteration}-action",
+                        "function": {
+                            "name": tool.tool_name,
+                            "arguments": tool.model_dump_json(),
+                        },
+                    }
+                ],
+            }
+        )
+
+        self.streaming_generator.add_tool_call(
+            f"{self._context.iteration}-action",
+            tool.tool_name,
+            tool.model_dump_json(),
+        )
+
+        return tool
+
+    async def _select_tool(self, reasoning: ReasoningTool) -> BaseTool:
         """
         Ask the model to select exactly one tool and its args using ToolSelection schema.
         """
@@ -1144,33 +1214,6 @@ class SGRToolCallingAgent(BaseAgent):
                     status=AgentStatesEnum.COMPLETED,
                 )
 
-        if not isinstance(tool, BaseTool):
-            raise ValueError("Selected tool is not a valid BaseTool instance")
-
-        # Record selected tool call (OpenAI-ish)
-        self.conversation.append(
-            {
-                "role": "assistant",
-                "content": reasoning.remaining_steps[0] if reasoning.remaining_steps else "Completing",
-                "tool_calls": [
-                    {
-                        "type": "function",
-                        "id": f"{self._context.iteration}-action",
-                        "function": {
-                            "name": tool.tool_name,
-                            "arguments": tool.model_dump_json(),
-                        },
-                    }
-                ],
-            }
-        )
-
-        self.streaming_generator.add_tool_call(
-            f"{self._context.iteration}-action",
-            tool.tool_name,
-            tool.model_dump_json(),
-        )
-
         return tool
 
     async def _action_phase(self, tool: BaseTool) -> str:
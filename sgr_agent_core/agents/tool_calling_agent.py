@@ -1,17 +1,25 @@
+import asyncio
 from typing import Literal, Type
 
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionChunk
 
 from sgr_agent_core.agent_config import AgentConfig
 from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.incremental_json import IncrementalJSONParser
 from sgr_agent_core.tools import (
     BaseTool,
+    ClarificationTool,
 )
 
 
 class ToolCallingAgent(BaseAgent):
     """Tool Calling Research Agent relying entirely on LLM native function
-    calling."""
+    calling.
+
+    All tool calls from one LLM response are executed concurrently, up to
+    execution.max_parallel_tool_calls at a time.
+    """
 
     name: str = "tool_calling_agent"
 
@@ -33,25 +41,65 @@ class ToolCallingAgent(BaseAgent):
             **kwargs,
         )
         self.tool_choice: Literal["required"] = "required"
+        # Tool calls of the current step as (tool_call_id, tool), in response order
+        self._selected_tools: list[tuple[str, BaseTool]] = []
+
+    def _action_call_id(self, index: int) -> str:
+        if index == 0:
+            return f"{self._context.iteration}-action"
+        return f"{self._context.iteration}-action-{index}"
+
+    def _speculate(self, parsers: dict[int, tuple[str, IncrementalJSONParser]], chunk: ChatCompletionChunk) -> None:
+        """Start tool calls whose arguments are complete in the streamed
+        response."""
+        for delta in (chunk.choices[0].delta.tool_calls if chunk.choices else None) or []:
+            if delta.function is None:
+                continue
+            if delta.index not in parsers:
+                parsers[delta.index] = (delta.function.name or "", IncrementalJSONParser())
+            name, parser = parsers[delta.index]
+            tool_class = next((tool for tool in self.toolkit if tool.tool_name == name), None)
+            for path, raw in parser.feed(delta.function.arguments or ""):
+                if path != () or tool_class is None:
+                    continue
+                try:
+                    tool = tool_class.model_validate_json(raw)
+                except ValueError:
+                    continue
+                self._start_speculative_call(self._action_call_id(delta.index), tool)
 
     async def _reasoning_phase(self) -> None:
         """No explicit reasoning phase, reasoning is done internally by LLM."""
         return None
 
     async def _select_action_phase(self, reasoning=None) -> BaseTool:
+        """Select all tools called by the LLM.
+
+        Returns the first tool, or a ClarificationTool if one was called
+        so the agent pauses after the step.
+        """
+        parsers = {} if self.config.execution.speculative_tools else None
         async with self.openai_client.chat.completions.stream(
             messages=await self._prepare_context(),
             tools=await self._prepare_tools(),
             tool_choice=self.tool_choice,
             **self.config.llm.to_openai_client_kwargs(),
+            **self._stream_kwargs(),
         ) as stream:
             async for event in stream:
                 if event.type == "chunk":
                     self.streaming_generator.add_chunk(event.chunk)
-        tool = (await stream.get_final_completion()).choices[0].message.tool_calls[0].function.parsed_arguments
+                    await self.streaming_generator.drain()
+                    if parsers is not None:
+                        self._speculate(parsers, event.chunk)
+        completion = await stream.get_final_completion()
+        self._record_llm_call(completion.usage)
+        tool_calls = completion.choices[0].message.tool_calls or []
+        tools = [tool_call.function.parsed_arguments for tool_call in tool_calls]
 
-        if not isinstance(tool, BaseTool):
+        if not tools or not all(isinstance(tool, BaseTool) for tool in tools):
             raise ValueError("Selected tool is not a valid BaseTool instance")
+        self._selected_tools = [(self._action_call_id(i), tool) for i, tool in enumerate(tools)]
         self.conversation.append(
             {
                 "role": "assistant",
@@ -59,25 +107,52 @@ class ToolCallingAgent(BaseAgent):
                 "tool_calls": [
                     {
                         "type": "function",
-                        "id": f"{self._context.iteration}-action",
+                        "id": call_id,
                         "function": {
                             "name": tool.tool_name,
                             "arguments": tool.model_dump_json(),
                         },
                     }
+                    for call_id, tool in self._selected_tools
                 ],
             }
         )
-        self.streaming_generator.add_tool_call(
-            f"{self._context.iteration}-action", tool.tool_name, tool.model_dump_json()
-        )
-        return tool
+        for call_id, tool in self._selected_tools:
+            self.streaming_generator.add_tool_call(call_id, tool.tool_name, tool.model_dump_json())
+        return next((tool for tool in tools if isinstance(tool, ClarificationTool)), tools[0])
 
     async def _action_phase(self, tool: BaseTool) -> str:
-        result = await tool(self._context, self.config)
-        self.conversation.append(
-            {"role": "tool", "content": result, "tool_call_id": f"{self._context.iteration}-action"}
-        )
-        self.streaming_generator.add_chunk_from_str(f"{result}\n")
-        self._log_tool_execution(tool, result)
-        return result
+        """Execute selected tools and record results in call order.
+
+        Concurrency-safe tools (searches, extraction) run concurrently
+        first. The others (reports, answers, plan changes) run after them
+        one by one, in response order, so they see the context the searches
+        produced. If a call fails, the running ones are cancelled.
+        """
+        selected, self._selected_tools = self._selected_tools or [(self._action_call_id(0), tool)], []
+        semaphore = asyncio.Semaphore(self.config.execution.max_parallel_tool_calls)
+        results: dict[str, str] = {}
+
+        async def run(call_id: str, selected_tool: BaseTool):
+            async with semaphore:
+                results[call_id] = await self._call_tool(selected_tool, call_id)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for call_id, selected_tool in selected:
+                    if selected_tool.concurrency_safe:
+                        group.create_task(run(call_id, selected_tool))
+            for call_id, selected_tool in selected:
+                if not selected_tool.concurrency_safe:
+                    results[call_id] = await self._call_tool(selected_tool, call_id)
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        finally:
+            # Speculative calls missing from the final response or left by a failure
+            self._cancel_speculative_calls()
+
+        for call_id, selected_tool in selected:
+            self.conversation.append({"role": "tool", "content": results[call_id], "tool_call_id": call_id})
+            self.streaming_generator.add_chunk_from_str(f"{results[call_id]}\n")
+            self._log_tool_execution(selected_tool, results[call_id])
+        return next(results[call_id] for call_id, selected_tool in selected if selected_tool is tool)
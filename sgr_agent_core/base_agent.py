@@ -1,23 +1,34 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import traceback
 import uuid
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletionFunctionToolParam, ChatCompletionMessageParam
 
 from sgr_agent_core.agent_definition import AgentConfig
-from sgr_agent_core.models import AgentContext, AgentStatesEnum
+from sgr_agent_core.message_buffer import MessageBuffer, MessageView
+from sgr_agent_core.models import AgentContext, AgentSnapshot, AgentStatesEnum, TokenUsage
+from sgr_agent_core.services.agent_scheduler import ExecutionSlot
+from sgr_agent_core.services.agent_state_backend import AgentStateBackend
+from sgr_agent_core.services.context_compactor import ContextCompactor
+from sgr_agent_core.services.log_writer import LOG_EXTENSIONS, LogWriter, resolve_compression
 from sgr_agent_core.services.prompt_loader import PromptLoader
 from sgr_agent_core.services.registry import AgentRegistry
+from sgr_agent_core.services.token_counter import MessageTokenCounter, get_tokenizer
 from sgr_agent_core.stream import OpenAIStreamingGenerator
 from sgr_agent_core.tools import (
     BaseTool,
     ClarificationTool,
     ReasoningTool,
+    function_tools,
 )
 
 
@@ -40,21 +51,65 @@ class BaseAgent(AgentRegistryMixin):
         agent_config: AgentConfig,
         toolkit: list[Type[BaseTool]],
         def_name: str | None = None,
+        state_backend: AgentStateBackend | None = None,
         **kwargs: dict,
     ):
         self.id = f"{def_name or self.name}_{uuid.uuid4()}"
+        self.def_name = def_name or self.name
         self.openai_client = openai_client
         self.config = agent_config
         self.creation_time = datetime.now()
         self.task_messages = task_messages
         self.toolkit = toolkit
+        self.state_backend = state_backend
+        self.execution_slot: ExecutionSlot | None = None
 
         self._context = AgentContext()
-        self.conversation = []
+        self.conversation = MessageBuffer()
+        self._prompt_prefix: list[dict] | None = None
+        self._system_prompt: tuple[tuple[Type[BaseTool], ...], str] | None = None
+        # Prompt assembled from the prefix and conversation (or its compacted messages),
+        # extended with new messages every step
+        self._assembled: list[dict] = []
+        self._assembled_from: tuple[list[dict], list[dict], int] | None = None
+        # Tool calls started before the LLM response was complete, by tool call id
+        self._speculative_calls: dict[str, tuple[BaseTool, asyncio.Task[str]]] = {}
+
+        self.token_counter = MessageTokenCounter(
+            get_tokenizer(agent_config.execution.tokenizer), image_tokens=agent_config.execution.image_tokens
+        )
+
+        self._compactor = (
+            ContextCompactor(agent_config, self.token_counter, openai_client)
+            if agent_config.execution.compaction_enabled
+            else None
+        )
 
-        self.streaming_generator = OpenAIStreamingGenerator(model=self.id)
+        self.streaming_generator = self._create_streaming_generator()
         self.logger = logging.getLogger(f"sgr_agent_core.agents.{self.id}")
         self.log = []
+        # Log file of the agent, resolved on first write ("" if logging is disabled)
+        self._log_path: str | None = None
+        self._log_written = 0
+
+    def _create_streaming_generator(self) -> OpenAIStreamingGenerator:
+        execution = self.config.execution
+        return OpenAIStreamingGenerator(
+            model=self.id,
+            coalesce_interval=execution.stream_coalesce_ms / 1000,
+            coalesce_max_bytes=execution.stream_coalesce_bytes,
+            max_buffered_bytes=execution.stream_max_buffered_bytes,
+            overflow=execution.stream_overflow,
+            replay_max_bytes=execution.stream_replay_bytes,
+        )
+
+    @property
+    def conversation(self) -> MessageBuffer:
+        return self._conversation
+
+    @conversation.setter
+    def conversation(self, messages: list[dict]):
+        self._conversation = messages if isinstance(messages, MessageBuffer) else MessageBuffer(messages)
 
     async def provide_clarification(self, messages: list[ChatCompletionMessageParam]):
         """Receive clarification from an external source (e.g. user input) in
@@ -91,9 +146,11 @@ class BaseAgent(AgentRegistryMixin):
                 "step_number": self._context.iteration,
                 "timestamp": datetime.now().isoformat(),
                 "step_type": "reasoning",
+                "prefix_hash": self._context.prefix_hash,
                 "agent_reasoning": result.model_dump(mode="json"),
             }
         )
+        self._write_log_records()
 
     def _log_tool_execution(self, tool: BaseTool, result: str):
         self.logger.info(
@@ -113,48 +170,218 @@ class BaseAgent(AgentRegistryMixin):
                 "tool_name": tool.tool_name,
                 "agent_tool_context": tool.model_dump(mode="json"),
                 "agent_tool_execution_result": result,
+                "llm_calls": self._context.llm_calls_per_step.get(self._context.iteration, 0),
+                "usage": self._context.usage_per_step.get(self._context.iteration, TokenUsage()).model_dump(),
             }
         )
+        self._write_log_records()
+
+    def _log_file_path(self) -> str | None:
+        """Path of the agent JSONL log, created with its header record on
+        first use."""
+        if self._log_path is not None:
+            return self._log_path or None
 
-    def _save_agent_log(self):
         from sgr_agent_core.agent_config import GlobalConfig
 
         logs_dir = GlobalConfig().execution.logs_dir
         # Skip saving if logs_dir is None or empty string
         if not logs_dir:
             self.logger.debug("Skipping agent log save: logs_dir is not configured")
-            return
+            self._log_path = ""
+            return None
 
         os.makedirs(logs_dir, exist_ok=True)
-        filepath = os.path.join(logs_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.id}-log.json")
-        agent_log = {
-            "id": self.id,
-            "model_config": self.config.llm.model_dump(
-                exclude={"api_key", "proxy"}, mode="json"
-            ),  # Sensitive data excluded by default
-            "task_messages": self.task_messages,
-            "toolkit": [tool.tool_name for tool in self.toolkit],
-            "log": self.log,
-        }
-
-        json.dump(agent_log, open(filepath, "w", encoding="utf-8"), indent=2, ensure_ascii=False)
-
-    async def _prepare_context(self) -> list[dict]:
+        self._log_compression = resolve_compression(self.config.execution.log_compression)
+        filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.id}-log.jsonl"
+        self._log_path = os.path.join(logs_dir, filename + LOG_EXTENSIONS[self._log_compression])
+        LogWriter.get().write(
+            self._log_path,
+            {
+                "step_type": "agent_start",
+                "timestamp": datetime.now().isoformat(),
+                "id": self.id,
+                "model_config": self.config.llm.model_dump(
+                    exclude={"api_key", "proxy"}, mode="json"
+                ),  # Sensitive data excluded by default
+                "task_messages": self.task_messages,
+                "toolkit": [tool.tool_name for tool in self.toolkit],
+            },
+            self._log_compression,
+        )
+        return self._log_path
+
+    def _write_log_records(self):
+        """Queue log records added since the last write to the background
+        log writer."""
+        if (path := self._log_file_path()) is None:
+            return
+        writer = LogWriter.get()
+        for record in self.log[self._log_written :]:
+            writer.write(path, record, self._log_compression)
+        self._log_written = len(self.log)
+
+    def _save_agent_log(self):
+        """Write remaining log records and the final agent state, then close
+        the log file.
+
+        Writing happens in the background, call LogWriter.get().flush() to
+        wait for it.
+        """
+        self._write_log_records()
+        if (path := self._log_file_path()) is None:
+            return
+        writer = LogWriter.get()
+        writer.write(
+            path,
+            {
+                "step_type": "agent_finish",
+                "timestamp": datetime.now().isoformat(),
+                "state": self._context.state,
+                "iteration": self._context.iteration,
+                "llm_calls": self._context.llm_calls,
+                "usage": self._context.usage.model_dump(),
+                "execution_result": self._context.execution_result,
+            },
+            self._log_compression,
+        )
+        writer.close_file(path)
+
+    def to_snapshot(self) -> AgentSnapshot:
+        """Dump agent state required to restore the agent later."""
+        return AgentSnapshot(
+            id=self.id,
+            def_name=self.def_name,
+            creation_time=self.creation_time,
+            task_messages=self.task_messages,
+            conversation=self.conversation,
+            toolkit=[tool.tool_name for tool in self.toolkit],
+            context=self._context.model_dump(mode="json", exclude={"clarification_received"}),
+        )
+
+    def restore_snapshot(self, snapshot: AgentSnapshot):
+        """Restore agent state from a snapshot made by ``to_snapshot``."""
+        self.id = snapshot.id
+        self.creation_time = snapshot.creation_time
+        self.task_messages = snapshot.task_messages
+        self.conversation = snapshot.conversation
+        self._context = AgentContext.model_validate(snapshot.context)
+        self._prompt_prefix = None
+        self.streaming_generator = self._create_streaming_generator()
+        self.logger = logging.getLogger(f"sgr_agent_core.agents.{self.id}")
+
+        tools_by_name = {tool.tool_name: tool for tool in self.toolkit}
+        self.toolkit = [tools_by_name[name] for name in snapshot.toolkit if name in tools_by_name]
+
+    async def _checkpoint(self):
+        """Persist the current agent state if a state backend is
+        configured."""
+        if self.state_backend is None:
+            return
+        try:
+            await self.state_backend.save(self.to_snapshot())
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to checkpoint agent state: {e}")
+
+    async def _wait_for_clarification(self):
+        """Wait for the user answer without holding a scheduler slot."""
+        if self.execution_slot is not None:
+            self.execution_slot.release()
+        await self._context.clarification_received.wait()
+        if self.execution_slot is not None:
+            await self.execution_slot.acquire()
+
+    async def _prepare_context(self) -> Sequence[dict]:
         """Prepare a conversation context with system prompt, task data and any
         other context.
 
         Note: Override this method to change the context setup for the agent.
 
-        Returns a list of dictionaries OpenAI like format, each
-        containing a role and content key by default.
+        Returns a read-only sequence of dictionaries OpenAI like format,
+        each containing a role and content key by default.
         """
 
-        return [
-            {"role": "system", "content": PromptLoader.get_system_prompt(self.toolkit, self.config.prompts)},
-            *self.task_messages,
-            {"role": "user", "content": PromptLoader.get_initial_user_request(self.task_messages, self.config.prompts)},
-            *self.conversation,
-        ]
+        prefix = self._get_prompt_prefix()
+        if self._compactor is not None:
+            compacted = await self._compactor.compact(prefix, self.conversation, self._context)
+            if compacted is not None:
+                # Messages in the verbatim window follow the compacted ones
+                return self._assemble_context(prefix, compacted, tail=self.conversation[len(compacted) :])
+        return self._assemble_context(prefix, self.conversation)
+
+    def _assemble_context(self, prefix: list[dict], messages: list[dict], tail: Sequence[dict] = ()) -> MessageView:
+        """Prefix, messages and tail as one prompt, costing O(new messages +
+        tail) per step.
+
+        The assembled prompt is only extended with messages appended since
+        the last step. It is rebuilt if the prefix is re-rendered or
+        messages are replaced or changed other than by appending.
+        """
+        revision = getattr(messages, "revision", 0)
+        source = self._assembled_from
+        if source is None or source[0] is not prefix or source[1] is not messages or source[2] != revision:
+            self._assembled = list(prefix)
+        self._assembled.extend(messages[len(self._assembled) - len(prefix) :])
+        self._assembled_from = (prefix, messages, revision)
+        return MessageView(self._assembled, len(self._assembled), tail)
+
+    def _context_window(self, keep_last_non_system: int) -> list[dict]:
+        """System messages and the latest keep_last_non_system other
+        messages of the prompt, in order.
+
+        Uses the conversation buffer indexes instead of scanning the
+        whole history.
+        """
+        prefix = self._get_prompt_prefix()
+        tail = self.conversation.last_non_system(keep_last_non_system)
+        if len(tail) < keep_last_non_system:
+            prefix_non_system = [m for m in prefix if m.get("role") != "system"]
+            tail = prefix_non_system[max(len(prefix_non_system) - keep_last_non_system + len(tail), 0) :] + tail
+        return [m for m in prefix if m.get("role") == "system"] + self.conversation.system_messages() + tail
+
+    def _get_prompt_prefix(self) -> list[dict]:
+        """System prompt, task messages and initial request shared by all
+        steps.
+
+        With execution.stable_prompt_prefix the prefix is rendered once
+        (dated by agent creation time) and reused, so providers can serve
+        it from prompt cache. Its hash is stored in the context per step.
+        """
+        if self._prompt_prefix is None or not self.config.execution.stable_prompt_prefix:
+            current_datetime = self.creation_time if self.config.execution.stable_prompt_prefix else None
+            self._prompt_prefix = [
+                {"role": "system", "content": self._render_system_prompt()},
+                *self.task_messages,
+                {
+                    "role": "user",
+                    "content": PromptLoader.get_initial_user_request(
+                        self.task_messages, self.config.prompts, current_datetime=current_datetime
+                    ),
+                },
+            ]
+            prefix_hash = hashlib.sha256(
+                json.dumps(self._prompt_prefix, sort_keys=True, ensure_ascii=False, default=str).encode()
+            ).hexdigest()[:16]
+            if self._context.prefix_hash is not None and prefix_hash != self._context.prefix_hash:
+                self._context.prefix_changes += 1
+            self._context.prefix_hash = prefix_hash
+        return self._prompt_prefix
+
+    def _render_system_prompt(self) -> str:
+        """System prompt, rendered once per toolkit (it has no per-step
+        data)."""
+        toolkit = tuple(self.toolkit)
+        if self._system_prompt is None or self._system_prompt[0] != toolkit:
+            self._system_prompt = (toolkit, PromptLoader.get_system_prompt(self.toolkit, self.config.prompts))
+        return self._system_prompt[1]
+
+    def _stream_kwargs(self) -> dict:
+        """Arguments of streamed LLM calls besides the LLM config."""
+        return {"stream_options": {"include_usage": True}} if self.config.execution.stream_usage else {}
+
+    def _record_llm_call(self, usage: CompletionUsage | None = None):
+        """Count an LLM call of the current step and add its token usage."""
+        self._context.record_llm_call(usage)
 
     async def _prepare_tools(self) -> list[ChatCompletionFunctionToolParam]:
         """Prepare available tools for the current agent state and progress.
@@ -165,10 +392,9 @@ class BaseAgent(AgentRegistryMixin):
         Returns a list of ChatCompletionFunctionToolParam based
         available tools.
         """
-        tools = set(self.toolkit)
         if self._context.iteration >= self.config.execution.max_iterations:
             raise RuntimeError("Max iterations reached")
-        return [pydantic_function_tool(tool, name=tool.tool_name) for tool in tools]
+        return function_tools(self.toolkit)
 
     async def _reasoning_phase(self) -> ReasoningTool:
         """Call LLM to decide next action based on current context."""
@@ -182,6 +408,37 @@ class BaseAgent(AgentRegistryMixin):
         """
         raise NotImplementedError("_select_action_phase must be implemented by subclass")
 
+    def _start_speculative_call(self, call_id: str, tool: BaseTool) -> None:
+        """Start a tool call whose arguments are complete in a partially
+        streamed response.
+
+        Only tools marked speculative are started, and only if
+        execution.speculative_tools is enabled.
+        """
+        if not self.config.execution.speculative_tools or not tool.speculative or call_id in self._speculative_calls:
+            return
+        self.logger.info(f"⚡ Speculatively started {tool.tool_name} ({call_id})")
+        self._speculative_calls[call_id] = (tool, asyncio.create_task(tool.fetch(self._context, self.config)))
+        self._context.speculative_started += 1
+
+    def _cancel_speculative_calls(self) -> None:
+        calls, self._speculative_calls = self._speculative_calls, {}
+        for _, task in calls.values():
+            task.cancel()
+        self._context.speculative_cancelled += len(calls)
+
+    async def _call_tool(self, tool: BaseTool, call_id: str) -> str:
+        """Execute the tool, reusing data fetched by a speculative call with
+        the same arguments."""
+        if (speculative := self._speculative_calls.pop(call_id, None)) is not None:
+            speculative_tool, task = speculative
+            if type(speculative_tool) is type(tool) and speculative_tool.model_dump() == tool.model_dump():
+                self._context.speculative_confirmed += 1
+                return await speculative_tool(self._context, self.config, fetched=await task)
+            task.cancel()
+            self._context.speculative_cancelled += 1
+        return await tool(self._context, self.config)
+
     async def _action_phase(self, tool: BaseTool) -> str:
         """Call Tool for the action decided in the select_action phase.
 
@@ -202,19 +459,25 @@ class BaseAgent(AgentRegistryMixin):
         if isinstance(action_tool, ClarificationTool):
             self.logger.info("\n⏸️  Research paused - please answer questions")
             self._context.state = AgentStatesEnum.WAITING_FOR_CLARIFICATION
-            self.streaming_generator.finish()
+            self.streaming_generator.finish(usage=self._context.usage.to_openai())
             self._context.clarification_received.clear()
-            await self._context.clarification_received.wait()
+            await self._checkpoint()
+            await self._wait_for_clarification()
 
     async def execute(
         self,
     ):
         self.logger.info(f"🚀 User provided {len(self.task_messages)} messages.")
         try:
+            if self._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION:
+                # Restored from a checkpoint made while waiting for the user
+                await self._wait_for_clarification()
             while self._context.state not in AgentStatesEnum.FINISH_STATES.value:
                 self._context.iteration += 1
                 self.logger.info(f"Step {self._context.iteration} started")
+                await self.streaming_generator.drain()
                 await self._execution_step()
+                await self._checkpoint()
             return self._context.execution_result
 
         except Exception as e:
@@ -222,6 +485,12 @@ class BaseAgent(AgentRegistryMixin):
             self._context.state = AgentStatesEnum.FAILED
             traceback.print_exc()
         finally:
+            self._cancel_speculative_calls()
+            if self._context.prefetcher is not None:
+                self._context.prefetcher.cancel()
             if self.streaming_generator is not None:
-                self.streaming_generator.finish(self._context.execution_result)
+                self.streaming_generator.finish(self._context.execution_result, usage=self._context.usage.to_openai())
+                # Nothing is streamed after the agent stops, late subscribers only need the final frames
+                self.streaming_generator.release_replay()
             self._save_agent_log()
+            await self._checkpoint()
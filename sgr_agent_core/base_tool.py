@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable
+from weakref import WeakKeyDictionary
 
 from fastmcp import Client
+from openai import pydantic_function_tool
+from openai.types.chat import ChatCompletionFunctionToolParam
 from pydantic import BaseModel
 
 from sgr_agent_core.agent_config import GlobalConfig
@@ -17,6 +20,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Weak keys let dynamically created (MCP) tool classes be garbage collected
+_function_tool_cache: WeakKeyDictionary[type, tuple[tuple, ChatCompletionFunctionToolParam]] = WeakKeyDictionary()
+
 
 class ToolRegistryMixin:
     def __init_subclass__(cls, **kwargs) -> None:
@@ -30,16 +36,53 @@ class BaseTool(BaseModel, ToolRegistryMixin):
 
     tool_name: ClassVar[str] = None
     description: ClassVar[str] = None
+    # Can be started before the LLM response is complete (execution.speculative_tools).
+    # Speculative calls run only fetch(); its result is passed to __call__ as `fetched`
+    # once the final response confirms the call, and is discarded otherwise
+    speculative: ClassVar[bool] = False
+    # Can run concurrently with other such calls from the same LLM response (ToolCallingAgent):
+    # the tool does not depend on context changes made by the other calls
+    concurrency_safe: ClassVar[bool] = False
 
     async def __call__(self, context: AgentContext, config: AgentConfig, **kwargs) -> str:
         """The result should be a string or dumped JSON."""
         raise NotImplementedError("Execute method must be implemented by subclass")
 
+    async def fetch(self, context: AgentContext, config: AgentConfig) -> Any:
+        """Read the external data of a speculative call.
+
+        Must not change the context: the result may be discarded.
+        """
+        raise NotImplementedError("Speculative tools must implement fetch")
+
     def __init_subclass__(cls, **kwargs) -> None:
         cls.tool_name = cls.tool_name or cls.__name__.lower()
         cls.description = cls.description or cls.__doc__ or ""
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def to_function_tool(cls, description: str | None = None) -> ChatCompletionFunctionToolParam:
+        """OpenAI function tool definition of the tool.
+
+        The strict JSON schema is generated once per class and reused. It is
+        regenerated if tool_name or docstring change after class creation
+        (MCP tools are renamed that way). The result is shared, do not modify it.
+        """
+        key = (cls.tool_name, cls.__doc__, description)
+        cached = _function_tool_cache.get(cls)
+        if cached is None or cached[0] != key:
+            cached = (key, pydantic_function_tool(cls, name=cls.tool_name, description=description))
+            _function_tool_cache[cls] = cached
+        return cached[1]
+
+
+def function_tools(
+    tools: Iterable[type[BaseTool]], description: str | None = None
+) -> list[ChatCompletionFunctionToolParam]:
+    """Function tool definitions for a set of tools in a stable order (by tool
+    name), so that requests with the same tools are identical."""
+    return [tool.to_function_tool(description) for tool in sorted(set(tools), key=lambda tool: tool.tool_name)]
+
 
 class MCPBaseTool(BaseTool):
     """Base model for MCP Tool schema."""
@@ -0,0 +1,103 @@
+"""Incremental scanner for JSON documents streamed in chunks."""
+
+import json
+from bisect import bisect_right
+
+JSONPath = tuple[str | int, ...]
+
+
+class _Frame:
+    __slots__ = ("is_object", "start", "key", "current_key", "expect_key", "index")
+
+    def __init__(self, is_object: bool, start: int, key: str | int | None):
+        self.is_object = is_object
+        self.start = start
+        self.key = key
+        self.current_key: str | None = None
+        self.expect_key = is_object
+        self.index = 0
+
+
+class IncrementalJSONParser:
+    """Reports objects and arrays of a streamed JSON document as soon as
+    they are closed.
+
+    Every character is scanned once and chunks are kept unjoined, so
+    feeding a chunk costs O(len(chunk)) plus the length of values closed
+    in it, regardless of the document size. Paths are tuples of object
+    keys and array indexes from the document root, e.g. ("function",) or
+    ().
+
+    Example:
+        parser = IncrementalJSONParser()
+        parser.feed('{"a": {"b": 1}')  # [(("a",), '{"b": 1}')]
+        parser.feed("}")  # [((), '{"a": {"b": 1}}')]
+    """
+
+    def __init__(self):
+        # Chunks of the current document and their offsets in it
+        self._chunks: list[str] = []
+        self._chunk_starts: list[int] = []
+        self._length = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+
+    def _slice(self, start: int, end: int) -> str:
+        """Text of the document between offsets start and end."""
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_right(self._chunk_starts, end - 1)
+        text = "".join(self._chunks[first:last])
+        base = self._chunk_starts[first]
+        return text[start - base : end - base]
+
+    def _path(self, frame: _Frame) -> JSONPath:
+        return tuple(f.key for f in self._stack[1:]) + ((frame.key,) if self._stack else ())
+
+    def feed(self, chunk: str) -> list[tuple[JSONPath, str]]:
+        """Append a chunk and return (path, raw JSON) of values closed in
+        it."""
+        completed = []
+        if not chunk:
+            return completed
+        offset = self._length
+        self._chunks.append(chunk)
+        self._chunk_starts.append(offset)
+        self._length += len(chunk)
+        for i, char in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    top = self._stack[-1] if self._stack else None
+                    if top is not None and top.is_object and top.expect_key:
+                        top.current_key = json.loads(self._slice(self._string_start, i + 1))
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                top = self._stack[-1] if self._stack else None
+                key = None if top is None else (top.current_key if top.is_object else top.index)
+                self._stack.append(_Frame(char == "{", i, key))
+            elif char in "}]" and self._stack:
+                frame = self._stack.pop()
+                completed.append((self._path(frame), self._slice(frame.start, i + 1)))
+            elif char == ":" and self._stack:
+                self._stack[-1].expect_key = False
+            elif char == "," and self._stack:
+                top = self._stack[-1]
+                if top.is_object:
+                    top.expect_key = True
+                else:
+                    top.index += 1
+        if not self._stack and not self._in_string:
+            # Nothing refers to the text read so far
+            self._chunks = []
+            self._chunk_starts = []
+        return completed
@@ -0,0 +1,148 @@
+"""Append-only buffer of agent conversation messages."""
+
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import SupportsIndex
+
+
+def _is_system(message) -> bool:
+    return isinstance(message, dict) and message.get("role") == "system"
+
+
+class MessageBuffer(list):
+    """Conversation messages in OpenAI format, optimized for appending.
+
+    Behaves like a list. Appends are tracked incrementally, so consumers
+    can process only the messages added since they last looked, and
+    system messages are indexed for windowing without a full scan. Any
+    other change (assignment, deletion, insertion, reordering) bumps
+    revision, telling consumers to start over.
+    """
+
+    def __init__(self, messages: Iterable[dict] = ()):
+        super().__init__(messages)
+        self.revision = 0
+        self._system_indices = self._index_system_messages()
+
+    def _index_system_messages(self) -> list[int]:
+        return [i for i, message in enumerate(self) if _is_system(message)]
+
+    def _rewritten(self) -> None:
+        self.revision += 1
+        self._system_indices = self._index_system_messages()
+
+    def append(self, message: dict) -> None:
+        if _is_system(message):
+            self._system_indices.append(len(self))
+        super().append(message)
+
+    def extend(self, messages: Iterable[dict]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def __iadd__(self, messages: Iterable[dict]):
+        self.extend(messages)
+        return self
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._rewritten()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._rewritten()
+
+    def __imul__(self, count: SupportsIndex):
+        super().__imul__(count)
+        self._rewritten()
+        return self
+
+    def insert(self, index: SupportsIndex, message: dict) -> None:
+        super().insert(index, message)
+        self._rewritten()
+
+    def pop(self, index: SupportsIndex = -1) -> dict:
+        message = super().pop(index)
+        self._rewritten()
+        return message
+
+    def remove(self, message: dict) -> None:
+        super().remove(message)
+        self._rewritten()
+
+    def clear(self) -> None:
+        super().clear()
+        self._rewritten()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._rewritten()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._rewritten()
+
+    def system_messages(self) -> list[dict]:
+        return [self[i] for i in self._system_indices]
+
+    def last_non_system(self, count: int) -> list[dict]:
+        """Latest count messages other than system messages, in order.
+
+        Costs O(count + system messages among them), not O(len).
+        """
+        selected = []
+        for i in range(len(self) - 1, -1, -1):
+            if len(selected) >= count:
+                break
+            if not _is_system(self[i]):
+                selected.append(self[i])
+        return selected[::-1]
+
+
+class MessageView(Sequence):
+    """Read-only view of the first length messages of an append-only list,
+    optionally followed by a few tail messages.
+
+    Lets the same assembled prompt be extended step after step while
+    views handed out earlier keep their contents.
+    """
+
+    __slots__ = ("_messages", "_length", "_tail")
+
+    def __init__(self, messages: list[dict], length: int, tail: Sequence[dict] = ()):
+        self._messages = messages
+        self._length = length
+        self._tail = tuple(tail)
+
+    def __len__(self) -> int:
+        return self._length + len(self._tail)
+
+    def __getitem__(self, index):
+        total = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(total)
+            if stop <= self._length and step == 1:
+                return self._messages[start:stop]
+            return [self[i] for i in range(start, stop, step)]
+        if not -total <= index < total:
+            raise IndexError("message index out of range")
+        index %= total
+        return self._messages[index] if index < self._length else self._tail[index - self._length]
+
+    def __iter__(self) -> Iterator[dict]:
+        yield from islice(self._messages, self._length)
+        yield from self._tail
+
+    def __add__(self, other: Iterable[dict]) -> list[dict]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[dict]) -> list[dict]:
+        return [*other, *self]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"MessageView({list(self)!r})"
@@ -3,6 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from openai.types import CompletionUsage
 from pydantic import BaseModel, Field
 
 
@@ -15,6 +16,9 @@ class SourceData(BaseModel):
     snippet: str = Field(default="", description="Search snippet or summary")
     full_content: str = Field(default="", description="Full scraped content")
     char_count: int = Field(default=0, description="Character count of full content")
+    content_hash: str | None = Field(
+        default=None, description="Hash of the full content kept in the page cache instead of full_content"
+    )
 
     def __str__(self):
         return f"[{self.number}] {self.title or 'Untitled'} - {self.url}"
@@ -43,6 +47,35 @@ class AgentStatesEnum(str, Enum):
     FINISH_STATES = {COMPLETED, FAILED, ERROR}
 
 
+class TokenUsage(BaseModel):
+    """Token usage of LLM calls, as reported by the provider."""
+
+    prompt_tokens: int = Field(default=0, description="Prompt tokens")
+    completion_tokens: int = Field(default=0, description="Completion tokens")
+    total_tokens: int = Field(default=0, description="Total tokens")
+    cached_tokens: int = Field(default=0, description="Prompt tokens read from the provider prompt cache")
+
+    def add(self, usage: CompletionUsage) -> None:
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.total_tokens += usage.total_tokens
+        details = usage.prompt_tokens_details
+        if details is not None and details.cached_tokens:
+            self.cached_tokens += details.cached_tokens
+        elif usage.model_extra:
+            # DeepSeek-style providers report cache hits outside prompt_tokens_details
+            self.cached_tokens += usage.model_extra.get("prompt_cache_hit_tokens") or 0
+
+    def to_openai(self) -> dict[str, Any]:
+        """Usage in the format of OpenAI chat completion responses."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "prompt_tokens_details": {"cached_tokens": self.cached_tokens},
+        }
+
+
 class AgentContext(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
 
@@ -51,11 +84,35 @@ class AgentContext(BaseModel):
 
     state: AgentStatesEnum = Field(default=AgentStatesEnum.INITED, description="Current research state")
     iteration: int = Field(default=0, description="Current iteration number")
+    queue_wait_time: float = Field(default=0.0, description="Seconds spent waiting for an execution slot")
+    prefix_hash: str | None = Field(default=None, description="Hash of the prompt prefix used in the last step")
+    prefix_changes: int = Field(default=0, description="Number of steps whose prompt prefix differed from the previous")
+    llm_calls: int = Field(default=0, description="Number of LLM calls made by the agent")
+    llm_calls_per_step: dict[int, int] = Field(default_factory=dict, description="Number of LLM calls per iteration")
+    fused_step_fallbacks: int = Field(default=0, description="Fused steps that fell back to separate LLM calls")
+    speculative_started: int = Field(default=0, description="Tool calls started from a partially streamed response")
+    speculative_confirmed: int = Field(default=0, description="Speculative tool calls confirmed by the final response")
+    speculative_cancelled: int = Field(default=0, description="Speculative tool calls cancelled or discarded")
+    compaction_summaries: int = Field(default=0, description="Number of tool results summarized for compaction")
+    compaction_saved_tokens: int = Field(default=0, description="Tokens saved by compaction in the last prompt")
+    usage: TokenUsage = Field(default_factory=TokenUsage, description="Token usage of all LLM calls of the agent")
+    usage_per_step: dict[int, TokenUsage] = Field(default_factory=dict, description="Token usage per iteration")
 
     searches: list[SearchResult] = Field(default_factory=list, description="List of performed searches")
     sources: dict[str, SourceData] = Field(default_factory=dict, description="Dictionary of found sources")
 
     searches_used: int = Field(default=0, description="Number of searches performed")
+    searches_in_flight: int = Field(
+        default=0, exclude=True, description="Searches started by tool calls and not recorded in searches_used yet"
+    )
+    search_cache_hits: int = Field(default=0, description="Number of searches served from cache")
+    search_cache_misses: int = Field(default=0, description="Number of cacheable searches sent to the search API")
+    prefetch_started: int = Field(default=0, description="Number of pages prefetched after searches")
+    prefetch_used: int = Field(default=0, description="Number of prefetched pages used by page extraction")
+    prefetch_wasted: int = Field(default=0, description="Number of prefetched pages that failed or were never used")
+    prefetcher: Any = Field(
+        default=None, exclude=True, description="Per-agent ExtractPrefetcher, created by search tools when enabled"
+    )
 
     clarifications_used: int = Field(default=0, description="Number of clarifications requested")
     clarification_received: asyncio.Event = Field(
@@ -66,9 +123,46 @@ class AgentContext(BaseModel):
         default=None, description="Custom context for project-specific data"
     )
 
+    def record_llm_call(self, usage: CompletionUsage | None = None) -> None:
+        """Count an LLM call of the current step and add its token usage
+        to the agent and step totals."""
+        self.llm_calls += 1
+        self.llm_calls_per_step[self.iteration] = self.llm_calls_per_step.get(self.iteration, 0) + 1
+        if not isinstance(usage, CompletionUsage):  # Not reported by the provider
+            return
+        self.usage.add(usage)
+        self.usage_per_step.setdefault(self.iteration, TokenUsage()).add(usage)
+
+    def reserve_searches(self, count: int, max_searches: int) -> int:
+        """Reserve up to count searches of the max_searches budget for
+        searches about to run; parallel tool calls share the budget.
+
+        Returns the number of searches reserved, to be released with
+        release_searches() once they are done.
+        """
+        reserved = max(min(count, max_searches - self.searches_used - self.searches_in_flight), 0)
+        self.searches_in_flight += reserved
+        return reserved
+
+    def release_searches(self, count: int) -> None:
+        self.searches_in_flight -= count
+
     def agent_state(self) -> dict:
         return self.model_dump(exclude={"searches", "sources", "clarification_received"})
 
 
+class AgentSnapshot(BaseModel):
+    """Serializable agent state used to checkpoint and restore agents."""
+
+    id: str = Field(description="Agent ID")
+    def_name: str = Field(description="Name of the agent definition the agent was created from")
+    creation_time: datetime = Field(description="Agent creation time")
+    updated_at: datetime = Field(default_factory=datetime.now, description="Checkpoint time")
+    task_messages: list[dict] = Field(default_factory=list, description="Agent task messages in OpenAI format")
+    conversation: list[dict] = Field(default_factory=list, description="Agent conversation in OpenAI format")
+    toolkit: list[str] = Field(default_factory=list, description="Names of the agent tools")
+    context: dict[str, Any] = Field(default_factory=dict, description="Dumped AgentContext")
+
+
 class AgentStatistics(BaseModel):
     pass
@@ -3,8 +3,9 @@ from __future__ import annotations
 import logging
 import operator
 from abc import ABC
+from collections import OrderedDict
 from functools import reduce
-from typing import Annotated, Literal, Type, TypeVar
+from typing import Annotated, ClassVar, Literal, Type, TypeVar
 
 from pydantic import BaseModel, Field, create_model
 
@@ -35,7 +36,16 @@ class DiscriminantToolMixin(BaseModel):
 
 class NextStepToolsBuilder:
     """SGR Core - Builder for NextStepTool with a dynamic union tool function type on
-    pydantic models level."""
+    pydantic models level.
+
+    Built models are cached per set of tools: the same toolkit gets the same
+    model class (and its validators and JSON schema) regardless of tools order.
+    """
+
+    cache_size: ClassVar[int] = 256
+    cache_hits: ClassVar[int] = 0
+    cache_misses: ClassVar[int] = 0
+    _cache: ClassVar[OrderedDict[frozenset[type], Type[NextStepToolStub]]] = OrderedDict()
 
     @classmethod
     def _create_discriminant_tool(cls, tool_class: Type[T]) -> Type[BaseModel]:
@@ -60,8 +70,38 @@ class NextStepToolsBuilder:
 
     @classmethod
     def build_NextStepTools(cls, tools_list: list[Type[T]]) -> Type[NextStepToolStub]:  # noqa
-        return create_model(
+        key = frozenset(tools_list)
+        if (model := cls._cache.get(key)) is not None:
+            cls._cache.move_to_end(key)
+            cls.cache_hits += 1
+            return model
+
+        cls.cache_misses += 1
+        # Stable union order keeps the schema identical for the same toolkit
+        ordered_tools = sorted(key, key=lambda tool: (tool.tool_name, tool.__qualname__))
+        model = create_model(
             "NextStepTools",
             __base__=NextStepToolStub,
-            function=(cls._create_tool_types_union(tools_list), Field()),
+            function=(cls._create_tool_types_union(ordered_tools), Field()),
         )
+        cls._cache[key] = model
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.popitem(last=False)
+        return model
+
+    @classmethod
+    def cache_info(cls) -> dict[str, int]:
+        """NextStepTools models cache statistics."""
+        return {
+            "hits": cls.cache_hits,
+            "misses": cls.cache_misses,
+            "size": len(cls._cache),
+            "max_size": cls.cache_size,
+        }
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop cached models and reset statistics."""
+        cls._cache.clear()
+        cls.cache_hits = 0
+        cls.cache_misses = 0
@@ -21,6 +21,7 @@ async def lifespan(_: FastAPI):
     for defn in AgentFactory.get_definitions_list():
         logger.info(f"Agent definition loaded: {defn}")
     yield
+    await AgentFactory.shutdown()
 
 
 app = FastAPI(title="SGR Agent Core API", version=__version__, lifespan=lifespan)
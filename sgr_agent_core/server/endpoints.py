@@ -1,7 +1,7 @@
 import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
 
 from sgr_agent_core import AgentFactory, AgentStatesEnum, BaseAgent
@@ -9,17 +9,53 @@ from sgr_agent_core.server.models import (
     AgentListItem,
     AgentListResponse,
     AgentStateResponse,
+    AgentStorageStatsResponse,
     ChatCompletionRequest,
     ClarificationRequest,
     HealthResponse,
+    SchedulerStatsResponse,
 )
+from sgr_agent_core.services import AgentQueueFullError, AgentScheduler, AgentStore
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# ToDo: better to move to a separate service
-agents_storage: dict[str, BaseAgent] = {}
+agents_storage = AgentStore()
+agents_scheduler = AgentScheduler()
+# Restores in progress, shared by concurrent requests for the same agent
+_restoring: dict[str, asyncio.Future[BaseAgent | None]] = {}
+
+
+async def _restore_agent(agent_id: str) -> BaseAgent | None:
+    agent = await AgentFactory.restore(agent_id)
+    if stored := agents_storage.get(agent_id):
+        return stored
+    if agent is None:
+        return None
+    agents_storage[agent.id] = agent
+    # No client reads stream() of a restored agent until it asks for clarification,
+    # frames go only to the bounded replay buffer for subscribers
+    agent.streaming_generator.detach()
+    if agent._context.state not in AgentStatesEnum.FINISH_STATES.value:
+        # Execution loop was lost with the previous process, resume it from the checkpoint
+        _ = asyncio.create_task(agents_scheduler.submit(agent, bounded=False))
+    return agent
+
+
+async def _get_agent(agent_id: str) -> BaseAgent | None:
+    """Get an agent from storage or restore it from its last checkpoint.
+
+    Concurrent requests for an agent that is not in memory wait for one
+    restore, so a single execution loop is resumed.
+    """
+    if agent := agents_storage.get(agent_id):
+        return agent
+    if (restoring := _restoring.get(agent_id)) is None:
+        restoring = _restoring[agent_id] = asyncio.ensure_future(_restore_agent(agent_id))
+        restoring.add_done_callback(lambda _: _restoring.pop(agent_id, None))
+    # A cancelled request must not cancel the restore other requests wait for
+    return await asyncio.shield(restoring)
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -29,21 +65,60 @@ async def health_check():
 
 @router.get("/agents/{agent_id}/state", response_model=AgentStateResponse)
 async def get_agent_state(agent_id: str):
-    if agent_id not in agents_storage:
+    agent = await _get_agent(agent_id)
+    if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    agent = agents_storage[agent_id]
-
     return AgentStateResponse(
         agent_id=agent.id,
         task_messages=agent.task_messages,
         sources_count=len(agent._context.sources),
+        queue_position=agents_scheduler.queue_position(agent.id),
+        **agent.streaming_generator.stats(),
         **agent._context.model_dump(),
     )
 
 
+@router.get("/agents/{agent_id}/stream")
+async def stream_agent(
+    agent_id: str,
+    last_event_id: int | None = Header(default=None, alias="Last-Event-ID"),
+):
+    """Follow the SSE stream of an agent alongside the client that started
+    it.
+
+    Frames carry event ids; a reconnect with Last-Event-ID resumes after
+    that frame, as long as it is still in the replay buffer.
+    """
+    agent = await _get_agent(agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail="Agent not found")
+
+    return StreamingResponse(
+        agent.streaming_generator.subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Agent-ID": str(agent.id),
+        },
+    )
+
+
+@router.get("/agents/stats", response_model=AgentStorageStatsResponse)
+async def get_agents_storage_stats():
+    agents_storage.evict()
+    return AgentStorageStatsResponse(**agents_storage.stats())
+
+
+@router.get("/agents/queue", response_model=SchedulerStatsResponse)
+async def get_agents_queue_stats():
+    return SchedulerStatsResponse(**agents_scheduler.stats())
+
+
 @router.get("/agents", response_model=AgentListResponse)
 async def get_agents_list():
+    agents_storage.evict()
     agents_list = [
         AgentListItem(
             agent_id=agent.id,
@@ -76,7 +151,7 @@ async def get_available_models():
 @router.post("/agents/{agent_id}/provide_clarification")
 async def provide_clarification(agent_id: str, request: ClarificationRequest):
     try:
-        agent = agents_storage.get(agent_id)
+        agent = await _get_agent(agent_id)
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -98,6 +173,11 @@ async def provide_clarification(agent_id: str, request: ClarificationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _queue_full_error(e: AgentQueueFullError) -> HTTPException:
+    logger.warning(f"Rejecting request: {e}")
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
 def _is_agent_id(model_str: str) -> bool:
     """Check if the model string is an agent ID (contains underscore and UUID-
     like format)."""
@@ -110,17 +190,13 @@ async def create_chat_completion(request: ChatCompletionRequest):
         raise HTTPException(status_code=501, detail="Only streaming responses are supported. Set 'stream=true'")
 
     # Check if this is a clarification request for an existing agent
-    if (
-        request.model
-        and isinstance(request.model, str)
-        and _is_agent_id(request.model)
-        and request.model in agents_storage
-        and agents_storage[request.model]._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION
-    ):
-        return await provide_clarification(
-            agent_id=request.model,
-            request=ClarificationRequest(messages=request.messages.root),
-        )
+    if request.model and isinstance(request.model, str) and _is_agent_id(request.model):
+        agent = await _get_agent(request.model)
+        if agent and agent._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION:
+            return await provide_clarification(
+                agent_id=request.model,
+                request=ClarificationRequest(messages=request.messages.root),
+            )
 
     try:
         agent_def = next(filter(lambda ad: ad.name == request.model, AgentFactory.get_definitions_list()), None)
@@ -130,11 +206,14 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 detail=f"Invalid model '{request.model}'. "
                 f"Available models: {[ad.name for ad in AgentFactory.get_definitions_list()]}",
             )
+        # Reject before paying for agent creation (MCP tools discovery, etc.)
+        agents_scheduler.check_admission(agent_def.name)
         agent = await AgentFactory.create(agent_def, request.messages.root)
         logger.info(f"Created agent '{request.model}' with {len(request.messages)} messages")
 
+        execution = agents_scheduler.submit(agent)
         agents_storage[agent.id] = agent
-        _ = asyncio.create_task(agent.execute())
+        _ = asyncio.create_task(execution)
         return StreamingResponse(
             agent.streaming_generator.stream(),
             media_type="text/event-stream",
@@ -146,6 +225,8 @@ async def create_chat_completion(request: ChatCompletionRequest):
             },
         )
 
+    except AgentQueueFullError as e:
+        raise _queue_full_error(e)
     except ValueError as e:
         logger.error(f"Error completion: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
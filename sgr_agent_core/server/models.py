@@ -7,6 +7,8 @@ from typing import Any, ClassVar, Literal
 from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel, Field, RootModel, field_serializer, field_validator
 
+from sgr_agent_core.models import TokenUsage
+
 
 class MessagesList(RootModel[list[ChatCompletionMessageParam]]):
     """Root model for list of chat completion messages."""
@@ -103,8 +105,36 @@ class AgentStateResponse(BaseModel):
     searches_used: int = Field(description="Number of searches performed")
     clarifications_used: int = Field(description="Number of clarifications requested")
     sources_count: int = Field(description="Number of sources found")
+    search_cache_hits: int = Field(default=0, description="Number of searches served from cache")
+    search_cache_misses: int = Field(default=0, description="Number of cacheable searches sent to the search API")
+    prefetch_started: int = Field(default=0, description="Number of pages prefetched after searches")
+    prefetch_used: int = Field(default=0, description="Number of prefetched pages used by page extraction")
+    prefetch_wasted: int = Field(default=0, description="Number of prefetched pages that failed or were never used")
     current_step_reasoning: dict[str, Any] | None = Field(default=None, description="Current agent step")
     execution_result: str | None = Field(default=None, description="Execution result")
+    queue_position: int | None = Field(default=None, description="Position in the scheduler queue, None if not queued")
+    queue_wait_time: float = Field(default=0.0, description="Seconds spent waiting for an execution slot")
+    prefix_hash: str | None = Field(default=None, description="Hash of the prompt prefix used in the last step")
+    prefix_changes: int = Field(default=0, description="Steps whose prompt prefix differed from the previous step")
+    llm_calls: int = Field(default=0, description="Number of LLM calls made by the agent")
+    llm_calls_per_step: dict[int, int] = Field(default_factory=dict, description="Number of LLM calls per iteration")
+    fused_step_fallbacks: int = Field(default=0, description="Fused steps that fell back to separate LLM calls")
+    speculative_started: int = Field(default=0, description="Tool calls started from a partially streamed response")
+    speculative_confirmed: int = Field(default=0, description="Speculative tool calls confirmed by the final response")
+    speculative_cancelled: int = Field(default=0, description="Speculative tool calls cancelled or discarded")
+    compaction_summaries: int = Field(default=0, description="Number of tool results summarized for compaction")
+    compaction_saved_tokens: int = Field(default=0, description="Tokens saved by compaction in the last prompt")
+    usage: TokenUsage = Field(default_factory=TokenUsage, description="Token usage of all LLM calls of the agent")
+    usage_per_step: dict[int, TokenUsage] = Field(default_factory=dict, description="Token usage per iteration")
+    stream_frames: int = Field(default=0, description="SSE frames sent to the agent stream")
+    stream_bytes: int = Field(default=0, description="Bytes sent to the agent stream")
+    stream_deltas: int = Field(default=0, description="Text deltas received, before coalescing into frames")
+    stream_buffered_bytes: int = Field(default=0, description="Bytes of SSE frames not yet read by the client")
+    stream_peak_buffered_bytes: int = Field(default=0, description="Largest number of bytes buffered for the client")
+    stream_dropped_frames: int = Field(default=0, description="SSE frames dropped because the buffer was full")
+    stream_detached: bool = Field(default=False, description="Whether the client disconnected or was detached")
+    stream_subscribers: int = Field(default=0, description="Clients following the agent stream via /stream")
+    stream_last_event_id: int = Field(default=0, description="Event id of the latest frame in the replay buffer")
 
 
 class AgentListItem(BaseModel):
@@ -119,8 +149,29 @@ class AgentListResponse(BaseModel):
     total: int = Field(description="Total number of agents")
 
 
+class AgentStorageStatsResponse(BaseModel):
+    total: int = Field(description="Total number of stored agents")
+    running: int = Field(description="Number of running agents")
+    waiting_for_clarification: int = Field(description="Number of agents waiting for clarification")
+    finished: int = Field(description="Number of finished agents")
+    finished_memory_bytes: int = Field(description="Approximate memory held by finished agents")
+    evictions: dict[str, int] = Field(default_factory=dict, description="Evicted agents count by reason")
+
+
 class ClarificationRequest(BaseModel):
     """Request for providing clarifications to an agent in OpenAI messages
     format."""
 
     messages: list[ChatCompletionMessageParam] = Field(description="Clarification messages in OpenAI format")
+
+
+class SchedulerStatsResponse(BaseModel):
+    running: int = Field(description="Number of agents holding an execution slot")
+    running_by_definition: dict[str, int] = Field(description="Number of executing agents per definition")
+    queued: int = Field(description="Number of agents waiting for an execution slot")
+    max_concurrent_agents: int = Field(description="Execution slots limit")
+    max_queue_size: int = Field(description="Wait queue size limit")
+    admitted: int = Field(description="Total number of admitted agents")
+    rejected: int = Field(description="Total number of agents rejected because the queue was full")
+    average_wait_time: float = Field(description="Average seconds spent in the queue")
+    longest_current_wait_time: float = Field(description="Seconds the oldest queued agent has been waiting")
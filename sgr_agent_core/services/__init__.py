@@ -1,12 +1,37 @@
 """Services module for external integrations and business logic."""
 
+from sgr_agent_core.services.agent_scheduler import AgentQueueFullError, AgentScheduler
+from sgr_agent_core.services.agent_state_backend import AgentStateBackend, SQLiteAgentStateBackend
+from sgr_agent_core.services.agent_store import AgentStore
+from sgr_agent_core.services.context_compactor import ContextCompactor
+from sgr_agent_core.services.extract_prefetcher import ExtractPrefetcher
+from sgr_agent_core.services.log_writer import LogWriter
 from sgr_agent_core.services.mcp_service import MCP2ToolConverter
+from sgr_agent_core.services.page_cache import PageContentCache
+from sgr_agent_core.services.passage_ranker import Passage, PassageRanker
 from sgr_agent_core.services.prompt_loader import PromptLoader
 from sgr_agent_core.services.registry import AgentRegistry, ToolRegistry
+from sgr_agent_core.services.search_cache import SearchCache
 from sgr_agent_core.services.tavily_search import TavilySearchService
+from sgr_agent_core.services.token_counter import MessageTokenCounter, Tokenizer, get_tokenizer
 
 __all__ = [
+    "AgentStore",
+    "AgentScheduler",
+    "AgentQueueFullError",
+    "AgentStateBackend",
+    "SQLiteAgentStateBackend",
     "TavilySearchService",
+    "ExtractPrefetcher",
+    "ContextCompactor",
+    "LogWriter",
+    "SearchCache",
+    "PageContentCache",
+    "PassageRanker",
+    "Passage",
+    "Tokenizer",
+    "MessageTokenCounter",
+    "get_tokenizer",
     "MCP2ToolConverter",
     "ToolRegistry",
     "AgentRegistry",
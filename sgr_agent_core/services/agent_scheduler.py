@@ -0,0 +1,208 @@
+"""Admission control and concurrency limiting for agent execution."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Any, Coroutine
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import SchedulerConfig
+    from sgr_agent_core.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentQueueFullError(Exception):
+    """Raised when an agent cannot be admitted because the wait queue is
+    full."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _QueuedAgent:
+    def __init__(self, agent_id: str | None, def_name: str, future: asyncio.Future):
+        self.agent_id = agent_id
+        self.def_name = def_name
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class ExecutionSlot:
+    """Slot held by an executing agent.
+
+    Agents release the slot while they wait for user clarification and
+    acquire it again before continuing.
+    """
+
+    def __init__(self, scheduler: AgentScheduler, agent_id: str, def_name: str):
+        self._scheduler = scheduler
+        self._agent_id = agent_id
+        self._def_name = def_name
+        self.held = False
+
+    async def acquire(self, queued: _QueuedAgent | None = None) -> float:
+        """Wait for a free slot.
+
+        Args:
+            queued: Queue entry created at admission, a new unbounded one is created otherwise
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.held:
+            return 0.0
+        if queued is None:
+            queued = self._scheduler._enqueue(self._agent_id, self._def_name, bounded=False)
+        waited = await self._scheduler._wait(queued)
+        self.held = True
+        return waited
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self._scheduler._release(self._def_name)
+
+
+class AgentScheduler:
+    """Limits the number of concurrently executing agents.
+
+    Agents get a slot immediately if the global limit and the limit for their
+    definition allow it, otherwise they wait in a bounded FIFO queue. When the
+    queue is full, admission fails fast with AgentQueueFullError so the API
+    can answer 429 instead of piling up work.
+    """
+
+    def __init__(self, config: SchedulerConfig | None = None):
+        self._config = config
+        self._running: Counter[str] = Counter()
+        self._queue: deque[_QueuedAgent] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self._waited_count = 0
+        self._total_wait_time = 0.0
+
+    @property
+    def config(self) -> SchedulerConfig:
+        if self._config is not None:
+            return self._config
+        from sgr_agent_core.agent_config import GlobalConfig
+
+        return GlobalConfig().scheduler
+
+    def _has_capacity(self, def_name: str) -> bool:
+        config = self.config
+        if sum(self._running.values()) >= config.max_concurrent_agents:
+            return False
+        limit = config.definition_limits.get(def_name)
+        return limit is None or self._running[def_name] < limit
+
+    def check_admission(self, def_name: str) -> None:
+        """Fail fast if an agent of the given definition would be rejected.
+
+        Raises:
+            AgentQueueFullError: If there is no free slot and the wait queue is full
+        """
+        if not self._has_capacity(def_name) and len(self._queue) >= self.config.max_queue_size:
+            self.rejected += 1
+            raise AgentQueueFullError(
+                f"Agent queue is full ({len(self._queue)} agents waiting)", retry_after=self.config.retry_after
+            )
+
+    def _enqueue(self, agent_id: str | None, def_name: str, bounded: bool = True) -> _QueuedAgent:
+        if bounded:
+            self.check_admission(def_name)
+        future = asyncio.get_running_loop().create_future()
+        queued = _QueuedAgent(agent_id, def_name, future)
+        if self._has_capacity(def_name):
+            self._running[def_name] += 1
+            future.set_result(None)
+        else:
+            self._queue.append(queued)
+        return queued
+
+    async def _wait(self, queued: _QueuedAgent) -> float:
+        try:
+            await queued.future
+        except asyncio.CancelledError:
+            if queued in self._queue:
+                self._queue.remove(queued)
+            elif queued.future.done() and not queued.future.cancelled():
+                # The slot was granted right before cancellation
+                self._release(queued.def_name)
+            raise
+        waited = time.monotonic() - queued.enqueued_at
+        self._waited_count += 1
+        self._total_wait_time += waited
+        return waited
+
+    def _release(self, def_name: str) -> None:
+        self._running[def_name] -= 1
+        if self._running[def_name] <= 0:
+            del self._running[def_name]
+        for queued in list(self._queue):
+            if self._has_capacity(queued.def_name):
+                self._queue.remove(queued)
+                self._running[queued.def_name] += 1
+                queued.future.set_result(None)
+
+    def submit(self, agent: BaseAgent, bounded: bool = True) -> Coroutine[Any, Any, str | None]:
+        """Admit the agent and return a coroutine that executes it once a
+        slot is free.
+
+        Admission happens synchronously, so callers can reject the request
+        before starting a response stream.
+
+        Args:
+            agent: Agent to execute
+            bounded: Respect the queue size limit (disable for agents that were already admitted once)
+
+        Returns:
+            Coroutine to run as a task
+
+        Raises:
+            AgentQueueFullError: If the wait queue is full
+        """
+        queued = self._enqueue(agent.id, agent.def_name, bounded=bounded)
+        self.admitted += 1
+        return self._run(agent, queued)
+
+    async def _run(self, agent: BaseAgent, queued: _QueuedAgent) -> str | None:
+        slot = ExecutionSlot(self, agent.id, agent.def_name)
+        agent.execution_slot = slot
+        waited = await slot.acquire(queued)
+        try:
+            agent._context.queue_wait_time += waited
+            if waited > 0.1:
+                logger.info(f"⏳ Agent {agent.id} started after {waited:.1f}s in queue")
+            return await agent.execute()
+        finally:
+            slot.release()
+            agent.execution_slot = None
+
+    def queue_position(self, agent_id: str) -> int | None:
+        """1-based position of the agent in the wait queue or None if it is
+        not queued."""
+        for position, queued in enumerate(self._queue, start=1):
+            if queued.agent_id == agent_id:
+                return position
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """Current load, queue depth and wait time statistics."""
+        now = time.monotonic()
+        return {
+            "running": sum(self._running.values()),
+            "running_by_definition": dict(self._running),
+            "queued": len(self._queue),
+            "max_concurrent_agents": self.config.max_concurrent_agents,
+            "max_queue_size": self.config.max_queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "average_wait_time": self._total_wait_time / self._waited_count if self._waited_count else 0.0,
+            "longest_current_wait_time": max((now - q.enqueued_at for q in self._queue), default=0.0),
+        }
@@ -0,0 +1,91 @@
+"""Persistence backends for agent state checkpoints."""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+from sgr_agent_core.models import AgentSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class AgentStateBackend(ABC):
+    """Storage for agent snapshots.
+
+    Methods are async so implementations can use a networked store
+    (Redis, Postgres, etc.) without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def save(self, snapshot: AgentSnapshot) -> None:
+        """Create or replace the agent snapshot."""
+
+    @abstractmethod
+    async def load(self, agent_id: str) -> AgentSnapshot | None:
+        """Load the agent snapshot or return None if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, agent_id: str) -> None:
+        """Remove the agent snapshot if it exists."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class SQLiteAgentStateBackend(AgentStateBackend):
+    """Local SQLite backend.
+
+    Queries run in a worker thread; one connection is shared and
+    guarded by a lock.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS agent_snapshots ("
+                "id TEXT PRIMARY KEY, state TEXT, updated_at TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+
+    def _save(self, snapshot: AgentSnapshot) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_snapshots (id, state, updated_at, data) VALUES (?, ?, ?, ?)",
+                (
+                    snapshot.id,
+                    snapshot.context.get("state"),
+                    snapshot.updated_at.isoformat(),
+                    snapshot.model_dump_json(),
+                ),
+            )
+
+    def _load(self, agent_id: str) -> AgentSnapshot | None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM agent_snapshots WHERE id = ?", (agent_id,)).fetchone()
+        return AgentSnapshot.model_validate_json(row[0]) if row else None
+
+    def _delete(self, agent_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM agent_snapshots WHERE id = ?", (agent_id,))
+
+    async def save(self, snapshot: AgentSnapshot) -> None:
+        await asyncio.to_thread(self._save, snapshot)
+
+    async def load(self, agent_id: str) -> AgentSnapshot | None:
+        return await asyncio.to_thread(self._load, agent_id)
+
+    async def delete(self, agent_id: str) -> None:
+        await asyncio.to_thread(self._delete, agent_id)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        logger.info(f"Agent state database closed: {self._path}")
@@ -0,0 +1,256 @@
+"""Bounded in-memory storage for agents served by the API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter, OrderedDict
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Any, Iterator
+
+from pydantic import BaseModel
+
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.stream import StreamReplayBuffer
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import AgentStoreConfig
+    from sgr_agent_core.base_agent import BaseAgent
+    from sgr_agent_core.services.agent_state_backend import AgentStateBackend
+
+logger = logging.getLogger(__name__)
+
+
+def _deep_size(obj: Any, seen: set[int]) -> int:
+    """Approximate memory footprint of plain data: strings, containers and
+    pydantic models."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (str, bytes)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(_deep_size(v, seen) for v in obj)
+    if isinstance(obj, BaseModel):
+        return sys.getsizeof(obj) + _deep_size(obj.__dict__, seen)
+    return sys.getsizeof(obj)
+
+
+def _data_size(agent: BaseAgent) -> int:
+    seen: set[int] = set()
+    return sum(
+        _deep_size(getattr(agent, attr, None), seen) for attr in ("task_messages", "conversation", "log", "_context")
+    )
+
+
+def _replay_size(agent: BaseAgent) -> int:
+    replay = getattr(getattr(agent, "streaming_generator", None), "replay", None)
+    return replay.nbytes if isinstance(replay, StreamReplayBuffer) else 0
+
+
+def estimate_agent_size(agent: BaseAgent) -> int:
+    """Estimate the number of bytes held by the agent's conversation, log,
+    collected sources and stream replay buffer."""
+    return _data_size(agent) + _replay_size(agent)
+
+
+class AgentStore(MutableMapping[str, "BaseAgent"]):
+    """Agent storage with LRU, TTL and memory-based eviction.
+
+    Agents that are still running are never evicted. Finished agents (state in FINISH_STATES)
+    are evicted after ``finished_ttl`` seconds without access, when there are more than
+    ``max_finished_agents`` of them or when their estimated size exceeds ``max_memory_mb``.
+    Agents waiting for clarification have their own TTL and count limit; evicting such an
+    agent marks it as failed and wakes up its execution loop so it can shut down cleanly.
+
+    Reads through ``store[agent_id]`` / ``store.get(agent_id)`` refresh the agent's LRU position.
+    Evicted agents are never resumed, so their checkpoints are deleted from the state backend.
+    """
+
+    def __init__(self, config: AgentStoreConfig | None = None):
+        self._config = config
+        self._agents: OrderedDict[str, BaseAgent] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._state_since: dict[str, tuple[AgentStatesEnum, float]] = {}
+        self._finished_sizes: dict[str, int] = {}
+        self._checkpoint_deletes: set[asyncio.Task] = set()
+        self.evictions: Counter[str] = Counter()
+
+    @property
+    def config(self) -> AgentStoreConfig:
+        if self._config is not None:
+            return self._config
+        from sgr_agent_core.agent_config import GlobalConfig
+
+        return GlobalConfig().storage
+
+    @staticmethod
+    def _is_finished(agent: BaseAgent) -> bool:
+        state = agent._context.state
+        return isinstance(state, str) and state in AgentStatesEnum.FINISH_STATES.value
+
+    @staticmethod
+    def _is_waiting(agent: BaseAgent) -> bool:
+        return agent._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION
+
+    def _idle_time(self, agent_id: str, now: float) -> float:
+        """Seconds since the agent was last accessed or first seen in its
+        current state, whichever is later."""
+        state = self._agents[agent_id]._context.state
+        seen_state, since = self._state_since.get(agent_id, (None, now))
+        if seen_state != state:
+            self._state_since[agent_id] = (state, now)
+            since = now
+        return now - max(self._last_access[agent_id], since)
+
+    def _is_expired(self, agent_id: str, now: float) -> bool:
+        agent = self._agents[agent_id]
+        idle = self._idle_time(agent_id, now)
+        if self._is_finished(agent):
+            return idle > self.config.finished_ttl
+        if self._is_waiting(agent):
+            return idle > self.config.waiting_ttl
+        return False
+
+    def __getitem__(self, agent_id: str) -> BaseAgent:
+        agent = self._agents[agent_id]
+        now = time.monotonic()
+        if self._is_expired(agent_id, now):
+            self._evict(agent_id, "ttl")
+            raise KeyError(agent_id)
+        self._agents.move_to_end(agent_id)
+        self._last_access[agent_id] = now
+        return agent
+
+    def __setitem__(self, agent_id: str, agent: BaseAgent) -> None:
+        self._agents[agent_id] = agent
+        self._agents.move_to_end(agent_id)
+        self._last_access[agent_id] = time.monotonic()
+        self._state_since.pop(agent_id, None)
+        self._finished_sizes.pop(agent_id, None)
+        self.evict()
+
+    def __delitem__(self, agent_id: str) -> None:
+        del self._agents[agent_id]
+        self._last_access.pop(agent_id, None)
+        self._state_since.pop(agent_id, None)
+        self._finished_sizes.pop(agent_id, None)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._agents
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._agents))
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def values(self) -> list[BaseAgent]:  # type: ignore[override]
+        """Snapshot of stored agents without refreshing their LRU
+        position."""
+        return list(self._agents.values())
+
+    def items(self) -> list[tuple[str, BaseAgent]]:  # type: ignore[override]
+        """Snapshot of stored (id, agent) pairs without refreshing their LRU
+        position."""
+        return list(self._agents.items())
+
+    def clear(self) -> None:
+        self._agents.clear()
+        self._last_access.clear()
+        self._state_since.clear()
+        self._finished_sizes.clear()
+
+    def _finished_size(self, agent_id: str) -> int:
+        """Finished agents no longer change, so their data size is computed
+        once; the stream replay buffer shrinks when its last subscriber
+        leaves."""
+        agent = self._agents[agent_id]
+        if agent_id not in self._finished_sizes:
+            self._finished_sizes[agent_id] = _data_size(agent)
+        return self._finished_sizes[agent_id] + _replay_size(agent)
+
+    @staticmethod
+    async def _delete_checkpoint(agent: BaseAgent, backend: AgentStateBackend) -> None:
+        try:
+            await backend.delete(agent.id)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to delete checkpoint of agent {agent.id}: {e}")
+
+    def _discard_checkpoint(self, agent: BaseAgent) -> None:
+        """Delete the agent checkpoint and stop further checkpoints (an
+        evicted waiting agent still checkpoints when its loop stops)."""
+        backend, agent.state_backend = agent.state_backend, None
+        if backend is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._delete_checkpoint(agent, backend))
+        except RuntimeError:  # No event loop, e.g. the store is used outside the server
+            return
+        self._checkpoint_deletes.add(task)
+        task.add_done_callback(self._checkpoint_deletes.discard)
+
+    def _evict(self, agent_id: str, reason: str) -> None:
+        agent = self._agents[agent_id]
+        if self._is_waiting(agent):
+            # Unblock the execution loop waiting for clarification, it will stop on the finish state
+            agent._context.state = AgentStatesEnum.FAILED
+            agent._context.clarification_received.set()
+            reason = f"waiting_{reason}"
+        self._discard_checkpoint(agent)
+        del self[agent_id]
+        self.evictions[reason] += 1
+        logger.info(f"🗑️ Agent {agent_id} evicted from storage ({reason})")
+
+    def evict(self) -> int:
+        """Evict expired and excess agents.
+
+        Returns:
+            Number of evicted agents
+        """
+        config = self.config
+        now = time.monotonic()
+        evicted_before = sum(self.evictions.values())
+
+        for agent_id in [agent_id for agent_id in self._agents if self._is_expired(agent_id, now)]:
+            self._evict(agent_id, "ttl")
+
+        # OrderedDict keeps the least recently used agents first
+        waiting = [agent_id for agent_id, agent in self._agents.items() if self._is_waiting(agent)]
+        for agent_id in waiting[: max(len(waiting) - config.max_waiting_agents, 0)]:
+            self._evict(agent_id, "limit")
+
+        finished = [agent_id for agent_id, agent in self._agents.items() if self._is_finished(agent)]
+        excess = max(len(finished) - config.max_finished_agents, 0)
+        for agent_id in finished[:excess]:
+            self._evict(agent_id, "lru")
+        finished = finished[excess:]
+
+        if config.max_memory_mb is not None:
+            budget = int(config.max_memory_mb * 1024 * 1024)
+            total = sum(self._finished_size(agent_id) for agent_id in finished)
+            for agent_id in finished:
+                if total <= budget:
+                    break
+                total -= self._finished_size(agent_id)
+                self._evict(agent_id, "memory")
+
+        return sum(self.evictions.values()) - evicted_before
+
+    def stats(self) -> dict[str, Any]:
+        """Storage occupancy, memory accounting and eviction counters."""
+        agents = list(self._agents.items())
+        finished = [agent_id for agent_id, agent in agents if self._is_finished(agent)]
+        waiting = sum(1 for _, agent in agents if self._is_waiting(agent))
+        return {
+            "total": len(agents),
+            "running": len(agents) - len(finished) - waiting,
+            "waiting_for_clarification": waiting,
+            "finished": len(finished),
+            "finished_memory_bytes": sum(self._finished_size(agent_id) for agent_id in finished),
+            "evictions": dict(self.evictions),
+        }
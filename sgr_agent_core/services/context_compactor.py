@@ -0,0 +1,167 @@
+"""Compaction of old tool results in agent prompts."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from openai import AsyncOpenAI
+
+from sgr_agent_core.services.token_counter import MessageTokenCounter, Tokenizer
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import AgentConfig
+    from sgr_agent_core.models import AgentContext
+
+logger = logging.getLogger(__name__)
+
+_KEY_LINE_RE = re.compile(r"https?://|\[\d+\]")
+
+SUMMARY_HEADER = "[Summary of an earlier tool result]"
+
+SUMMARY_PROMPT = (
+    "Summarize the tool result below for an agent that will continue the task. "
+    "Keep facts, numbers, names, source numbers like [1] and URLs. Answer with the summary only."
+)
+
+
+def extractive_summary(text: str, max_tokens: int, tokenizer: Tokenizer) -> str:
+    """Deterministic summary made of whole lines of text within max_tokens.
+
+    The first line (usually a title) goes first, then lines with URLs or
+    source numbers, then the rest in order. Selected lines keep their
+    original order.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    ranked = sorted(
+        range(len(lines)),
+        key=lambda i: (0 if i == 0 else 1 if _KEY_LINE_RE.search(lines[i]) else 2, i),
+    )
+    selected: dict[int, str] = {}
+    used = 0
+    for i in ranked:
+        tokens = tokenizer.count(lines[i]) + 1
+        if used + tokens <= max_tokens:
+            selected[i] = lines[i]
+            used += tokens
+        elif not selected:
+            selected[i] = tokenizer.truncate(lines[i], max_tokens)
+            break
+    return "\n".join(selected[i] for i in sorted(selected))
+
+
+class ContextCompactor:
+    """Replaces old tool results in the prompt with compact summaries.
+
+    Compaction starts once the prompt exceeds
+    execution.compaction_threshold_tokens. The last
+    execution.compaction_keep_last conversation messages are always sent
+    verbatim. Summaries are cached by message content, so every tool
+    result is summarized once and the compacted prompt stays stable
+    between steps. The agent conversation itself is never modified.
+
+    Messages leaving the verbatim window are compacted once into an
+    append-only list, so a step costs O(new messages) as long as the
+    conversation is only appended to.
+    """
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        token_counter: MessageTokenCounter,
+        openai_client: AsyncOpenAI | None = None,
+    ):
+        self._execution = config.execution
+        self._model = config.execution.compaction_model or config.llm.model
+        self._token_counter = token_counter
+        self._openai_client = openai_client
+        self._summaries: dict[str, str] = {}
+        # Compaction state of one conversation, reset when it is replaced or rewritten
+        self._source: tuple[list[dict], int] | None = None
+        self._compacted: list[dict] = []
+        self._counted = 0
+        self._tokens = 0
+        self._saved = 0
+
+    async def _summarize(self, text: str, context: AgentContext) -> str:
+        max_tokens = self._execution.compaction_summary_tokens
+        if self._execution.compaction_summarizer == "llm" and self._openai_client is not None:
+            try:
+                completion = await self._openai_client.chat.completions.create(
+                    model=self._model,
+                    messages=[{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": text}],
+                    max_tokens=max_tokens,
+                    temperature=0,
+                )
+                context.record_llm_call(completion.usage)
+                if summary := (completion.choices[0].message.content or "").strip():
+                    return summary
+            except Exception as e:
+                logger.warning(f"⚠️ LLM summary failed, using extractive summary: {e}")
+        return extractive_summary(text, max_tokens, self._token_counter.tokenizer)
+
+    async def _summary(self, key: str, text: str, context: AgentContext) -> str:
+        if (summary := self._summaries.get(key)) is None:
+            summary = f"{SUMMARY_HEADER}\n{await self._summarize(text, context)}"
+            self._summaries[key] = summary
+            context.compaction_summaries += 1
+        return summary
+
+    def _sync(self, conversation: list[dict]) -> None:
+        """Start over if the conversation was replaced or changed other than
+        by appending, then count the tokens of new messages."""
+        # Plain lists can't report rewrites, they are compacted from scratch every time
+        revision = getattr(conversation, "revision", None)
+        source = self._source
+        if revision is None or source is None or source[0] is not conversation or source[1] != revision:
+            # A new list, so consumers of the previous one see the change
+            self._compacted = []
+            self._counted = self._tokens = self._saved = 0
+            self._source = (conversation, revision)
+        self._tokens += self._token_counter.count_messages(conversation[self._counted :])
+        self._counted = len(conversation)
+
+    async def compact(self, prefix: list[dict], conversation: list[dict], context: AgentContext) -> list[dict] | None:
+        """Compacted messages of the conversation if the prompt is over the
+        threshold, or None.
+
+        The returned list holds the conversation messages before the last
+        compaction_keep_last ones, with old tool results replaced by their
+        summaries; the rest of the conversation follows it verbatim. It is
+        only appended to until the conversation is rewritten.
+        """
+        self._sync(conversation)
+        if self._token_counter.count_messages(prefix) + self._tokens <= self._execution.compaction_threshold_tokens:
+            return None
+
+        keep_from = max(len(conversation) - self._execution.compaction_keep_last, 0)
+        first = len(self._compacted)
+        candidates = {}
+        for i in range(first, keep_from):
+            message = conversation[i]
+            content = message.get("content")
+            if (
+                message.get("role") == "tool"
+                and isinstance(content, str)
+                and self._token_counter.count_text(content) > self._execution.compaction_summary_tokens
+            ):
+                candidates[i] = (hashlib.sha256(content.encode("utf-8")).hexdigest(), content)
+
+        texts = dict(candidates.values())
+        summaries = dict(
+            zip(texts, await asyncio.gather(*(self._summary(key, text, context) for key, text in texts.items())))
+        )
+        for i in range(first, keep_from):
+            message = conversation[i]
+            if i in candidates:
+                compacted = {**message, "content": summaries[candidates[i][0]]}
+                self._saved += self._token_counter.count_message(message) - self._token_counter.count_message(compacted)
+                message = compacted
+            self._compacted.append(message)
+        context.compaction_saved_tokens = self._saved
+        if candidates:
+            logger.info(f"🗜️ Compacted {len(candidates)} tool results, saved ~{self._saved} tokens in total")
+        return self._compacted
@@ -0,0 +1,109 @@
+"""Speculative background extraction of search results."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import SearchConfig
+    from sgr_agent_core.models import AgentContext, SourceData
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractPrefetcher:
+    """Per-agent prefetcher of page content for top search results.
+
+    Search tools call prefetch() as soon as results arrive, so extraction
+    runs while the LLM decides the next step. ExtractPageContentTool takes
+    the results with take(), awaiting extractions that are still running.
+    Prefetches that were never taken are counted as wasted when the agent
+    finishes and calls cancel().
+    """
+
+    def __init__(self, context: AgentContext, search_config: SearchConfig):
+        self._context = context
+        self._service = TavilySearchService(search_config)
+        self._top_k = search_config.prefetch_top_k
+        self._semaphore = asyncio.Semaphore(search_config.prefetch_max_concurrent)
+        self._pending: dict[str, asyncio.Task[SourceData | None]] = {}
+        self._requested: set[str] = set()
+
+    @classmethod
+    def get(cls, context: AgentContext, search_config: SearchConfig | None) -> ExtractPrefetcher | None:
+        """Prefetcher of the agent context, created on first use, or None if
+        prefetch is disabled."""
+        if search_config is None or not search_config.prefetch_enabled:
+            return None
+        if context.prefetcher is None:
+            context.prefetcher = cls(context, search_config)
+        return context.prefetcher
+
+    async def _extract(self, url: str) -> SourceData | None:
+        async with self._semaphore:
+            sources = await self._service.extract([url])
+        return sources[0] if sources else None
+
+    def prefetch(self, urls: list[str]) -> None:
+        """Start background extraction of the first top_k URLs not requested
+        before."""
+        urls = [url for url in dict.fromkeys(urls) if url not in self._requested][: self._top_k]
+        for url in urls:
+            self._requested.add(url)
+            self._pending[url] = asyncio.create_task(self._extract(url))
+        if urls:
+            self._context.prefetch_started += len(urls)
+            logger.info(f"📄 Prefetching {len(urls)} URLs")
+
+    @staticmethod
+    async def _result(url: str, task: asyncio.Task[SourceData | None]) -> SourceData | None:
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():  # The waiting call was cancelled, not the prefetch
+                raise
+        except Exception as e:
+            logger.warning(f"⚠️ Prefetch of {url} failed: {e}")
+        return None
+
+    async def peek(self, urls: list[str]) -> dict[str, SourceData]:
+        """Like take(), but leaves the prefetches to be taken later and
+        counts nothing.
+
+        Used by speculative calls, whose results may be discarded.
+        """
+        peeked = {}
+        for url in urls:
+            if (task := self._pending.get(url)) is not None and (source := await self._result(url, task)) is not None:
+                peeked[url] = source
+        return peeked
+
+    async def take(self, urls: list[str]) -> dict[str, SourceData]:
+        """Prefetched sources for the given URLs, waiting for running
+        extractions.
+
+        URLs that were not prefetched or failed are not in the result.
+        """
+        taken = {}
+        for url in urls:
+            if (task := self._pending.pop(url, None)) is None:
+                continue
+            source = await self._result(url, task)
+            if source is None:
+                self._context.prefetch_wasted += 1
+                continue
+            taken[url] = source
+            self._context.prefetch_used += 1
+        return taken
+
+    def cancel(self) -> None:
+        """Cancel running extractions and count untaken prefetches as
+        wasted."""
+        pending, self._pending = self._pending, {}
+        for task in pending.values():
+            task.cancel()
+        self._context.prefetch_wasted += len(pending)
@@ -0,0 +1,125 @@
+"""Background writer of agent JSONL logs."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import gzip
+import importlib.util
+import json
+import logging
+import queue
+import threading
+from typing import IO, Any, ClassVar, Literal
+
+logger = logging.getLogger(__name__)
+
+LogCompression = Literal["none", "gzip", "zstd"]
+
+LOG_EXTENSIONS: dict[str, str] = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+_STOP = object()
+
+
+def resolve_compression(compression: LogCompression) -> LogCompression:
+    """Compression usable here, falling back to gzip if 'zstandard' is not
+    installed."""
+    if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        logger.warning("zstandard is not installed, agent logs are compressed with gzip")
+        return "gzip"
+    return compression
+
+
+class LogWriter:
+    """Appends JSON records to log files from a dedicated thread.
+
+    write() only puts the record into a bounded queue, so the event loop
+    never waits for serialization or disk I/O unless the queue is full.
+    Files stay open between records and are flushed whenever the queue
+    runs empty. The shared writer is flushed and closed on shutdown() or
+    at interpreter exit.
+    """
+
+    max_queue_size: ClassVar[int] = 10_000
+    _instance: ClassVar[LogWriter | None] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, max_queue_size: int | None = None):
+        self._queue: queue.Queue = queue.Queue(max_queue_size or self.max_queue_size)
+        self._files: dict[str, IO[str]] = {}
+        self._thread = threading.Thread(target=self._run, name="sgr-log-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> LogWriter:
+        """Writer shared by all agents, started on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Write pending records and close the shared writer."""
+        with cls._instance_lock:
+            writer, cls._instance = cls._instance, None
+        if writer is not None:
+            atexit.unregister(writer.close)
+            await asyncio.to_thread(writer.close)
+
+    def write(self, path: str, record: dict[str, Any], compression: LogCompression = "none") -> None:
+        """Queue a record to be appended to path as one JSON line."""
+        self._queue.put((path, record, compression))
+
+    def close_file(self, path: str) -> None:
+        """Queue closing of path after the records queued before."""
+        self._queue.put((path, None, None))
+
+    def flush(self) -> None:
+        """Block until all queued records are written."""
+        self._queue.join()
+
+    async def aflush(self) -> None:
+        await asyncio.to_thread(self.flush)
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    @staticmethod
+    def _open(path: str, compression: LogCompression) -> IO[str]:
+        if compression == "gzip":
+            return gzip.open(path, "at", encoding="utf-8")
+        if compression == "zstd":
+            import zstandard
+
+            return zstandard.open(path, "at", encoding="utf-8")
+        return open(path, "a", encoding="utf-8")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    for file in self._files.values():
+                        file.close()
+                    self._files.clear()
+                    return
+                path, record, compression = item
+                if record is None:
+                    if (file := self._files.pop(path, None)) is not None:
+                        file.close()
+                else:
+                    if (file := self._files.get(path)) is None:
+                        file = self._files[path] = self._open(path, compression)
+                    file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                if self._queue.empty():
+                    for file in self._files.values():
+                        file.flush()
+            except Exception as e:
+                logger.error(f"Failed to write agent log: {e}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,140 @@
+"""Content-addressed on-disk cache for extracted page content."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class PageContentCache:
+    """URL-keyed cache of extracted pages.
+
+    Page content is stored once per content hash as a zlib-compressed file,
+    so identical pages behind different URLs are deduplicated. A SQLite
+    index maps URLs to content hashes with an expiration time. Callers keep
+    only the hash and load content when they need it, so content files no
+    URL refers to are kept for ``grace`` seconds after their last write or
+    load for agents still holding the hash.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, directory: str, ttl: float, grace: float = 86400):
+        self.ttl = ttl
+        self.grace = grace
+        self._directory = directory
+        self._objects_dir = os.path.join(directory, "objects")
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, content_hash TEXT NOT NULL, char_count INTEGER, expires_at REAL)"
+            )
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self._objects_dir, content_hash[:2], f"{content_hash}.zz")
+
+    def _lookup(self, url: str) -> tuple[str, int] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, char_count FROM pages WHERE url = ? AND expires_at >= ?", (url, time.time())
+            ).fetchone()
+        if row is None or not os.path.exists(self._object_path(row[0])):
+            return None
+        return row[0], row[1]
+
+    def _touch(self, path: str) -> None:
+        """Extend the grace period of a content file."""
+        now = time.time()
+        os.utime(path, (now, now))
+
+    def _put(self, url: str, content: str) -> tuple[str, int]:
+        content_hash = self.content_hash(content)
+        path = self._object_path(content_hash)
+        data = zlib.compress(content.encode("utf-8"))
+        # Held from the existence check to the row insert so prune can't remove the object in between
+        with self._lock, self._conn:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write to a temporary file first so readers never see partial objects
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self._touch(path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, content_hash, char_count, expires_at) VALUES (?, ?, ?, ?)",
+                (url, content_hash, len(content), time.time() + self.ttl),
+            )
+            self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune()
+        return content_hash, len(content)
+
+    def _load(self, content_hash: str) -> str | None:
+        path = self._object_path(content_hash)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            self._touch(path)
+        except FileNotFoundError:
+            return None
+        return zlib.decompress(data).decode("utf-8")
+
+    def _prune(self) -> int:
+        """Drop expired URLs and content files no URL refers to and nobody
+        used within the grace period."""
+        now = time.time()
+        removed = 0
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE expires_at < ?", (now,))
+            referenced = {row[0] for row in self._conn.execute("SELECT DISTINCT content_hash FROM pages")}
+            for root, _, files in os.walk(self._objects_dir):
+                for name in files:
+                    if not name.endswith(".zz") or name[: -len(".zz")] in referenced:
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        if os.path.getmtime(path) >= now - self.grace:
+                            continue
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    removed += 1
+        if removed:
+            logger.info(f"Page cache pruned {removed} content files")
+        return removed
+
+    async def lookup(self, url: str) -> tuple[str, int] | None:
+        """Content hash and length of a fresh cached page or None."""
+        return await asyncio.to_thread(self._lookup, url)
+
+    async def put(self, url: str, content: str) -> tuple[str, int]:
+        """Store page content and return its content hash and length."""
+        return await asyncio.to_thread(self._put, url, content)
+
+    async def load(self, content_hash: str) -> str | None:
+        """Load content by hash or None if it was pruned."""
+        return await asyncio.to_thread(self._load, content_hash)
+
+    async def prune(self) -> int:
+        return await asyncio.to_thread(self._prune)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        logger.info(f"Page cache closed: {self._directory}")
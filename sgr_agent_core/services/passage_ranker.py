@@ -0,0 +1,151 @@
+"""Local BM25 ranking of page passages."""
+
+import hashlib
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import ClassVar, NamedTuple
+
+_TOKEN_RE = re.compile(r"\w+")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class Passage(NamedTuple):
+    """Passage of a page with its character offsets in the page content."""
+
+    start: int
+    end: int
+    text: str
+
+
+def split_passages(content: str, passage_size: int) -> list[Passage]:
+    """Split content into passages of about passage_size characters.
+
+    Paragraphs are split at whitespace if they are too long, and
+    consecutive short paragraphs are merged.
+    """
+    spans = []
+    position = 0
+    for match in [*_PARAGRAPH_BREAK_RE.finditer(content), None]:
+        end = match.start() if match else len(content)
+        start = position
+        while start < end and content[start].isspace():
+            start += 1
+        while end > start:
+            if end - start <= passage_size:
+                spans.append((start, end))
+                break
+            cut = content.rfind(" ", start + passage_size // 2, start + passage_size)
+            cut = cut if cut != -1 else start + passage_size
+            spans.append((start, cut))
+            start = cut
+            while start < end and content[start].isspace():
+                start += 1
+        position = match.end() if match else len(content)
+
+    merged: list[tuple[int, int]] = []
+    for start, end in spans:
+        if merged and end - merged[-1][0] <= passage_size:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return [Passage(start, end, content[start:end].rstrip()) for start, end in merged]
+
+
+class PassageIndex:
+    """BM25 index over passages of one page."""
+
+    k1: ClassVar[float] = 1.5
+    b: ClassVar[float] = 0.75
+
+    def __init__(self, content: str, passage_size: int):
+        self.content_length = len(content)
+        self.passages = split_passages(content, passage_size)
+        self._term_freqs = [Counter(tokenize(passage.text)) for passage in self.passages]
+        self._lengths = [sum(term_freqs.values()) for term_freqs in self._term_freqs]
+        self._avg_length = max(sum(self._lengths) / max(len(self._lengths), 1), 1)
+        doc_freqs = Counter(term for term_freqs in self._term_freqs for term in term_freqs)
+        n = len(self.passages)
+        self._idf = {term: math.log(1 + (n - freq + 0.5) / (freq + 0.5)) for term, freq in doc_freqs.items()}
+
+    def scores(self, query: str) -> list[float]:
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        scores = []
+        for term_freqs, length in zip(self._term_freqs, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            scores.append(
+                sum(
+                    self._idf[term] * term_freqs[term] * (self.k1 + 1) / (term_freqs[term] + norm)
+                    for term in terms
+                    if term in term_freqs
+                )
+            )
+        return scores
+
+    def select(self, query: str, char_budget: int, passage_overhead: int = 0) -> list[Passage]:
+        """Best scoring passages fitting into char_budget, in page order.
+
+        Each selected passage also takes passage_overhead characters of
+        the budget, e.g. for the header and separator it is rendered
+        with. Ties (including no matching terms at all) prefer earlier
+        passages.
+        """
+        ranked = sorted(zip(self.scores(query), self.passages), key=lambda item: (-item[0], item[1].start))
+        selected = []
+        used = 0
+        for _, passage in ranked:
+            if used + len(passage.text) + passage_overhead <= char_budget:
+                selected.append(passage)
+                used += len(passage.text) + passage_overhead
+        if not selected and ranked:
+            # Even the best passage is bigger than the budget
+            best = ranked[0][1]
+            size = max(char_budget - passage_overhead, 0)
+            selected.append(Passage(best.start, best.start + size, best.text[:size]))
+        return sorted(selected, key=lambda passage: passage.start)
+
+
+class PassageRanker:
+    """Selects passages of pages relevant to a query.
+
+    Passage indexes are built once per page content and cached by content
+    hash, so repeated extraction of the same page reuses them.
+    """
+
+    cache_size: ClassVar[int] = 128
+    _cache: ClassVar[OrderedDict[tuple[str, int], PassageIndex]] = OrderedDict()
+
+    @classmethod
+    def index(cls, content: str, content_hash: str | None = None, passage_size: int = 600) -> PassageIndex:
+        content_hash = content_hash or hashlib.sha256(content.encode("utf-8")).hexdigest()
+        key = (content_hash, passage_size)
+        if (index := cls._cache.get(key)) is not None:
+            cls._cache.move_to_end(key)
+            return index
+        index = PassageIndex(content, passage_size)
+        cls._cache[key] = index
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.popitem(last=False)
+        return index
+
+    @classmethod
+    def select(
+        cls,
+        content: str,
+        query: str,
+        char_budget: int,
+        content_hash: str | None = None,
+        passage_size: int = 600,
+        passage_overhead: int = 0,
+    ) -> list[Passage]:
+        """Passages of content most relevant to query within char_budget,
+        see PassageIndex.select()."""
+        return cls.index(content, content_hash, passage_size).select(query, char_budget, passage_overhead)
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        cls._cache.clear()
@@ -27,11 +27,11 @@ class PromptLoader:
         cls,
         messages: list[ChatCompletionMessageParam],
         prompts_config: "PromptsConfig",
-        current_datetime=datetime.now(),
+        current_datetime: datetime | None = None,
     ) -> str:
         template = prompts_config.initial_user_request
         try:
-            return template.format(current_date=current_datetime.strftime("%Y-%m-%d %H:%M:%S"))
+            return template.format(current_date=(current_datetime or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"))
         except KeyError as e:
             raise KeyError(f"Missing placeholder in system prompt template: {e}") from e
 
@@ -40,10 +40,10 @@ class PromptLoader:
         cls,
         messages: list[ChatCompletionMessageParam],
         prompts_config: "PromptsConfig",
-        current_datetime=datetime.now(),
+        current_datetime: datetime | None = None,
     ) -> str:
         template = prompts_config.clarification_response
         try:
-            return template.format(current_date=current_datetime.strftime("%Y-%m-%d %H:%M:%S"))
+            return template.format(current_date=(current_datetime or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"))
         except KeyError as e:
             raise KeyError(f"Missing placeholder in system prompt template: {e}") from e
@@ -0,0 +1,117 @@
+"""TTL cache for web search results."""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from pydantic import TypeAdapter
+
+from sgr_agent_core.models import SourceData
+
+logger = logging.getLogger(__name__)
+
+_sources_adapter = TypeAdapter(list[SourceData])
+
+
+class SearchCache:
+    """Two-tier search results cache: in-memory LRU in front of an optional
+    SQLite file.
+
+    Entries are stored serialized, so every hit returns fresh SourceData
+    objects that callers are free to renumber.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, path: str | None = None, max_disk_entries: int = 100_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._writes = 0
+        if path:
+            if directory := os.path.dirname(path):
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache (key TEXT PRIMARY KEY, expires_at REAL, data BLOB)"
+                )
+
+    @staticmethod
+    def make_key(query: str, max_results: int, include_raw_content: bool) -> str:
+        """Cache key from the normalized query and search parameters."""
+        normalized = re.sub(r"\s+", " ", query).strip().lower()
+        return f"{normalized}|{max_results}|{int(include_raw_content)}"
+
+    def _remember(self, key: str, expires_at: float, data: bytes) -> None:
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> tuple[float, bytes] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at, data FROM search_cache WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _disk_set(self, key: str, expires_at: float, data: bytes) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, expires_at, data) VALUES (?, ?, ?)", (key, expires_at, data)
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (time.time(),))
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key NOT IN "
+                    "(SELECT key FROM search_cache ORDER BY expires_at DESC LIMIT ?)",
+                    (self.max_disk_entries,),
+                )
+
+    async def get(self, key: str) -> list[SourceData] | None:
+        """Cached sources or None if the key is missing or expired."""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        elif self._conn is not None:
+            entry = await asyncio.to_thread(self._disk_get, key)
+            if entry is not None:
+                self._remember(key, *entry)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < now:
+            self._memory.pop(key, None)
+            return None
+        return _sources_adapter.validate_json(data)
+
+    async def set(self, key: str, sources: list[SourceData]) -> None:
+        """Store sources for the configured TTL."""
+        expires_at = time.time() + self.ttl
+        data = _sources_adapter.dump_json(sources)
+        self._remember(key, expires_at, data)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_set, key, expires_at, data)
+
+    def clear(self) -> None:
+        """Drop all cached entries from both tiers."""
+        self._memory.clear()
+        if self._conn is not None:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+            logger.info(f"Search cache closed: {self._path}")
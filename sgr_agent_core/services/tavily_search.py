@@ -1,19 +1,118 @@
 import logging
+import os
+from typing import ClassVar
 
+import httpx
 from tavily import AsyncTavilyClient
 
-from sgr_agent_core.agent_definition import SearchConfig
+from sgr_agent_core.agent_definition import HTTPClientConfig, SearchConfig
 from sgr_agent_core.models import SourceData
+from sgr_agent_core.services.page_cache import PageContentCache
+from sgr_agent_core.services.search_cache import SearchCache
 
 logger = logging.getLogger(__name__)
 
 
 class TavilySearchService:
-    def __init__(self, search_config: SearchConfig):
-        self._client = AsyncTavilyClient(
-            api_key=search_config.tavily_api_key, api_base_url=search_config.tavily_api_base_url
-        )
+    """Tavily search and extract API wrapper.
+
+    Services are cheap to create: all of them share one pooled Tavily
+    client per (api key, base URL), so tool calls reuse warm connections.
+    With search_config.cache_enabled, search results are shared through a
+    process-wide SearchCache per cache file. With extract_cache_enabled,
+    extracted pages go to a PageContentCache and sources carry only a
+    content hash (see load_content). Call close_clients() on shutdown.
+    """
+
+    _clients: ClassVar[dict[tuple[str | None, str], AsyncTavilyClient]] = {}
+    _http_clients: ClassVar[list[httpx.AsyncClient]] = []
+    _caches: ClassVar[dict[str | None, SearchCache]] = {}
+    _page_caches: ClassVar[dict[str, PageContentCache]] = {}
+
+    def __init__(self, search_config: SearchConfig, http_config: HTTPClientConfig | None = None):
+        self._http_config = http_config or self._default_http_config()
+        self._client = self._get_client(search_config, self._http_config)
+        self._cache = self._get_cache(search_config) if search_config.cache_enabled else None
+        self._page_cache = self._get_page_cache(search_config) if search_config.extract_cache_enabled else None
         self._config = search_config
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def _default_http_config() -> HTTPClientConfig:
+        from sgr_agent_core.agent_config import GlobalConfig
+
+        return GlobalConfig().search_client
+
+    @staticmethod
+    def _proxy_mounts(limits: httpx.Limits) -> dict[str, httpx.AsyncHTTPTransport]:
+        """Transports for the TAVILY_HTTP_PROXY / TAVILY_HTTPS_PROXY
+        variables, which the Tavily SDK applies only to clients it creates
+        itself."""
+        proxies = {"http://": os.getenv("TAVILY_HTTP_PROXY"), "https://": os.getenv("TAVILY_HTTPS_PROXY")}
+        return {
+            scheme: httpx.AsyncHTTPTransport(proxy=proxy, limits=limits) for scheme, proxy in proxies.items() if proxy
+        }
+
+    @classmethod
+    def _get_client(cls, search_config: SearchConfig, http_config: HTTPClientConfig) -> AsyncTavilyClient:
+        key = (search_config.tavily_api_key, search_config.tavily_api_base_url)
+        if (client := cls._clients.get(key)) is None:
+            limits = httpx.Limits(
+                max_connections=http_config.max_connections,
+                max_keepalive_connections=http_config.max_keepalive_connections,
+                keepalive_expiry=http_config.keepalive_expiry,
+            )
+            http_client = httpx.AsyncClient(
+                base_url=search_config.tavily_api_base_url,
+                limits=limits,
+                mounts=cls._proxy_mounts(limits),
+                timeout=httpx.Timeout(http_config.timeout, connect=http_config.connect_timeout),
+            )
+            cls._http_clients.append(http_client)
+            client = cls._clients[key] = AsyncTavilyClient(
+                api_key=search_config.tavily_api_key,
+                api_base_url=search_config.tavily_api_base_url,
+                client=http_client,
+            )
+            logger.info(f"Created Tavily client for {search_config.tavily_api_base_url}")
+        return client
+
+    @classmethod
+    def _get_cache(cls, search_config: SearchConfig) -> SearchCache:
+        """Shared cache for the configured file. Limits are taken from the
+        first config that opens it."""
+        if (cache := cls._caches.get(search_config.cache_path)) is None:
+            cache = cls._caches[search_config.cache_path] = SearchCache(
+                ttl=search_config.cache_ttl,
+                max_entries=search_config.cache_max_entries,
+                path=search_config.cache_path,
+                max_disk_entries=search_config.cache_max_disk_entries,
+            )
+        return cache
+
+    @classmethod
+    def _get_page_cache(cls, search_config: SearchConfig) -> PageContentCache:
+        if (cache := cls._page_caches.get(search_config.extract_cache_dir)) is None:
+            cache = cls._page_caches[search_config.extract_cache_dir] = PageContentCache(
+                search_config.extract_cache_dir,
+                ttl=search_config.extract_cache_ttl,
+                grace=search_config.extract_cache_grace,
+            )
+        return cache
+
+    @classmethod
+    async def close_clients(cls) -> None:
+        """Close shared Tavily clients, their connection pools and search
+        caches."""
+        # Tavily does not close externally provided httpx clients
+        http_clients, cls._http_clients, cls._clients = cls._http_clients, [], {}
+        for http_client in http_clients:
+            await http_client.aclose()
+        caches, cls._caches = cls._caches, {}
+        page_caches, cls._page_caches = cls._page_caches, {}
+        for cache in [*caches.values(), *page_caches.values()]:
+            cache.close()
 
     @staticmethod
     def rearrange_sources(sources: list[SourceData], starting_number=1) -> list[SourceData]:
@@ -39,6 +138,14 @@ class TavilySearchService:
             Tuple with tavily answer and list of SourceData
         """
         max_results = max_results or self._config.max_results
+        cache_key = SearchCache.make_key(query, max_results, include_raw_content)
+        if self._cache is not None:
+            if (sources := await self._cache.get(cache_key)) is not None:
+                self.cache_hits += 1
+                logger.info(f"🔍 Tavily search (cached): '{query}' (max_results={max_results})")
+                return sources
+            self.cache_misses += 1
+
         logger.info(f"🔍 Tavily search: '{query}' (max_results={max_results})")
 
         # Execute search through Tavily
@@ -46,10 +153,13 @@ class TavilySearchService:
             query=query,
             max_results=max_results,
             include_raw_content=include_raw_content,
+            timeout=self._http_config.timeout,
         )
 
         # Convert results to SourceData
         sources = self._convert_to_source_data(response)
+        if self._cache is not None:
+            await self._cache.set(cache_key, sources)
         return sources
 
     async def extract(self, urls: list[str]) -> list[SourceData]:
@@ -61,23 +171,30 @@ class TavilySearchService:
         Returns:
             List of SourceData with extracted content
         """
-        logger.info(f"📄 Tavily extract: {len(urls)} URLs")
-
-        response = await self._client.extract(urls=urls)
+        cached: dict[str, tuple[str, int]] = {}
+        if self._page_cache is not None:
+            for url in urls:
+                if (entry := await self._page_cache.lookup(url)) is not None:
+                    cached[url] = entry
+        urls_to_fetch = [url for url in urls if url not in cached]
+        logger.info(f"📄 Tavily extract: {len(urls_to_fetch)} URLs ({len(cached)} cached)")
+
+        response = {}
+        if urls_to_fetch:
+            response = await self._client.extract(urls=urls_to_fetch, timeout=self._http_config.timeout)
 
         sources = []
-        for i, result in enumerate(response.get("results", [])):
+        for url, (content_hash, char_count) in cached.items():
+            sources.append(self._extracted_source(len(sources), url, char_count=char_count, content_hash=content_hash))
+        for result in response.get("results", []):
             if not result.get("url"):
                 continue
-
-            source = SourceData(
-                number=i,
-                title=result.get("url", "").split("/")[-1] or "Extracted Content",
-                url=result.get("url", ""),
-                snippet="",
-                full_content=result.get("raw_content", ""),
-                char_count=len(result.get("raw_content", "")),
-            )
+            content = result.get("raw_content", "")
+            if self._page_cache is not None:
+                content_hash, char_count = await self._page_cache.put(result["url"], content)
+                source = self._extracted_source(len(sources), result["url"], char_count, content_hash=content_hash)
+            else:
+                source = self._extracted_source(len(sources), result["url"], len(content), full_content=content)
             sources.append(source)
 
         failed_urls = response.get("failed_results", [])
@@ -86,6 +203,30 @@ class TavilySearchService:
 
         return sources
 
+    @staticmethod
+    def _extracted_source(
+        number: int, url: str, char_count: int, full_content: str = "", content_hash: str | None = None
+    ) -> SourceData:
+        return SourceData(
+            number=number,
+            title=url.split("/")[-1] or "Extracted Content",
+            url=url,
+            snippet="",
+            full_content=full_content,
+            char_count=char_count,
+            content_hash=content_hash,
+        )
+
+    async def load_content(self, source: SourceData) -> str:
+        """Full content of the source, loaded from the page cache if the
+        source holds only a content hash."""
+        if source.full_content or not source.content_hash:
+            return source.full_content
+        cache = self._page_cache or self._page_caches.get(self._config.extract_cache_dir)
+        if cache is None:
+            return ""
+        return await cache.load(source.content_hash) or ""
+
     def _convert_to_source_data(self, response: dict) -> list[SourceData]:
         """Convert Tavily response to SourceData list."""
         sources = []
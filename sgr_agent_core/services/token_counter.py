@@ -0,0 +1,171 @@
+"""Token counting for context budgets."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+import math
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, ClassVar, Literal
+
+logger = logging.getLogger(__name__)
+
+
+class Tokenizer:
+    """Counts and truncates text in model tokens.
+
+    Subclasses implement spans(); count() and truncate() are derived
+    from it and may be overridden with faster versions.
+    """
+
+    def spans(self, text: str) -> list[int]:
+        """End offsets in text of every token."""
+        raise NotImplementedError("spans must be implemented by subclass")
+
+    def count(self, text: str) -> int:
+        return len(self.spans(text))
+
+    def truncate(self, text: str, max_tokens: int, keep: Literal["head", "tail"] = "head") -> str:
+        """Text cut to at most max_tokens tokens, keeping its head or
+        tail."""
+        ends = self.spans(text)
+        if len(ends) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        if keep == "head":
+            return text[: ends[max_tokens - 1]]
+        return text[ends[len(ends) - max_tokens - 1] :]
+
+
+class EstimateTokenizer(Tokenizer):
+    """Offline estimator calibrated on BPE vocabularies of OpenAI-compatible
+    models.
+
+    Latin words up to 6 characters are one token and longer ones one per
+    6 characters, other scripts (e.g. Cyrillic) take one token per 3
+    characters, numbers one per 3 digits and punctuation one per
+    character. Whitespace is merged into the following token. Errs on the
+    side of overcounting so packed contexts don't overflow.
+    """
+
+    _TOKEN_RE: ClassVar[re.Pattern] = re.compile(r"[A-Za-z]+|\d+|[^\W\d_A-Za-z]+|[^\w\s]|_")
+
+    @staticmethod
+    def _cost(token: str) -> int:
+        if token.isascii() and token.isalpha():
+            return math.ceil(len(token) / 6)
+        if token.isdigit() or token.isalpha():
+            return math.ceil(len(token) / 3)
+        return 1
+
+    def count(self, text: str) -> int:
+        return sum(self._cost(match.group()) for match in self._TOKEN_RE.finditer(text))
+
+    def spans(self, text: str) -> list[int]:
+        ends = []
+        for match in self._TOKEN_RE.finditer(text):
+            cost = self._cost(match.group())
+            step = (match.end() - match.start()) / cost
+            ends.extend(round(match.start() + step * (i + 1)) for i in range(cost))
+        return ends
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact counts with a tiktoken encoding (requires the 'tiktoken'
+    package)."""
+
+    def __init__(self, encoding: str = "o200k_base"):
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def spans(self, text: str) -> list[int]:
+        tokens = self._encoding.encode(text, disallowed_special=())
+        _, offsets = self._encoding.decode_with_offsets(tokens)
+        return offsets[1:] + [len(text)] if offsets else []
+
+
+@lru_cache
+def get_tokenizer(name: str = "estimate") -> Tokenizer:
+    """Tokenizer by name: "estimate" or "tiktoken:<encoding>".
+
+    Falls back to the estimator if tiktoken is not installed or its
+    encoding can't be loaded (e.g. offline without a cached encoding).
+    """
+    kind, _, encoding = name.partition(":")
+    if kind == "tiktoken":
+        if importlib.util.find_spec("tiktoken") is None:
+            logger.warning("tiktoken is not installed, token counts are estimated")
+            return EstimateTokenizer()
+        encoding = encoding or "o200k_base"
+        try:
+            return TiktokenTokenizer(encoding)
+        except Exception as e:
+            logger.warning(f"tiktoken encoding '{encoding}' is unavailable, token counts are estimated: {e}")
+            return EstimateTokenizer()
+    if kind != "estimate":
+        raise ValueError(f"Unknown tokenizer '{name}', expected 'estimate' or 'tiktoken:<encoding>'")
+    return EstimateTokenizer()
+
+
+class MessageTokenCounter:
+    """Counts tokens of chat messages, caching counts of message content.
+
+    Content strings are cached by value, so copies of a message (e.g.
+    after truncation of other messages) don't need to be tokenized again.
+    Images count as image_tokens each, whatever their size.
+    """
+
+    message_overhead: ClassVar[int] = 4
+    cache_size: ClassVar[int] = 4096
+
+    def __init__(self, tokenizer: Tokenizer, image_tokens: int = 765):
+        self.tokenizer = tokenizer
+        self.image_tokens = image_tokens
+        self._cache: OrderedDict[str, int] = OrderedDict()
+
+    def count_text(self, text: str) -> int:
+        if (count := self._cache.get(text)) is not None:
+            self._cache.move_to_end(text)
+            return count
+        count = self.tokenizer.count(text)
+        self._cache[text] = count
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return count
+
+    def count_content(self, content: Any) -> int:
+        """Tokens of message content: a string or a list of content
+        parts."""
+        if isinstance(content, str):
+            return self.count_text(content)
+        if not isinstance(content, list):
+            return 0
+        total = 0
+        for part in content:
+            if not isinstance(part, dict):
+                continue
+            if part.get("type") == "text":
+                total += self.count_text(part.get("text") or "")
+            elif part.get("type") in ("image_url", "input_image", "image"):
+                total += self.image_tokens
+        return total
+
+    def count_message(self, message: dict) -> int:
+        total = self.message_overhead + self.count_content(message.get("content"))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function") or {}
+            total += self.count_text(function.get("name") or "")
+            arguments = function.get("arguments") or ""
+            total += self.count_text(arguments if isinstance(arguments, str) else json.dumps(arguments))
+        return total
+
+    def count_messages(self, messages: list[dict]) -> int:
+        return sum(self.count_message(message) for message in messages)
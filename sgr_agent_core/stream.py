@@ -1,68 +1,440 @@
 import asyncio
 import json
 import time
+from collections import deque
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import Any, ClassVar, Literal
 
 from openai.types.chat import ChatCompletionChunk
 
+try:
+    import orjson
+except ImportError:  # optional: pip install sgr-agent-core[fastjson]
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Compact JSON with non-ASCII characters kept, using orjson if
+    installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class StreamReplayBuffer:
+    """Append-only ring buffer of SSE frames numbered with event ids.
+
+    Lets any number of subscribers follow a stream and resume it after a
+    reconnect from the id they saw last. Memory is bounded by max_bytes:
+    the oldest frames are evicted, and a subscriber falling that far
+    behind skips to the oldest frame kept. Each finish() of the stream
+    records an end marker, where subscribers that caught up stop.
+
+    Once the stream is over for good, release() trims the buffer to its
+    final frames as soon as no subscriber is reading it.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.last_id = 0
+        self.subscribers = 0
+        self._frames: deque[tuple[int, str | None, int]] = deque()
+        self._bytes = 0
+        self._appended = asyncio.Event()
+        self._keep_frames: int | None = None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of frames kept."""
+        return self._bytes
+
+    def release(self, keep_frames: int = 1) -> None:
+        """Keep only the last keep_frames frames once no subscriber reads
+        the buffer."""
+        self._keep_frames = keep_frames
+        if not self.subscribers:
+            self._trim()
+
+    def _trim(self) -> None:
+        while len(self._frames) > self._keep_frames:
+            self._bytes -= self._frames.popleft()[2]
+
+    def append(self, data: str | None, size: int = 0) -> None:
+        """Record a frame, or an end marker if data is None."""
+        self.last_id += 1
+        self._frames.append((self.last_id, data, size))
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._frames) > 1:
+            self._bytes -= self._frames.popleft()[2]
+        self._appended.set()
+        self._appended = asyncio.Event()
+
+    def _frames_after(self, event_id: int) -> list[tuple[int, str | None, int]]:
+        if not self._frames or event_id >= self.last_id:
+            return []
+        start = max(event_id - self._frames[0][0] + 1, 0)
+        return list(islice(self._frames, start, None))
+
+    async def subscribe(self, last_event_id: int | None = None):
+        """Yield SSE frames with their "id:" field after last_event_id, or
+        from the oldest frame kept, then follow new frames until an end
+        marker with nothing after it.
+
+        An id ahead of the buffer (e.g. from before a restart) replays
+        from the oldest frame as well.
+        """
+        cursor = last_event_id if last_event_id is not None and last_event_id <= self.last_id else 0
+        self.subscribers += 1
+        try:
+            while True:
+                appended = self._appended
+                for event_id, data, _ in self._frames_after(cursor):
+                    cursor = event_id
+                    if data is not None:
+                        yield f"id: {event_id}\n{data}"
+                if self._frames and self._frames[-1][:2] == (cursor, None):
+                    return
+                await appended.wait()
+        finally:
+            self.subscribers -= 1
+            if not self.subscribers and self._keep_frames is not None:
+                self._trim()
+
+
+StreamOverflow = Literal["block", "coalesce", "drop", "detach"]
+
 
 class StreamingGenerator:
-    def __init__(self):
+    """Queue of SSE frames between an agent and the client reading its
+    stream.
+
+    With max_buffered_bytes set, the queue is bounded by the bytes of
+    frames not yet read by the client. Once it is full, overflow decides
+    what happens to new frames:
+
+    - "block": frames are queued and the agent waits in drain() until the
+      client catches up
+    - "coalesce": text deltas are merged into one frame, sent once the
+      client catches up
+    - "drop": text deltas are dropped
+    - "detach": the client is detached and frames are discarded
+
+    Tool call, finish and other structural frames are never dropped or
+    merged, except when detached. A client that disconnects before the
+    end of the stream detaches it as well, so nothing is buffered for
+    nobody; the next stream() call attaches again.
+
+    Every frame queued or dropped for the client is also recorded in
+    the replay buffer, which other clients follow with subscribe()
+    without affecting the stream() client.
+    """
+
+    def __init__(
+        self,
+        max_buffered_bytes: int | None = None,
+        overflow: StreamOverflow = "block",
+        replay_max_bytes: int = 1024 * 1024,
+    ):
         self.queue = asyncio.Queue()
+        self.replay = StreamReplayBuffer(replay_max_bytes)
+        self.max_buffered_bytes = max_buffered_bytes
+        self.overflow = overflow
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.frames_dropped = 0
+        self.buffered_bytes = 0
+        self.peak_buffered_bytes = 0
+        self.detached = False
+        self._frame_sizes: deque[int] = deque()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    @property
+    def full(self) -> bool:
+        return self.max_buffered_bytes is not None and self.buffered_bytes >= self.max_buffered_bytes
 
-    def add(self, data: str):
+    def add(self, data: str, droppable: bool = False):
+        """Queue a frame; droppable frames (text deltas) may be dropped
+        when the buffer is full."""
+        size = len(data.encode())
+        self.replay.append(data, size)
+        if self.full and self.overflow == "detach":
+            self.detach()
+        if self.detached or (droppable and self.full and self.overflow == "drop"):
+            self.frames_dropped += 1
+            return
+        self.frames_sent += 1
+        self.bytes_sent += size
+        self.buffered_bytes += size
+        self.peak_buffered_bytes = max(self.peak_buffered_bytes, self.buffered_bytes)
+        self._frame_sizes.append(size)
+        if self.full:
+            self._writable.clear()
         self.queue.put_nowait(data)
 
+    async def drain(self):
+        """Wait until the client has room for more frames.
+
+        Returns at once unless overflow is "block" and the buffer is
+        full.
+        """
+        if self.overflow == "block":
+            await self._writable.wait()
+
+    def detach(self):
+        """Stop buffering for the client and discard queued frames."""
+        self.detached = True
+        while not self.queue.empty():
+            if self.queue.get_nowait() is not None:
+                self.frames_dropped += 1
+        self._frame_sizes.clear()
+        self.buffered_bytes = 0
+        self._writable.set()
+
+    def stats(self) -> dict[str, Any]:
+        """Stream metrics, as reported in the agent state."""
+        return {
+            "stream_frames": self.frames_sent,
+            "stream_bytes": self.bytes_sent,
+            "stream_buffered_bytes": self.buffered_bytes,
+            "stream_peak_buffered_bytes": self.peak_buffered_bytes,
+            "stream_dropped_frames": self.frames_dropped,
+            "stream_detached": self.detached,
+            "stream_subscribers": self.replay.subscribers,
+            "stream_last_event_id": self.replay.last_id,
+        }
+
+    def _on_writable(self):
+        """Called when the client has read the buffer below the limit."""
+        self._writable.set()
+
+    def _frame_read(self):
+        if self._frame_sizes:
+            self.buffered_bytes -= self._frame_sizes.popleft()
+        if not self._writable.is_set() and not self.full:
+            self._on_writable()
+
+    # Frames added by the last finish(), kept in the replay buffer after release_replay()
+    final_frames: ClassVar[int] = 1
+
     def finish(self):
+        self.replay.append(None)
         self.queue.put_nowait(None)  # Termination signal
 
+    def release_replay(self):
+        """Trim the replay buffer to the frames of the last finish(), for
+        streams that won't get new frames."""
+        self.replay.release(self.final_frames)
+
+    def subscribe(self, last_event_id: int | None = None):
+        """Follow the stream from the replay buffer, see
+        StreamReplayBuffer.subscribe()."""
+        return self.replay.subscribe(last_event_id)
+
     async def stream(self):
-        while True:
-            data = await self.queue.get()
-            if data is None:  # Termination signal
-                break
-            yield data
+        self.detached = False
+        finished = False
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is None:  # Termination signal
+                    finished = True
+                    break
+                self._frame_read()
+                yield data
+        finally:
+            if not finished:  # Client disconnected
+                self.detach()
 
 
 class OpenAIStreamingGenerator(StreamingGenerator):
-    def __init__(self, model="gpt-4o"):
-        super().__init__()
+    """Streams OpenAI-compatible chat.completion.chunk SSE events.
+
+    The envelope shared by all chunks of the stream (id, model,
+    fingerprint) is rendered once, text and tool call argument chunks
+    only escape their content into it.
+
+    With coalesce_interval > 0 text deltas are merged into one frame
+    until the interval passes or coalesce_max_bytes are buffered. Tool
+    call, finish and other non-text frames flush buffered text and are
+    sent immediately. With overflow="coalesce" text deltas are also
+    merged while the client buffer is full; a client that falls behind by
+    more than max(max_buffered_bytes, coalesce_max_bytes) of held text is
+    detached.
+    """
+
+    # Final chunk, [DONE] and the end marker
+    final_frames: ClassVar[int] = 3
+
+    def __init__(
+        self,
+        model="gpt-4o",
+        coalesce_interval: float = 0.0,
+        coalesce_max_bytes: int = 4096,
+        max_buffered_bytes: int | None = None,
+        overflow: StreamOverflow = "block",
+        replay_max_bytes: int = 1024 * 1024,
+    ):
+        super().__init__(max_buffered_bytes, overflow, replay_max_bytes)
         self.model = model
+        self.coalesce_interval = coalesce_interval
+        self.coalesce_max_bytes = coalesce_max_bytes
+        self.deltas_received = 0
+        self._pending: list[str] = []
+        self._pending_bytes = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
         self.fingerprint = f"fp_{hex(hash(model))[-8:]}"
         self.id = f"chatcmpl-{int(time.time())}{hash(str(time.time()))}"[:29]
         self.created = int(time.time())
         self.choice_index = 0
-
-    def add_chunk(self, chunk: ChatCompletionChunk):
-        chunk.model = self.model
-        super().add(f"data: {chunk.model_dump_json()}\n\n")
-
-    def add_chunk_from_str(self, content: str):
-        response = {
+        self._envelope = {
             "id": self.id,
             "object": "chat.completion.chunk",
             "created": self.created,
             "model": self.model,
             "system_fingerprint": self.fingerprint,
-            "choices": [
-                {
-                    "delta": {"content": content, "role": "assistant", "tool_calls": None},
-                    "index": self.choice_index,
-                    "finish_reason": None,
-                    "logprobs": None,
-                }
-            ],
-            "usage": None,
         }
-        super().add(f"data: {json.dumps(response)}\n\n")
+        envelope = dumps(self._envelope)[:-1]
+        self._content_prefix = f'data: {envelope},"choices":[{{"delta":{{"content":'
+        self._content_suffix = (
+            f',"role":"assistant","tool_calls":null}},"index":{self.choice_index},'
+            '"finish_reason":null,"logprobs":null}],"usage":null}\n\n'
+        )
+        self._arguments_prefix = f'data: {envelope},"choices":[{{"delta":{{"content":null,"tool_calls":[{{"index":'
+        self._arguments_suffix = (
+            f'}}}}]}},"index":{self.choice_index},"finish_reason":null,"logprobs":null}}],"usage":null}}\n\n'
+        )
+
+    @staticmethod
+    def _arguments_delta(chunk: ChatCompletionChunk) -> tuple[int, str] | None:
+        """Tool call index and arguments if the chunk carries nothing but an
+        arguments delta of a single tool call."""
+        if len(chunk.choices) != 1 or chunk.usage is not None or chunk.model_extra:
+            return None
+        choice = chunk.choices[0]
+        delta = choice.delta
+        if (
+            choice.finish_reason is not None
+            or choice.logprobs is not None
+            or choice.model_extra
+            or delta.content is not None
+            or delta.function_call is not None
+            or delta.refusal is not None
+            or delta.role is not None
+            or delta.model_extra
+            or not delta.tool_calls
+            or len(delta.tool_calls) != 1
+        ):
+            return None
+        tool_call = delta.tool_calls[0]
+        function = tool_call.function
+        if (
+            tool_call.id is not None
+            or tool_call.type is not None
+            or tool_call.model_extra
+            or function is None
+            or function.name is not None
+            or function.arguments is None
+            or function.model_extra
+        ):
+            return None
+        return tool_call.index, function.arguments
+
+    @staticmethod
+    def _is_text_chunk(chunk: ChatCompletionChunk) -> bool:
+        """Chunk carries nothing but a content delta of a single choice."""
+        if len(chunk.choices) != 1 or chunk.usage is not None or chunk.model_extra:
+            return False
+        choice = chunk.choices[0]
+        delta = choice.delta
+        return (
+            delta.content is not None
+            and choice.finish_reason is None
+            and choice.logprobs is None
+            and delta.tool_calls is None
+            and delta.function_call is None
+            and delta.refusal is None
+            and not delta.model_extra
+            and not choice.model_extra
+        )
+
+    def add_chunk(self, chunk: ChatCompletionChunk):
+        """Forward an upstream chunk under this stream's id and model.
+
+        Text and tool call argument chunks are spliced into the
+        pre-rendered envelope, others (tool call starts, finish, usage,
+        provider extras) are dumped.
+        """
+        if self._is_text_chunk(chunk):
+            self.add_chunk_from_str(chunk.choices[0].delta.content)
+            return
+        if not chunk.choices and chunk.usage is not None:
+            # Usage of a single LLM call, the agent total is sent with finish()
+            return
+        self.flush()
+        if (arguments_delta := self._arguments_delta(chunk)) is not None:
+            index, arguments = arguments_delta
+            super().add(
+                f'{self._arguments_prefix}{index},"function":{{"arguments":{encode_basestring(arguments)}'
+                f"{self._arguments_suffix}"
+            )
+            return
+        super().add(f"data: {dumps({**chunk.model_dump(mode='json'), **self._envelope})}\n\n")
+
+    def _add_content(self, content: str):
+        super().add(f"{self._content_prefix}{encode_basestring(content)}{self._content_suffix}", droppable=True)
+
+    def add_chunk_from_str(self, content: str):
+        self.deltas_received += 1
+        if self.overflow == "coalesce" and self.full and not self.detached:
+            # Held until the client catches up, see _on_writable()
+            self._pending.append(content)
+            self._pending_bytes += len(content.encode())
+            if self._pending_bytes > max(self.max_buffered_bytes, self.coalesce_max_bytes):
+                # Held text goes only to the replay buffer, keeping its order
+                self.detach()
+                self.flush()
+            return
+        if self.coalesce_interval <= 0:
+            self._add_content(content)
+            return
+        self._pending.append(content)
+        self._pending_bytes += len(content.encode())
+        if self._pending_bytes >= self.coalesce_max_bytes:
+            self.flush()
+        elif self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._flush_handle = loop.call_later(self.coalesce_interval, self.flush)
+
+    def flush(self):
+        """Send buffered text deltas as one frame."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            content = "".join(self._pending)
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._add_content(content)
+
+    def _on_writable(self):
+        super()._on_writable()
+        if self._flush_handle is None:
+            self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "stream_deltas": self.deltas_received}
 
     def add_tool_call(self, tool_call_id: str, function_name: str, arguments: str):
         """Adds tool call chunk."""
+        self.flush()
         response = {
-            "id": self.id,
-            "object": "chat.completion.chunk",
-            "created": self.created,
-            "model": self.model,
-            "system_fingerprint": f"fp_{hex(hash(self.model))[-8:]}",
+            **self._envelope,
             "choices": [
                 {
                     "delta": {
@@ -82,16 +454,13 @@ class OpenAIStreamingGenerator(StreamingGenerator):
             ],
             "usage": None,
         }
-        super().add(f"data: {json.dumps(response)}\n\n")
+        super().add(f"data: {dumps(response)}\n\n")
 
-    def finish(self, content: str | None = None, finish_reason: str = "stop"):
+    def finish(self, content: str | None = None, finish_reason: str = "stop", usage: dict[str, Any] | None = None):
         """Finishes stream with the final chunk and usage."""
+        self.flush()
         final_response = {
-            "id": self.id,
-            "object": "chat.completion.chunk",
-            "created": self.created,
-            "model": self.model,
-            "system_fingerprint": f"fp_{hex(hash(self.model))[-8:]}",
+            **self._envelope,
             "choices": [
                 {
                     "index": self.choice_index,
@@ -100,8 +469,8 @@ class OpenAIStreamingGenerator(StreamingGenerator):
                     "finish_reason": finish_reason,
                 }
             ],
-            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            "usage": usage or {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
         }
-        super().add(f"data: {json.dumps(final_response)}\n\n")
+        super().add(f"data: {dumps(final_response)}\n\n")
         super().add("data: [DONE]\n\n")
         super().finish()
@@ -1,6 +1,7 @@
-from sgr_agent_core.base_tool import BaseTool, MCPBaseTool
+from sgr_agent_core.base_tool import BaseTool, MCPBaseTool, function_tools
 from sgr_agent_core.next_step_tool import NextStepToolsBuilder, NextStepToolStub
 from sgr_agent_core.tools.adapt_plan_tool import AdaptPlanTool
+from sgr_agent_core.tools.batch_web_search_tool import BatchWebSearchTool
 from sgr_agent_core.tools.clarification_tool import ClarificationTool
 from sgr_agent_core.tools.create_report_tool import CreateReportTool
 from sgr_agent_core.tools.extract_page_content_tool import ExtractPageContentTool
@@ -13,12 +14,14 @@ __all__ = [
     # Base classes
     "BaseTool",
     "MCPBaseTool",
+    "function_tools",
     "NextStepToolStub",
     "NextStepToolsBuilder",
     # Individual tools
     "ClarificationTool",
     "GeneratePlanTool",
     "WebSearchTool",
+    "BatchWebSearchTool",
     "ExtractPageContentTool",
     "AdaptPlanTool",
     "CreateReportTool",
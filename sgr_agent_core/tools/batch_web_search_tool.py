@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from itertools import chain, zip_longest
+from typing import TYPE_CHECKING, ClassVar
+
+from pydantic import Field
+
+from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.models import SearchResult, SourceData
+from sgr_agent_core.services.extract_prefetcher import ExtractPrefetcher
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import AgentConfig
+    from sgr_agent_core.models import AgentContext
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class BatchWebSearchTool(BaseTool):
+    """Search the web for several related queries at once.
+    Use this tool instead of repeated WebSearchTool calls when the task needs multiple searches
+    (different aspects, synonyms, languages or time periods of the same topic).
+    All queries are executed concurrently; each query counts as one search.
+    Returns: Page titles, URLs, and short snippets (100 characters) grouped by query,
+    every URL listed only once
+    Best for: Broad overview of a topic, comparing several entities
+
+    Usage:
+        - Make each query SPECIFIC and different from the others
+        - Search queries in SAME LANGUAGE as user request
+        - Use ExtractPageContentTool to get full content from found URLs
+    """
+
+    speculative: ClassVar[bool] = True
+    concurrency_safe: ClassVar[bool] = True
+
+    reasoning: str = Field(description="Why these searches are needed and what to expect")
+    queries: list[str] = Field(
+        description="Search queries in same language as user request",
+        min_length=1,
+        max_length=5,
+    )
+    max_results: int = Field(
+        description="Maximum results per query",
+        default=5,
+        ge=1,
+        le=10,
+    )
+
+    @staticmethod
+    def _merge_sources(context: AgentContext, sources: list[SourceData]) -> list[SourceData]:
+        """Add new sources to context with the next numbers.
+
+        URLs already known to the context keep their number and data.
+        """
+        merged = []
+        for source in sources:
+            if source.url not in context.sources:
+                source.number = len(context.sources) + 1
+                context.sources[source.url] = source
+            merged.append(context.sources[source.url])
+        return merged
+
+    def _queries_in_budget(self, context: AgentContext, config: AgentConfig) -> list[str]:
+        """Queries that fit the remaining search budget, in order."""
+        return self.queries[: max(config.search.max_searches - context.searches_used, 0)]
+
+    async def fetch(self, context: AgentContext, config: AgentConfig) -> list[list[SourceData] | BaseException]:
+        """Run all queries concurrently without recording them in the
+        context.
+
+        Returns sources or the error of each query that fits the search
+        budget, counting searches of other tool calls still running.
+        """
+        reserved = context.reserve_searches(len(self.queries), config.search.max_searches)
+        queries = self.queries[:reserved]
+        logger.info(f"🔍 Batch search queries: {queries}")
+        self._search_service = TavilySearchService(config.search)
+        max_results = min(self.max_results, config.search.max_results)
+
+        try:
+            return await asyncio.gather(
+                *(
+                    self._search_service.search(query=query, max_results=max_results, include_raw_content=False)
+                    for query in queries
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            context.release_searches(reserved)
+
+    async def __call__(
+        self,
+        context: AgentContext,
+        config: AgentConfig,
+        fetched: list[list[SourceData] | BaseException] | None = None,
+        **_,
+    ) -> str:
+        """Execute all queries concurrently using TavilySearchService."""
+        results = fetched if fetched is not None else await self.fetch(context, config)
+        context.search_cache_hits += self._search_service.cache_hits
+        context.search_cache_misses += self._search_service.cache_misses
+        # Re-checked for speculative calls: searches committed meanwhile use up the budget too
+        queries = self._queries_in_budget(context, config)[: len(results)]
+
+        formatted_result = "Search Results (titles, links, short snippets):\n\n"
+        if skipped := self.queries[len(queries) :]:
+            formatted_result += (
+                f"*Search limit of {config.search.max_searches} reached, "
+                f"{len(skipped)} queries not executed: {skipped}*\n\n"
+            )
+        listed_urls = set()
+        found_urls: list[list[str]] = []
+        # Results are merged in query order so numbering doesn't depend on which search finished first
+        for query, sources in zip(queries, results):
+            formatted_result += f"Search Query: {query}\n\n"
+            if isinstance(sources, asyncio.CancelledError):
+                raise sources
+            if isinstance(sources, BaseException):
+                logger.error(f"Search failed for query '{query}': {sources}")
+                formatted_result += f"*Search failed: {sources}*\n\n"
+                continue
+
+            sources = self._merge_sources(context, sources)
+            found_urls.append([source.url for source in sources])
+            context.searches.append(SearchResult(query=query, answer=None, citations=sources, timestamp=datetime.now()))
+            context.searches_used += 1
+
+            new_sources = [source for source in sources if source.url not in listed_urls]
+            if not new_sources:
+                formatted_result += "*No new results, all sources are listed above*\n\n"
+            for source in new_sources:
+                listed_urls.add(source.url)
+                snippet = source.snippet[:100] + "..." if len(source.snippet) > 100 else source.snippet
+                formatted_result += f"{str(source)}\n{snippet}\n\n"
+
+        if prefetcher := ExtractPrefetcher.get(context, config.search):
+            # Top results of every query go first
+            prefetcher.prefetch([url for url in chain.from_iterable(zip_longest(*found_urls)) if url])
+
+        logger.debug(formatted_result)
+        return formatted_result
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from pydantic import Field
 
 from sgr_agent_core.base_tool import BaseTool
-from sgr_agent_core.services import TavilySearchService
+from sgr_agent_core.services import PassageRanker, TavilySearchService
 
 if TYPE_CHECKING:
     from sgr_agent_core.agent_definition import AgentConfig
-    from sgr_agent_core.models import AgentContext
+    from sgr_agent_core.models import AgentContext, SourceData
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -32,16 +32,66 @@ class ExtractPageContentTool(BaseTool):
         - For date/number questions, cross-check extracted values with search snippets
     """
 
+    speculative: ClassVar[bool] = True
+    concurrency_safe: ClassVar[bool] = True
+
     reasoning: str = Field(description="Why extract these specific pages")
     urls: list[str] = Field(description="List of URLs to extract full content from", min_length=1, max_length=5)
 
-    async def __call__(self, context: AgentContext, config: AgentConfig, **_) -> str:
-        """Extract full content from specified URLs."""
-
+    def _relevance_query(self, url: str, context: AgentContext) -> str:
+        """Extraction reasoning plus the search queries that found the
+        URL."""
+        queries = [search.query for search in context.searches if any(c.url == url for c in search.citations)]
+        return " ".join([self.reasoning, *queries])
+
+    def _format_content(self, full_content: str, source: SourceData, context: AgentContext, config: AgentConfig) -> str:
+        content_limit = config.search.content_limit
+        if not config.search.rank_passages or len(full_content) <= content_limit:
+            content_preview = full_content[:content_limit]
+            return (
+                f"**Full Content:**\n{content_preview}\n\n"
+                f"*[Content length: {len(content_preview)} characters]*\n\n"
+                "---\n\n"
+            )
+
+        # Longest "[chars start-end]" header plus the separator, so rendered passages fit content_limit
+        header_size = len(f"[chars {len(full_content)}-{len(full_content)}]\n") + len("\n\n")
+        passages = PassageRanker.select(
+            full_content,
+            self._relevance_query(source.url, context),
+            content_limit,
+            content_hash=source.content_hash,
+            passage_size=config.search.passage_size,
+            passage_overhead=header_size,
+        )
+        selected_chars = sum(len(passage.text) for passage in passages)
+        passages_text = "\n\n".join(f"[chars {p.start}-{p.end}]\n{p.text}" for p in passages)
+        return (
+            f"**Relevant Passages:**\n{passages_text}\n\n"
+            f"*[Selected {len(passages)} passages, {selected_chars} of {len(full_content)} characters]*\n\n"
+            "---\n\n"
+        )
+
+    async def fetch(self, context: AgentContext, config: AgentConfig) -> list[SourceData]:
+        """Extract the pages, using prefetched ones, without changing the
+        context."""
         logger.info(f"📄 Extracting content from {len(self.urls)} URLs")
 
         self._search_service = TavilySearchService(config.search)
-        sources = await self._search_service.extract(urls=self.urls)
+        prefetched = await context.prefetcher.peek(self.urls) if context.prefetcher is not None else {}
+        sources = list(prefetched.values())
+        if urls_to_extract := [url for url in self.urls if url not in prefetched]:
+            sources += await self._search_service.extract(urls=urls_to_extract)
+        return sources
+
+    async def __call__(
+        self, context: AgentContext, config: AgentConfig, fetched: list[SourceData] | None = None, **_
+    ) -> str:
+        """Extract full content from specified URLs."""
+        sources = fetched if fetched is not None else await self.fetch(context, config)
+        if context.prefetcher is not None:
+            # Count prefetches used by the extraction, they are done already
+            await context.prefetcher.take(self.urls)
 
         # Update existing sources instead of overwriting
         for source in sources:
@@ -50,6 +100,7 @@ class ExtractPageContentTool(BaseTool):
                 existing = context.sources[source.url]
                 existing.full_content = source.full_content
                 existing.char_count = source.char_count
+                existing.content_hash = source.content_hash
             else:
                 # New URL, add with next number
                 source.number = len(context.sources) + 1
@@ -61,14 +112,9 @@ class ExtractPageContentTool(BaseTool):
         for url in self.urls:
             if url in context.sources:
                 source = context.sources[url]
-                if source.full_content:
-                    content_preview = source.full_content[: config.search.content_limit]
-                    formatted_result += (
-                        f"{str(source)}\n\n**Full Content:**\n"
-                        f"{content_preview}\n\n"
-                        f"*[Content length: {len(content_preview)} characters]*\n\n"
-                        "---\n\n"
-                    )
+                if full_content := await self._search_service.load_content(source):
+                    content = self._format_content(full_content, source, context, config)
+                    formatted_result += f"{str(source)}\n\n{content}"
                 else:
                     formatted_result += f"{str(source)}\n*Failed to extract content*\n\n"
 
@@ -2,17 +2,18 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from pydantic import Field
 
 from sgr_agent_core.base_tool import BaseTool
 from sgr_agent_core.models import SearchResult
+from sgr_agent_core.services.extract_prefetcher import ExtractPrefetcher
 from sgr_agent_core.services.tavily_search import TavilySearchService
 
 if TYPE_CHECKING:
     from sgr_agent_core.agent_definition import AgentConfig
-    from sgr_agent_core.models import AgentContext
+    from sgr_agent_core.models import AgentContext, SourceData
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -43,6 +44,9 @@ class WebSearchTool(BaseTool):
         - If the snippet directly answers the question, you may not need to extract the full page
     """
 
+    speculative: ClassVar[bool] = True
+    concurrency_safe: ClassVar[bool] = True
+
     reasoning: str = Field(description="Why this search is needed and what to expect")
     query: str = Field(description="Search query in same language as user request")
     max_results: int = Field(
@@ -52,22 +56,42 @@ class WebSearchTool(BaseTool):
         le=10,
     )
 
-    async def __call__(self, context: AgentContext, config: AgentConfig, **_) -> str:
+    async def fetch(self, context: AgentContext, config: AgentConfig) -> list[SourceData] | None:
+        """Run the search without recording it in the context.
+
+        Returns None if the search budget is used up, counting searches
+        of other tool calls still running.
+        """
+        if not context.reserve_searches(1, config.search.max_searches):
+            return None
+        try:
+            logger.info(f"🔍 Search query: '{self.query}'")
+            self._search_service = TavilySearchService(config.search)
+            return await self._search_service.search(
+                query=self.query,
+                max_results=min(self.max_results, config.search.max_results),
+                include_raw_content=False,
+            )
+        finally:
+            context.release_searches(1)
+
+    async def __call__(
+        self, context: AgentContext, config: AgentConfig, fetched: list[SourceData] | None = None, **_
+    ) -> str:
         """Execute web search using TavilySearchService."""
-
-        logger.info(f"🔍 Search query: '{self.query}'")
-        self._search_service = TavilySearchService(config.search)
-
-        sources = await self._search_service.search(
-            query=self.query,
-            max_results=min(self.max_results, config.search.max_results),
-            include_raw_content=False,
-        )
+        sources = fetched if fetched is not None else await self.fetch(context, config)
+        # Re-checked for speculative calls: searches committed meanwhile use up the budget too
+        if sources is None or context.searches_used >= config.search.max_searches:
+            return f"*Search limit of {config.search.max_searches} reached, query not executed: {self.query}*"
+        context.search_cache_hits += self._search_service.cache_hits
+        context.search_cache_misses += self._search_service.cache_misses
 
         sources = TavilySearchService.rearrange_sources(sources, starting_number=len(context.sources) + 1)
 
         for source in sources:
             context.sources[source.url] = source
+        if prefetcher := ExtractPrefetcher.get(context, config.search):
+            prefetcher.prefetch([source.url for source in sources])
 
         search_result = SearchResult(
             query=self.query,
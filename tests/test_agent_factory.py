@@ -13,6 +13,7 @@ from openai import AsyncOpenAI
 from sgr_agent_core.agent_definition import (
     AgentDefinition,
     ExecutionConfig,
+    HTTPClientConfig,
     LLMConfig,
     PromptsConfig,
 )
@@ -347,6 +348,35 @@ class TestAgentFactoryClientCreation:
         assert client.api_key == "test-key"
         assert client._client is not None
 
+    def test_create_client_connection_limits(self):
+        """Test that connection pool settings are applied to the HTTP
+        client."""
+        client = AgentFactory._create_client(
+            LLMConfig(api_key="test-key"), HTTPClientConfig(max_connections=7, timeout=42, http2=True)
+        )
+
+        pool = client._client._transport._pool
+        assert pool._max_connections == 7
+        assert client._client.timeout.read == 42
+
+    @pytest.mark.asyncio
+    async def test_get_client_shares_client_per_config(self):
+        """Test that agents with the same LLM endpoint share one client and
+        shutdown closes it."""
+        AgentFactory._clients = {}
+        first = AgentFactory.get_client(LLMConfig(api_key="test-key", model="gpt-4o"))
+        second = AgentFactory.get_client(LLMConfig(api_key="test-key", model="gpt-4o-mini"))
+        other_key = AgentFactory.get_client(LLMConfig(api_key="other-key"))
+
+        assert first is second
+        assert other_key is not first
+        assert len(AgentFactory._clients) == 2
+
+        await AgentFactory.shutdown()
+
+        assert first.is_closed()
+        assert AgentFactory._clients == {}
+
     @pytest.mark.asyncio
     async def test_stream_request_with_extra_parameters(self):
         """Test that additional parameters from LLMConfig (extra='allow') are
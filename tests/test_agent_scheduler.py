@@ -0,0 +1,199 @@
+"""Tests for AgentScheduler service.
+
+This module contains tests for admission control of agent execution:
+concurrency limits, the bounded wait queue, per-definition limits and
+the 429 response of the chat completions endpoint.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from sgr_agent_core.agent_definition import SchedulerConfig
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.server.endpoints import agents_storage, create_chat_completion
+from sgr_agent_core.server.models import ChatCompletionRequest
+from sgr_agent_core.services.agent_scheduler import AgentQueueFullError, AgentScheduler
+from tests.conftest import create_test_agent
+
+
+def _blocking_agent(def_name: str = "sgr_agent"):
+    """Create an agent whose execution blocks until its release event is
+    set."""
+    agent = create_test_agent(SGRAgent)
+    agent.def_name = def_name
+    agent.release = asyncio.Event()
+
+    async def execute():
+        await agent.release.wait()
+        return "done"
+
+    agent.execute = execute
+    return agent
+
+
+class TestAgentSchedulerLimits:
+    """Tests for concurrency limits and queueing."""
+
+    @pytest.mark.asyncio
+    async def test_agents_over_limit_wait_in_queue(self):
+        """Test that agents above the concurrency limit wait for a free slot
+        in FIFO order."""
+        scheduler = AgentScheduler(SchedulerConfig(max_concurrent_agents=1, max_queue_size=5))
+        first, second = _blocking_agent(), _blocking_agent()
+
+        first_task = asyncio.create_task(scheduler.submit(first))
+        second_task = asyncio.create_task(scheduler.submit(second))
+        await asyncio.sleep(0)
+
+        assert scheduler.stats()["running"] == 1
+        assert scheduler.queue_position(second.id) == 1
+        assert scheduler.queue_position(first.id) is None
+
+        first.release.set()
+        assert await first_task == "done"
+        await asyncio.sleep(0)
+        assert scheduler.queue_position(second.id) is None
+        assert scheduler.stats()["running"] == 1
+
+        second.release.set()
+        assert await second_task == "done"
+        assert scheduler.stats()["running"] == 0
+        assert second._context.queue_wait_time > 0
+
+    @pytest.mark.asyncio
+    async def test_queue_full_rejects_immediately(self):
+        """Test that admission fails fast with retry hint when the queue is
+        full."""
+        scheduler = AgentScheduler(SchedulerConfig(max_concurrent_agents=1, max_queue_size=1, retry_after=7))
+        agents = [_blocking_agent() for _ in range(3)]
+        tasks = [asyncio.create_task(scheduler.submit(agent)) for agent in agents[:2]]
+
+        with pytest.raises(AgentQueueFullError) as exc_info:
+            scheduler.submit(agents[2])
+
+        assert exc_info.value.retry_after == 7
+        assert scheduler.stats()["rejected"] == 1
+
+        for agent in agents[:2]:
+            agent.release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_unbounded_submit_ignores_queue_size(self):
+        """Test that already admitted agents can be resumed even if the queue
+        is full."""
+        scheduler = AgentScheduler(SchedulerConfig(max_concurrent_agents=1, max_queue_size=0))
+        first, resumed = _blocking_agent(), _blocking_agent()
+        first_task = asyncio.create_task(scheduler.submit(first))
+        resumed_task = asyncio.create_task(scheduler.submit(resumed, bounded=False))
+        await asyncio.sleep(0)
+
+        assert scheduler.stats()["queued"] == 1
+
+        first.release.set()
+        resumed.release.set()
+        await asyncio.gather(first_task, resumed_task)
+
+    @pytest.mark.asyncio
+    async def test_definition_limits(self):
+        """Test that per-definition limits do not block other
+        definitions."""
+        scheduler = AgentScheduler(
+            SchedulerConfig(max_concurrent_agents=5, definition_limits={"slow_agent": 1}, max_queue_size=5)
+        )
+        slow_first, slow_second, other = _blocking_agent("slow_agent"), _blocking_agent("slow_agent"), _blocking_agent()
+        tasks = [asyncio.create_task(scheduler.submit(agent)) for agent in (slow_first, slow_second, other)]
+        await asyncio.sleep(0)
+
+        stats = scheduler.stats()
+        assert stats["running_by_definition"] == {"slow_agent": 1, "sgr_agent": 1}
+        assert scheduler.queue_position(slow_second.id) == 1
+
+        for agent in (slow_first, slow_second, other):
+            agent.release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_agent_leaves_queue(self):
+        """Test that cancelling a queued agent frees its queue place."""
+        scheduler = AgentScheduler(SchedulerConfig(max_concurrent_agents=1))
+        first, second = _blocking_agent(), _blocking_agent()
+        first_task = asyncio.create_task(scheduler.submit(first))
+        second_task = asyncio.create_task(scheduler.submit(second))
+        await asyncio.sleep(0)
+
+        second_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second_task
+
+        assert scheduler.stats()["queued"] == 0
+        first.release.set()
+        await first_task
+        assert scheduler.stats()["running"] == 0
+
+
+class TestAgentSchedulerClarification:
+    """Tests for slot handling while agents wait for clarification."""
+
+    @pytest.mark.asyncio
+    async def test_waiting_agent_releases_slot(self):
+        """Test that an agent waiting for clarification lets queued agents
+        run."""
+        scheduler = AgentScheduler(SchedulerConfig(max_concurrent_agents=1))
+        waiting = create_test_agent(SGRAgent)
+        waiting._context.state = AgentStatesEnum.WAITING_FOR_CLARIFICATION
+        waiting._execution_step = AsyncMock(
+            side_effect=lambda: setattr(waiting._context, "state", AgentStatesEnum.COMPLETED)
+        )
+        other = _blocking_agent()
+
+        with patch.object(waiting, "_save_agent_log"):
+            waiting_task = asyncio.create_task(scheduler.submit(waiting))
+            await asyncio.sleep(0)
+            other_task = asyncio.create_task(scheduler.submit(other))
+            await asyncio.sleep(0)
+
+            # The waiting agent gave its slot to the other one
+            assert scheduler.queue_position(other.id) is None
+            await waiting.provide_clarification([{"role": "user", "content": "Answer"}])
+            await asyncio.sleep(0)
+            assert scheduler.queue_position(waiting.id) == 1
+
+            other.release.set()
+            await asyncio.gather(waiting_task, other_task)
+
+        waiting._execution_step.assert_awaited_once()
+        assert scheduler.stats()["running"] == 0
+
+
+class TestChatCompletionAdmission:
+    """Tests for admission control in the chat completions endpoint."""
+
+    def teardown_method(self):
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_queue_full_returns_429(self):
+        """Test that the endpoint answers 429 with Retry-After before creating
+        an agent."""
+        agent_def = Mock()
+        agent_def.name = "sgr_agent"
+        scheduler = Mock(check_admission=Mock(side_effect=AgentQueueFullError("Agent queue is full", retry_after=3)))
+        request = ChatCompletionRequest(model="sgr_agent", messages=[{"role": "user", "content": "Task"}])
+
+        with (
+            patch("sgr_agent_core.server.endpoints.agents_scheduler", scheduler),
+            patch("sgr_agent_core.server.endpoints.AgentFactory") as mock_factory,
+        ):
+            mock_factory.get_definitions_list.return_value = [agent_def]
+            mock_factory.create = AsyncMock()
+            with pytest.raises(HTTPException) as exc_info:
+                await create_chat_completion(request)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "3"}
+        mock_factory.create.assert_not_called()
@@ -0,0 +1,244 @@
+"""Tests for agent state persistence.
+
+This module contains tests for agent snapshots, the SQLite state backend
+and restoring agents through AgentFactory and API endpoints.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentStoreConfig
+from sgr_agent_core.agent_factory import AgentFactory
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum, SourceData
+from sgr_agent_core.server.endpoints import _restoring, agents_scheduler, agents_storage, get_agent_state
+from sgr_agent_core.services.agent_state_backend import SQLiteAgentStateBackend
+from sgr_agent_core.services.agent_store import AgentStore
+from sgr_agent_core.tools import FinalAnswerTool, ReasoningTool, WebSearchTool
+from tests.conftest import create_test_agent
+
+
+def _agent_with_state():
+    agent = create_test_agent(SGRAgent, toolkit=[ReasoningTool, WebSearchTool, FinalAnswerTool])
+    agent.conversation = [{"role": "assistant", "content": "Searching"}]
+    agent._context.iteration = 3
+    agent._context.searches_used = 1
+    agent._context.state = AgentStatesEnum.WAITING_FOR_CLARIFICATION
+    agent._context.sources["https://example.com"] = SourceData(number=1, url="https://example.com", title="Example")
+    return agent
+
+
+class TestAgentSnapshot:
+    """Tests for BaseAgent snapshot dump and restore."""
+
+    def test_snapshot_contains_agent_state(self):
+        """Test that snapshot includes context, conversation and toolkit."""
+        agent = _agent_with_state()
+
+        snapshot = agent.to_snapshot()
+
+        assert snapshot.id == agent.id
+        assert snapshot.def_name == SGRAgent.name
+        assert snapshot.conversation == agent.conversation
+        assert snapshot.toolkit == [ReasoningTool.tool_name, WebSearchTool.tool_name, FinalAnswerTool.tool_name]
+        assert snapshot.context["iteration"] == 3
+        assert "clarification_received" not in snapshot.context
+
+    def test_restore_snapshot(self):
+        """Test that a fresh agent gets the saved state back."""
+        agent = _agent_with_state()
+        snapshot = agent.to_snapshot()
+
+        restored = create_test_agent(SGRAgent, toolkit=[FinalAnswerTool, WebSearchTool, ReasoningTool])
+        restored.restore_snapshot(snapshot)
+
+        assert restored.id == agent.id
+        assert restored.conversation == agent.conversation
+        assert restored.toolkit == [ReasoningTool, WebSearchTool, FinalAnswerTool]
+        assert restored._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION
+        assert restored._context.sources["https://example.com"].title == "Example"
+        assert restored.streaming_generator.model == agent.id
+
+
+class TestSQLiteAgentStateBackend:
+    """Tests for SQLite state backend."""
+
+    @pytest.mark.asyncio
+    async def test_save_load_delete(self, tmp_path):
+        """Test snapshot round trip through SQLite."""
+        backend = SQLiteAgentStateBackend(str(tmp_path / "state" / "agents.sqlite3"))
+        snapshot = _agent_with_state().to_snapshot()
+
+        await backend.save(snapshot)
+        loaded = await backend.load(snapshot.id)
+        assert loaded == snapshot
+
+        snapshot.context["iteration"] = 4
+        await backend.save(snapshot)
+        assert (await backend.load(snapshot.id)).context["iteration"] == 4
+
+        await backend.delete(snapshot.id)
+        assert await backend.load(snapshot.id) is None
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_load_missing(self, tmp_path):
+        """Test that loading an unknown agent returns None."""
+        backend = SQLiteAgentStateBackend(str(tmp_path / "agents.sqlite3"))
+        assert await backend.load("missing") is None
+        await backend.close()
+
+
+class TestAgentCheckpoints:
+    """Tests for checkpointing during agent execution."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_after_each_step(self):
+        """Test that agent state is saved after every execution step."""
+        agent = create_test_agent(SGRAgent)
+        agent.state_backend = Mock(save=AsyncMock())
+
+        async def step():
+            if agent._context.iteration == 2:
+                agent._context.state = AgentStatesEnum.COMPLETED
+
+        agent._execution_step = step
+        with patch.object(agent, "_save_agent_log"):
+            await agent.execute()
+
+        # Two steps plus the final checkpoint
+        assert agent.state_backend.save.await_count == 3
+        assert agent.state_backend.save.await_args[0][0].context["state"] == AgentStatesEnum.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_failure_does_not_break_agent(self):
+        """Test that backend errors are logged and ignored."""
+        agent = create_test_agent(SGRAgent)
+        agent.state_backend = Mock(save=AsyncMock(side_effect=OSError("disk full")))
+
+        await agent._checkpoint()
+
+    @pytest.mark.asyncio
+    async def test_restored_waiting_agent_waits_for_clarification(self):
+        """Test that a restored waiting agent does not start a new step
+        before clarification."""
+        agent = _agent_with_state()
+        agent._execution_step = AsyncMock(
+            side_effect=lambda: setattr(agent._context, "state", AgentStatesEnum.COMPLETED)
+        )
+
+        with patch.object(agent, "_save_agent_log"):
+            task = asyncio.create_task(agent.execute())
+            await asyncio.sleep(0)
+            agent._execution_step.assert_not_called()
+
+            await agent.provide_clarification([{"role": "user", "content": "Answer"}])
+            await task
+
+        agent._execution_step.assert_awaited_once()
+        assert agent._context.iteration == 4
+
+
+class TestAgentRestore:
+    """Tests for restoring agents through AgentFactory and endpoints."""
+
+    def teardown_method(self):
+        AgentFactory.set_state_backend(None)
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_restore_without_backend(self):
+        """Test that restore returns None when persistence is disabled."""
+        with patch.object(AgentFactory, "get_state_backend", return_value=None):
+            assert await AgentFactory.restore("sgr_agent_123") is None
+
+    @pytest.mark.asyncio
+    async def test_restore_recreates_agent_from_definition(self):
+        """Test that restore creates an agent from its definition and applies
+        the snapshot."""
+        snapshot = _agent_with_state().to_snapshot()
+        AgentFactory.set_state_backend(Mock(load=AsyncMock(return_value=snapshot)))
+        agent_def = Mock()
+        agent_def.name = SGRAgent.name
+        fresh_agent = create_test_agent(SGRAgent, toolkit=[ReasoningTool, WebSearchTool, FinalAnswerTool])
+
+        with (
+            patch.object(AgentFactory, "get_definitions_list", return_value=[agent_def]),
+            patch.object(AgentFactory, "create", AsyncMock(return_value=fresh_agent)) as mock_create,
+        ):
+            agent = await AgentFactory.restore(snapshot.id)
+
+        mock_create.assert_awaited_once_with(agent_def, snapshot.task_messages)
+        assert agent is fresh_agent
+        assert agent.id == snapshot.id
+        assert agent._context.iteration == 3
+
+    @pytest.mark.asyncio
+    async def test_restore_unknown_definition(self):
+        """Test that snapshots of removed definitions are not restored."""
+        snapshot = _agent_with_state().to_snapshot()
+        AgentFactory.set_state_backend(Mock(load=AsyncMock(return_value=snapshot)))
+
+        with patch.object(AgentFactory, "get_definitions_list", return_value=[]):
+            assert await AgentFactory.restore(snapshot.id) is None
+
+    @pytest.mark.asyncio
+    async def test_state_endpoint_restores_agent(self):
+        """Test that agent state is available for agents loaded from disk."""
+        agent = _agent_with_state()
+        agent._context.state = AgentStatesEnum.COMPLETED
+
+        with patch.object(AgentFactory, "restore", AsyncMock(return_value=agent)):
+            response = await get_agent_state(agent.id)
+
+        assert response.agent_id == agent.id
+        assert response.iteration == 3
+        assert response.sources_count == 1
+        assert agent.id in agents_storage
+        assert agent.streaming_generator.detached
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_restore_once(self):
+        """Test that concurrent requests for an agent on disk share one
+        restore and resume one execution loop."""
+        agent = _agent_with_state()
+        agent._context.state = AgentStatesEnum.RESEARCHING
+
+        async def restore(_):
+            await asyncio.sleep(0.01)
+            return agent
+
+        with (
+            patch.object(AgentFactory, "restore", AsyncMock(side_effect=restore)) as mock_restore,
+            patch.object(agents_scheduler, "submit", AsyncMock()) as mock_submit,
+        ):
+            responses = await asyncio.gather(*(get_agent_state(agent.id) for _ in range(3)))
+            await asyncio.sleep(0)
+
+        assert all(response.agent_id == agent.id for response in responses)
+        mock_restore.assert_awaited_once()
+        mock_submit.assert_called_once_with(agent, bounded=False)
+        assert _restoring == {}
+
+
+class TestCheckpointCleanup:
+    """Tests for deleting checkpoints of evicted agents."""
+
+    @pytest.mark.asyncio
+    async def test_evicted_agents_checkpoints_deleted(self):
+        """Test that finished and waiting agents lose their checkpoints on
+        eviction, and a waiting agent does not checkpoint again."""
+        store = AgentStore(AgentStoreConfig(max_finished_agents=0, max_waiting_agents=0))
+        backend = Mock(save=AsyncMock(), delete=AsyncMock())
+        finished, waiting = create_test_agent(SGRAgent), _agent_with_state()
+        finished._context.state = AgentStatesEnum.COMPLETED
+        for agent in (finished, waiting):
+            agent.state_backend = backend
+            store[agent.id] = agent
+        await asyncio.sleep(0)
+
+        assert {call.args[0] for call in backend.delete.await_args_list} == {finished.id, waiting.id}
+        await waiting._checkpoint()
+        backend.save.assert_not_awaited()
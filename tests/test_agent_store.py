@@ -0,0 +1,201 @@
+"""Tests for AgentStore service.
+
+This module contains tests for the bounded agent storage used by the API
+server, including LRU, TTL and memory-based eviction.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentStoreConfig
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum, SourceData
+from sgr_agent_core.services.agent_store import AgentStore, estimate_agent_size
+from tests.conftest import create_test_agent
+
+
+def _agent(state: AgentStatesEnum = AgentStatesEnum.RESEARCHING):
+    agent = create_test_agent(SGRAgent)
+    agent._context.state = state
+    return agent
+
+
+class TestAgentStoreMapping:
+    """Tests for dict-like behaviour of AgentStore."""
+
+    def test_set_get_and_contains(self):
+        """Test that stored agents can be retrieved by ID."""
+        store = AgentStore(AgentStoreConfig())
+        agent = _agent()
+        store[agent.id] = agent
+
+        assert agent.id in store
+        assert store[agent.id] is agent
+        assert store.get(agent.id) is agent
+        assert len(store) == 1
+
+    def test_missing_agent(self):
+        """Test that missing agents behave like missing dict keys."""
+        store = AgentStore(AgentStoreConfig())
+
+        assert "missing" not in store
+        assert store.get("missing") is None
+        with pytest.raises(KeyError):
+            _ = store["missing"]
+
+    def test_clear(self):
+        """Test that clear removes all agents."""
+        store = AgentStore(AgentStoreConfig())
+        for _ in range(3):
+            agent = _agent()
+            store[agent.id] = agent
+
+        store.clear()
+        assert len(store) == 0
+
+    def test_values_do_not_refresh_lru(self):
+        """Test that listing agents does not change LRU order."""
+        store = AgentStore(AgentStoreConfig())
+        first, second = _agent(), _agent()
+        store[first.id] = first
+        store[second.id] = second
+
+        assert store.values() == [first, second]
+        assert list(store) == [first.id, second.id]
+
+
+class TestAgentStoreEviction:
+    """Tests for AgentStore eviction policies."""
+
+    def test_running_agents_are_never_evicted(self):
+        """Test that running agents ignore all limits."""
+        store = AgentStore(AgentStoreConfig(max_finished_agents=0, max_waiting_agents=0, max_memory_mb=None))
+        agents = [_agent(AgentStatesEnum.RESEARCHING) for _ in range(5)]
+        for agent in agents:
+            store[agent.id] = agent
+
+        assert len(store) == 5
+        assert store.evictions == {}
+
+    def test_finished_agents_lru_limit(self):
+        """Test that the least recently used finished agents are evicted
+        first."""
+        store = AgentStore(AgentStoreConfig(max_finished_agents=2, max_memory_mb=None))
+        first, second, third = (_agent(AgentStatesEnum.COMPLETED) for _ in range(3))
+        store[first.id] = first
+        store[second.id] = second
+        # Touch the first agent so the second one becomes least recently used
+        _ = store[first.id]
+        store[third.id] = third
+
+        assert first.id in store
+        assert second.id not in store
+        assert third.id in store
+        assert store.evictions["lru"] == 1
+
+    def test_finished_agents_ttl(self):
+        """Test that finished agents expire after TTL without access."""
+        store = AgentStore(AgentStoreConfig(finished_ttl=10, max_memory_mb=None))
+        agent = _agent(AgentStatesEnum.COMPLETED)
+
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=100.0):
+            store[agent.id] = agent
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=105.0):
+            assert store.get(agent.id) is agent
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=120.0):
+            assert store.get(agent.id) is None
+
+        assert agent.id not in store
+        assert store.evictions["ttl"] == 1
+
+    def test_ttl_starts_when_agent_finishes(self):
+        """Test that time spent running does not count towards finished
+        TTL."""
+        store = AgentStore(AgentStoreConfig(finished_ttl=10, max_memory_mb=None))
+        agent = _agent(AgentStatesEnum.RESEARCHING)
+
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=0.0):
+            store[agent.id] = agent
+        agent._context.state = AgentStatesEnum.COMPLETED
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=1000.0):
+            assert store.evict() == 0
+        with patch("sgr_agent_core.services.agent_store.time.monotonic", return_value=1011.0):
+            assert store.evict() == 1
+
+    def test_waiting_agents_limit_fails_and_wakes_agent(self):
+        """Test that evicted clarification-waiting agents are failed and
+        unblocked."""
+        store = AgentStore(AgentStoreConfig(max_waiting_agents=1))
+        first, second = (
+            _agent(AgentStatesEnum.WAITING_FOR_CLARIFICATION),
+            _agent(AgentStatesEnum.WAITING_FOR_CLARIFICATION),
+        )
+        store[first.id] = first
+        store[second.id] = second
+
+        assert first.id not in store
+        assert second.id in store
+        assert first._context.state == AgentStatesEnum.FAILED
+        assert first._context.clarification_received.is_set()
+        assert store.evictions["waiting_limit"] == 1
+
+    def test_memory_budget(self):
+        """Test that finished agents are evicted when memory budget is
+        exceeded."""
+        store = AgentStore(AgentStoreConfig(max_memory_mb=0.1))
+        agents = []
+        for _ in range(3):
+            agent = _agent(AgentStatesEnum.COMPLETED)
+            agent._context.sources = {
+                "https://example.com": SourceData(number=1, url="https://example.com", full_content="x" * 60_000)
+            }
+            agents.append(agent)
+            store[agent.id] = agent
+
+        assert agents[0].id not in store
+        assert agents[2].id in store
+        assert store.evictions["memory"] >= 1
+        assert store.stats()["finished_memory_bytes"] <= 0.1 * 1024 * 1024
+
+
+class TestAgentStoreStats:
+    """Tests for storage statistics and size accounting."""
+
+    def test_estimate_agent_size_grows_with_content(self):
+        """Test that agent size estimation accounts for sources content."""
+        agent = _agent()
+        base_size = estimate_agent_size(agent)
+        agent._context.sources["https://example.com"] = SourceData(
+            number=1, url="https://example.com", full_content="x" * 10_000
+        )
+
+        assert estimate_agent_size(agent) >= base_size + 10_000
+
+    def test_estimate_agent_size_counts_stream_replay(self):
+        """Test that frames kept for stream subscribers count toward the
+        agent size."""
+        agent = _agent()
+        base_size = estimate_agent_size(agent)
+        agent.streaming_generator.add_chunk_from_str("x" * 10_000)
+
+        assert estimate_agent_size(agent) >= base_size + 10_000
+
+    def test_stats_counts_by_state(self):
+        """Test that stats group agents by state."""
+        store = AgentStore(AgentStoreConfig())
+        for state in (
+            AgentStatesEnum.RESEARCHING,
+            AgentStatesEnum.WAITING_FOR_CLARIFICATION,
+            AgentStatesEnum.COMPLETED,
+            AgentStatesEnum.FAILED,
+        ):
+            agent = _agent(state)
+            store[agent.id] = agent
+
+        stats = store.stats()
+        assert stats["total"] == 4
+        assert stats["running"] == 1
+        assert stats["waiting_for_clarification"] == 1
+        assert stats["finished"] == 2
+        assert stats["finished_memory_bytes"] > 0
@@ -18,7 +18,9 @@ from sgr_agent_core.server.endpoints import (
     create_chat_completion,
     get_agent_state,
     get_agents_list,
+    get_agents_storage_stats,
     provide_clarification,
+    stream_agent,
 )
 from sgr_agent_core.server.models import ChatCompletionRequest, ClarificationRequest
 from tests.conftest import create_test_agent
@@ -330,6 +332,40 @@ class TestAgentStateEndpoint:
         assert "Agent not found" in str(exc_info.value.detail)
 
 
+class TestAgentStreamEndpoint:
+    """Tests for stream_agent endpoint."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_from_last_event_id(self):
+        """Test that a subscriber resumes after Last-Event-ID without
+        taking frames from the original client."""
+        agent = create_test_agent(SGRAgent)
+        agents_storage[agent.id] = agent
+        agent.streaming_generator.add("data: 1\n\n")
+        agent.streaming_generator.add("data: 2\n\n")
+        agent.streaming_generator.finish()
+
+        response = await stream_agent(agent.id, last_event_id=1)
+
+        assert response.media_type == "text/event-stream"
+        frames = [frame async for frame in response.body_iterator]
+        assert frames[0] == "id: 2\ndata: 2\n\n"
+        assert frames[-1] == "id: 4\ndata: [DONE]\n\n"
+        # Final chunk, [DONE] and the termination signal are still queued for the original client
+        assert agent.streaming_generator.queue.qsize() == 5
+
+    @pytest.mark.asyncio
+    async def test_stream_not_found(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_agent("non_existent_agent_id")
+
+        assert exc_info.value.status_code == 404
+
+
 class TestAgentsListEndpoint:
     """Tests for get_agents_list endpoint."""
 
@@ -371,6 +407,23 @@ class TestAgentsListEndpoint:
         assert agent1_response.task_messages[0]["content"] == "Task 1"
         assert agent2_response.task_messages[0]["content"] == "Task 2"
 
+    @pytest.mark.asyncio
+    async def test_get_agents_storage_stats(self):
+        """Test storage stats endpoint reports agents by state."""
+        running = create_test_agent(SGRAgent, task_messages=[{"role": "user", "content": "Task 1"}])
+        finished = create_test_agent(SGRAgent, task_messages=[{"role": "user", "content": "Task 2"}])
+        finished._context.state = AgentStatesEnum.COMPLETED
+
+        agents_storage[running.id] = running
+        agents_storage[finished.id] = finished
+
+        response = await get_agents_storage_stats()
+
+        assert response.total == 2
+        assert response.running == 1
+        assert response.finished == 1
+        assert response.finished_memory_bytes > 0
+
 
 class TestProvideClarificationEndpoint:
     """Tests for provide_clarification endpoint."""
@@ -13,6 +13,7 @@ import pytest
 
 from sgr_agent_core.base_agent import BaseAgent
 from sgr_agent_core.models import AgentContext, AgentStatesEnum
+from sgr_agent_core.services.log_writer import LogWriter
 from sgr_agent_core.tools import BaseTool, ReasoningTool
 from tests.conftest import create_test_agent
 
@@ -310,13 +311,14 @@ class TestBaseAgentLogging:
         )
 
         tool = TestToolWithEnum(status=TestStatus.DONE)
-        agent._log_tool_execution(tool, "Result")
 
         mock_config = Mock()
         mock_config.execution.logs_dir = logs_dir
 
         with patch("sgr_agent_core.agent_config.GlobalConfig", return_value=mock_config):
+            agent._log_tool_execution(tool, "Result")
             agent._save_agent_log()
+        LogWriter.get().flush()
 
         assert os.path.exists(logs_dir)
         log_files = list(os.listdir(logs_dir))
@@ -324,9 +326,10 @@ class TestBaseAgentLogging:
 
         log_file_path = os.path.join(logs_dir, log_files[0])
         with open(log_file_path, "r", encoding="utf-8") as f:
-            log_data = json.load(f)
+            records = [json.loads(line) for line in f]
 
-        tool_context = log_data["log"][0]["agent_tool_context"]
+        assert [record["step_type"] for record in records] == ["agent_start", "tool_execution", "agent_finish"]
+        tool_context = records[1]["agent_tool_context"]
         assert isinstance(tool_context["status"], str)
         assert tool_context["status"] == "done"
 
@@ -403,6 +406,42 @@ class TestBaseAgentPrepareContext:
 
         assert len(context) == 6  # system + task_messages + initial_user_request + 3 conversation messages
 
+    @pytest.mark.asyncio
+    async def test_prepare_context_prefix_is_stable(self):
+        """Test that the prompt prefix is identical between steps and only
+        conversation is appended."""
+        agent = create_test_agent(BaseAgent, task_messages=[{"role": "user", "content": "Test"}])
+
+        first = await agent._prepare_context()
+        first_hash = agent._context.prefix_hash
+        agent.conversation.append({"role": "assistant", "content": "step 1"})
+        second = await agent._prepare_context()
+
+        assert second[: len(first)] == first
+        assert second[-1] == {"role": "assistant", "content": "step 1"}
+        assert agent._context.prefix_hash == first_hash
+        assert agent._context.prefix_changes == 0
+
+    @pytest.mark.asyncio
+    async def test_prepare_context_without_stable_prefix(self):
+        """Test that the prefix is rebuilt every step when the mode is
+        disabled and changes are counted."""
+        from sgr_agent_core.agent_definition import ExecutionConfig
+
+        agent = create_test_agent(
+            BaseAgent,
+            task_messages=[{"role": "user", "content": "Test"}],
+            execution_config=ExecutionConfig(stable_prompt_prefix=False),
+        )
+
+        await agent._prepare_context()
+        first_hash = agent._context.prefix_hash
+        agent.task_messages = [{"role": "user", "content": "Changed"}]
+        await agent._prepare_context()
+
+        assert agent._context.prefix_hash != first_hash
+        assert agent._context.prefix_changes == 1
+
 
 class TestBaseAgentSaveLog:
     """Tests for agent log saving functionality."""
@@ -492,9 +531,10 @@ class TestBaseAgentSaveLog:
 
         with patch("sgr_agent_core.agent_config.GlobalConfig", return_value=mock_config):
             agent._save_agent_log()
+        LogWriter.get().flush()
 
         # Verify log file was created
         assert os.path.exists(logs_dir)
         log_files = list(os.listdir(logs_dir))
         assert len(log_files) == 1
-        assert log_files[0].endswith("-log.json")
+        assert log_files[0].endswith("-log.jsonl")
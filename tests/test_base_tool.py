@@ -1,12 +1,14 @@
 """Tests for BaseTool base class.
 
 This module contains tests for the BaseTool base class, covering
-initialization, subclassing, and tool_name generation.
+initialization, subclassing, tool_name generation and function tool
+schemas.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
-from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.base_tool import BaseTool, MCPBaseTool, function_tools
+from sgr_agent_core.tools import FinalAnswerTool, ReasoningTool, WebSearchTool
 
 
 class TestBaseTool:
@@ -52,3 +54,40 @@ class TestBaseTool:
             description = "Custom tool description"
 
         assert MyCustomTool.description == "Custom tool description"
+
+
+class TestFunctionToolSchema:
+    """Test cached OpenAI function tool definitions."""
+
+    def test_function_tool_is_cached(self):
+        """Test that the schema is generated once per tool class."""
+        first = WebSearchTool.to_function_tool()
+
+        assert first["function"]["name"] == WebSearchTool.tool_name
+        assert WebSearchTool.to_function_tool() is first
+
+    def test_description_override_is_cached_separately(self):
+        """Test that a custom description produces a separate definition."""
+        empty_description = WebSearchTool.to_function_tool(description="")
+
+        assert empty_description["function"]["description"] == ""
+        assert WebSearchTool.to_function_tool() is not empty_description
+
+    def test_renamed_tool_invalidates_cache(self):
+        """Test that MCP-like tools renamed after creation get a fresh
+        schema."""
+        ToolCls = create_model("MCPRenamedTool", __base__=MCPBaseTool, query=(str, ...))
+        assert ToolCls.to_function_tool()["function"]["name"] == ToolCls.tool_name
+
+        ToolCls.tool_name = "renamed_tool"
+
+        assert ToolCls.to_function_tool()["function"]["name"] == "renamed_tool"
+
+    def test_function_tools_order_is_stable(self):
+        """Test that function tools are deduplicated and sorted by name."""
+        tools = function_tools([WebSearchTool, ReasoningTool, FinalAnswerTool, WebSearchTool])
+        reordered = function_tools({FinalAnswerTool, WebSearchTool, ReasoningTool})
+
+        names = [tool["function"]["name"] for tool in tools]
+        assert names == sorted([WebSearchTool.tool_name, ReasoningTool.tool_name, FinalAnswerTool.tool_name])
+        assert tools == reordered
@@ -0,0 +1,118 @@
+"""Tests for BatchWebSearchTool.
+
+This module contains tests for concurrent execution of several search
+queries, deduplication of sources and search accounting.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentConfig, SearchConfig
+from sgr_agent_core.models import AgentContext, SourceData
+from sgr_agent_core.tools import BatchWebSearchTool
+
+
+class FakeSearchService:
+    """Search service returning predefined sources per query."""
+
+    def __init__(self, results: dict, delays: dict | None = None):
+        self.results = results
+        self.delays = delays or {}
+        self.running = 0
+        self.max_running = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def search(self, query: str, max_results: int, include_raw_content: bool) -> list[SourceData]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delays.get(query, 0.01))
+        self.running -= 1
+        result = self.results[query]
+        if isinstance(result, BaseException):
+            raise result
+        return [SourceData(number=0, url=url, title=url, snippet=f"About {url}") for url in result]
+
+
+def _config() -> AgentConfig:
+    return AgentConfig(search=SearchConfig(tavily_api_key="key", max_results=10))
+
+
+async def _run(tool: BatchWebSearchTool, context: AgentContext, service: FakeSearchService) -> str:
+    with patch("sgr_agent_core.tools.batch_web_search_tool.TavilySearchService", return_value=service):
+        return await tool(context, _config())
+
+
+class TestBatchWebSearchTool:
+    """Tests for BatchWebSearchTool execution."""
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self):
+        """Test that all queries are searched at the same time."""
+        service = FakeSearchService({"a": ["https://a.com"], "b": ["https://b.com"], "c": ["https://c.com"]})
+        context = AgentContext()
+
+        await _run(BatchWebSearchTool(reasoning="Test", queries=["a", "b", "c"]), context, service)
+
+        assert service.max_running == 3
+        assert context.searches_used == 3
+        assert [search.query for search in context.searches] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_sources_deduplicated_and_numbered_in_query_order(self):
+        """Test that shared URLs get one number and numbering follows query
+        order, not completion order."""
+        service = FakeSearchService(
+            {"a": ["https://known.com", "https://a.com"], "b": ["https://a.com", "https://b.com"]},
+            delays={"a": 0.03},
+        )
+        context = AgentContext()
+        context.sources["https://known.com"] = SourceData(number=1, url="https://known.com", title="Known")
+
+        result = await _run(BatchWebSearchTool(reasoning="Test", queries=["a", "b"]), context, service)
+
+        assert {url: source.number for url, source in context.sources.items()} == {
+            "https://known.com": 1,
+            "https://a.com": 2,
+            "https://b.com": 3,
+        }
+        assert context.sources["https://known.com"].title == "Known"
+        assert context.searches[1].citations[0] is context.sources["https://a.com"]
+        assert result.count("[2] https://a.com") == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_query_does_not_break_batch(self):
+        """Test that a failed query is reported and not counted as a
+        search."""
+        service = FakeSearchService({"a": ["https://a.com"], "b": RuntimeError("API error")})
+        context = AgentContext()
+
+        result = await _run(BatchWebSearchTool(reasoning="Test", queries=["a", "b"]), context, service)
+
+        assert "Search failed: API error" in result
+        assert context.searches_used == 1
+        assert list(context.sources) == ["https://a.com"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_query_cancels_batch(self):
+        """Test that a cancelled search is re-raised instead of being
+        merged as sources."""
+        service = FakeSearchService({"a": ["https://a.com"], "b": asyncio.CancelledError()})
+        context = AgentContext()
+
+        with pytest.raises(asyncio.CancelledError):
+            await _run(BatchWebSearchTool(reasoning="Test", queries=["a", "b"]), context, service)
+
+    @pytest.mark.asyncio
+    async def test_queries_clamped_to_remaining_search_budget(self):
+        """Test that queries beyond max_searches are skipped and reported."""
+        service = FakeSearchService({"a": ["https://a.com"], "b": ["https://b.com"], "c": ["https://c.com"]})
+        context = AgentContext(searches_used=3)
+
+        result = await _run(BatchWebSearchTool(reasoning="Test", queries=["a", "b", "c"]), context, service)
+
+        assert context.searches_used == 4
+        assert [s.url for s in context.sources.values()] == ["https://a.com"]
+        assert "2 queries not executed: ['b', 'c']" in result
@@ -0,0 +1,167 @@
+"""Tests for compaction of old tool results.
+
+This module contains tests for extractive summaries and for
+ContextCompactor used by BaseAgent._prepare_context.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from openai import AsyncOpenAI
+
+from sgr_agent_core import ExecutionConfig
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.services.context_compactor import SUMMARY_HEADER, extractive_summary
+from sgr_agent_core.services.token_counter import EstimateTokenizer
+from tests.conftest import create_test_agent
+
+SEARCH_RESULT = "\n".join(
+    [
+        "Search Query: python release",
+        *[f"filler line number {i} without anything useful in it" for i in range(50)],
+        "[1] Python 3.13 - https://python.org",
+    ]
+)
+
+
+def _agent(client: Mock | None = None, **execution) -> SGRAgent:
+    execution = {
+        "compaction_enabled": True,
+        "compaction_threshold_tokens": 500,
+        "compaction_keep_last": 2,
+        **execution,
+    }
+    return create_test_agent(
+        SGRAgent, openai_client=client or Mock(spec=AsyncOpenAI), execution_config=ExecutionConfig(**execution)
+    )
+
+
+def _conversation(steps: int) -> list[dict]:
+    conversation = []
+    for step in range(1, steps + 1):
+        conversation.append({"role": "assistant", "content": f"Step {step}"})
+        conversation.append({"role": "tool", "content": f"{SEARCH_RESULT}\nstep {step}", "tool_call_id": f"{step}"})
+    return conversation
+
+
+class TestExtractiveSummary:
+    """Tests for the deterministic summarizer."""
+
+    def test_keeps_title_and_source_lines_in_order(self):
+        summary = extractive_summary(SEARCH_RESULT, 30, EstimateTokenizer())
+
+        lines = summary.splitlines()
+        assert lines[0] == "Search Query: python release"
+        assert lines[-1] == "[1] Python 3.13 - https://python.org"
+        assert EstimateTokenizer().count(summary) <= 30
+
+    def test_long_single_line_truncated(self):
+        summary = extractive_summary("word " * 100, 10, EstimateTokenizer())
+
+        assert EstimateTokenizer().count(summary) == 10
+
+
+class TestContextCompactor:
+    """Tests for compaction of agent prompts."""
+
+    @pytest.mark.asyncio
+    async def test_short_prompt_not_compacted(self):
+        agent = _agent(compaction_threshold_tokens=100_000)
+        agent.conversation = _conversation(3)
+
+        messages = await agent._prepare_context()
+
+        assert messages[-len(agent.conversation) :] == agent.conversation
+        assert agent._context.compaction_summaries == 0
+
+    @pytest.mark.asyncio
+    async def test_old_tool_results_summarized_last_messages_verbatim(self):
+        agent = _agent()
+        agent.conversation = _conversation(3)
+
+        messages = await agent._prepare_context()
+
+        tool_messages = [m for m in messages if m["role"] == "tool"]
+        assert all(m["content"].startswith(SUMMARY_HEADER) for m in tool_messages[:2])
+        assert tool_messages[2] == agent.conversation[-1]
+        assert [m["tool_call_id"] for m in tool_messages] == ["1", "2", "3"]
+        assert agent.conversation[1]["content"].startswith("Search Query")
+        assert agent._context.compaction_saved_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_summaries_computed_once(self):
+        """Test that summaries are reused between steps so the compacted
+        prompt stays stable."""
+        agent = _agent()
+        agent.conversation = _conversation(3)
+        first = await agent._prepare_context()
+        agent.conversation += _conversation(4)[-2:]
+
+        second = await agent._prepare_context()
+
+        assert second[: len(first) - 2] == first[:-2]
+        # Tool results differ by step number only, so steps 1-3 are three summaries
+        assert agent._context.compaction_summaries == 3
+
+    @pytest.mark.asyncio
+    async def test_compacted_prompt_extended_incrementally(self):
+        """Test that once compaction is on, later steps extend the same
+        assembled prompt and match compacting the whole history."""
+        agent = _agent()
+        agent.conversation = _conversation(3)
+        first = await agent._prepare_context()
+        first_messages = list(first)
+        assembled = agent._assembled
+        agent.conversation += _conversation(5)[-4:]
+
+        second = await agent._prepare_context()
+
+        assert agent._assembled is assembled
+        assert list(first) == first_messages
+        fresh = _agent()
+        fresh.conversation = _conversation(5)
+        assert list(second) == list(await fresh._prepare_context())
+        assert agent._context.compaction_saved_tokens == fresh._context.compaction_saved_tokens
+
+    @pytest.mark.asyncio
+    async def test_rewritten_conversation_compacted_again(self):
+        agent = _agent()
+        agent.conversation = _conversation(4)
+        await agent._prepare_context()
+
+        agent.conversation[1] = {"role": "tool", "content": "short", "tool_call_id": "1"}
+        messages = await agent._prepare_context()
+
+        assert [m["content"] for m in messages if m["role"] == "tool"][0] == "short"
+
+    @pytest.mark.asyncio
+    async def test_llm_summarizer(self):
+        client = Mock(spec=AsyncOpenAI)
+        client.chat = Mock()
+        client.chat.completions = Mock()
+        client.chat.completions.create = AsyncMock(
+            return_value=Mock(choices=[Mock(message=Mock(content="Python 3.13 released [1]"))])
+        )
+        agent = _agent(client, compaction_summarizer="llm", compaction_model="small-model")
+        agent.conversation = _conversation(2)
+
+        messages = await agent._prepare_context()
+
+        summary = [m["content"] for m in messages if m["role"] == "tool"][0]
+        assert summary == f"{SUMMARY_HEADER}\nPython 3.13 released [1]"
+        assert client.chat.completions.create.call_args.kwargs["model"] == "small-model"
+        assert agent._context.llm_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_falls_back_to_extractive(self):
+        client = Mock(spec=AsyncOpenAI)
+        client.chat = Mock()
+        client.chat.completions = Mock()
+        client.chat.completions.create = AsyncMock(side_effect=RuntimeError("unavailable"))
+        agent = _agent(client, compaction_summarizer="llm")
+        agent.conversation = _conversation(2)
+
+        messages = await agent._prepare_context()
+
+        summary = [m["content"] for m in messages if m["role"] == "tool"][0]
+        assert summary.startswith(f"{SUMMARY_HEADER}\nSearch Query: python release")
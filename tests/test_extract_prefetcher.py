@@ -0,0 +1,164 @@
+"""Tests for ExtractPrefetcher.
+
+This module contains tests for speculative extraction of search results:
+starting prefetches after searches, reuse by ExtractPageContentTool,
+concurrency limits, cancellation and used/wasted counters.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentConfig, SearchConfig
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentContext, SourceData
+from sgr_agent_core.services import ExtractPrefetcher
+from sgr_agent_core.tools import ExtractPageContentTool, WebSearchTool
+from tests.conftest import create_test_agent
+
+
+class FakeExtractService:
+    """Extract service that tracks concurrent extractions."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.extracted = []
+        self.running = 0
+        self.max_running = 0
+
+    async def extract(self, urls: list[str]) -> list[SourceData]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        self.extracted.extend(urls)
+        return [SourceData(number=0, url=url, full_content=f"Content of {url}", char_count=20) for url in urls]
+
+    async def load_content(self, source: SourceData) -> str:
+        return source.full_content
+
+
+def _search_config(**kwargs) -> SearchConfig:
+    return SearchConfig(tavily_api_key="key", prefetch_enabled=True, **kwargs)
+
+
+def _prefetcher(context: AgentContext, service: FakeExtractService, **kwargs) -> ExtractPrefetcher:
+    with patch("sgr_agent_core.services.extract_prefetcher.TavilySearchService", return_value=service):
+        return ExtractPrefetcher.get(context, _search_config(**kwargs))
+
+
+class TestExtractPrefetcher:
+    """Tests for prefetch bookkeeping."""
+
+    def test_disabled_by_default(self):
+        """Test that no prefetcher is created unless enabled."""
+        context = AgentContext()
+
+        assert ExtractPrefetcher.get(context, SearchConfig()) is None
+        assert ExtractPrefetcher.get(context, None) is None
+        assert context.prefetcher is None
+
+    @pytest.mark.asyncio
+    async def test_prefetch_top_k_with_concurrency_limit(self):
+        """Test that only top K new URLs are prefetched with limited
+        concurrency."""
+        context = AgentContext()
+        service = FakeExtractService()
+        prefetcher = _prefetcher(context, service, prefetch_top_k=3, prefetch_max_concurrent=2)
+
+        prefetcher.prefetch(["https://a.com", "https://b.com", "https://c.com", "https://d.com"])
+        prefetcher.prefetch(["https://a.com"])
+        taken = await prefetcher.take(["https://a.com", "https://b.com", "https://c.com"])
+
+        assert list(taken) == ["https://a.com", "https://b.com", "https://c.com"]
+        assert service.max_running == 2
+        assert (context.prefetch_started, context.prefetch_used, context.prefetch_wasted) == (3, 3, 0)
+
+    @pytest.mark.asyncio
+    async def test_peek_leaves_prefetch_to_take(self):
+        """Test that a speculative peek neither takes nor counts prefetches,
+        and cancelling it keeps the prefetch running."""
+        context = AgentContext()
+        service = FakeExtractService(delay=0.02)
+        prefetcher = _prefetcher(context, service)
+        prefetcher.prefetch(["https://a.com"])
+
+        cancelled_peek = asyncio.create_task(prefetcher.peek(["https://a.com"]))
+        await asyncio.sleep(0)
+        cancelled_peek.cancel()
+        peeked = await prefetcher.peek(["https://a.com", "https://b.com"])
+
+        assert list(peeked) == ["https://a.com"]
+        assert (context.prefetch_used, context.prefetch_wasted) == (0, 0)
+        assert list(await prefetcher.take(["https://a.com"])) == ["https://a.com"]
+        assert context.prefetch_used == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_counts_wasted(self):
+        """Test that untaken prefetches are cancelled and counted as
+        wasted."""
+        context = AgentContext()
+        service = FakeExtractService(delay=10)
+        prefetcher = _prefetcher(context, service)
+
+        prefetcher.prefetch(["https://a.com", "https://b.com"])
+        tasks = list(prefetcher._pending.values())
+        prefetcher.cancel()
+        await asyncio.sleep(0)
+
+        assert all(task.cancelled() for task in tasks)
+        assert context.prefetch_wasted == 2
+        assert await prefetcher.take(["https://a.com"]) == {}
+
+
+class TestPrefetchInTools:
+    """Tests for prefetch usage by search and extract tools."""
+
+    @pytest.mark.asyncio
+    async def test_extract_reuses_search_prefetch(self):
+        """Test that extraction awaits prefetched pages and fetches only the
+        rest."""
+        context = AgentContext()
+        config = AgentConfig(search=_search_config(prefetch_top_k=2))
+        prefetch_service = FakeExtractService()
+        search_service = Mock(
+            search=AsyncMock(
+                return_value=[SourceData(number=0, url=f"https://{name}.com") for name in ("a", "b", "c")]
+            ),
+            cache_hits=0,
+            cache_misses=0,
+        )
+        search_service_cls = Mock(
+            return_value=search_service, rearrange_sources=Mock(side_effect=lambda sources, starting_number: sources)
+        )
+        tool_service = FakeExtractService()
+
+        with (
+            patch("sgr_agent_core.services.extract_prefetcher.TavilySearchService", return_value=prefetch_service),
+            patch("sgr_agent_core.tools.web_search_tool.TavilySearchService", search_service_cls),
+            patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService", return_value=tool_service),
+        ):
+            await WebSearchTool(reasoning="Test", query="query")(context, config)
+            result = await ExtractPageContentTool(reasoning="Test", urls=["https://a.com", "https://c.com"])(
+                context, config
+            )
+
+        assert prefetch_service.extracted == ["https://a.com", "https://b.com"]
+        assert tool_service.extracted == ["https://c.com"]
+        assert "Content of https://a.com" in result
+        assert (context.prefetch_started, context.prefetch_used) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_agent_finish_cancels_prefetches(self):
+        """Test that finishing an agent cancels pending prefetches."""
+        agent = create_test_agent(SGRAgent)
+        prefetcher = Mock()
+        agent._context.prefetcher = prefetcher
+        agent._execution_step = AsyncMock(side_effect=RuntimeError("Stop"))
+
+        with patch.object(agent, "_save_agent_log"):
+            await agent.execute()
+
+        prefetcher.cancel.assert_called_once()
+        assert "prefetcher" not in agent.to_snapshot().context
@@ -0,0 +1,63 @@
+"""Tests for IncrementalJSONParser.
+
+This module contains tests for detecting closed JSON values in a
+document streamed in arbitrary chunks.
+"""
+
+import json
+
+from sgr_agent_core.incremental_json import IncrementalJSONParser
+
+DOCUMENT = json.dumps(
+    {
+        "reasoning": 'Quotes " and braces {} in "strings" ]',
+        "steps": [1, {"nested": [2, 3]}],
+        "function": {"tool_name_discriminator": "websearchtool", "query": "a}b\\\\"},
+    }
+)
+
+
+def _feed_by(size: int) -> list:
+    parser = IncrementalJSONParser()
+    completed = []
+    for i in range(0, len(DOCUMENT), size):
+        completed += parser.feed(DOCUMENT[i : i + size])
+    return completed
+
+
+class TestIncrementalJSONParser:
+    """Tests for closed values detection."""
+
+    def test_paths_and_values(self):
+        """Test that closed containers are reported with their path and exact
+        JSON."""
+        completed = dict(_feed_by(1))
+
+        assert list(completed) == [("steps", 1, "nested"), ("steps", 1), ("steps",), ("function",), ()]
+        assert json.loads(completed[("function",)]) == json.loads(DOCUMENT)["function"]
+        assert completed[()] == DOCUMENT
+
+    def test_chunking_does_not_matter(self):
+        """Test that the result is the same for any chunk size."""
+        expected = _feed_by(1)
+
+        for size in (2, 7, 64, len(DOCUMENT)):
+            assert _feed_by(size) == expected
+
+    def test_value_reported_once_before_document_end(self):
+        """Test that a nested object is reported as soon as it is closed."""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"function": {"query": "x"}') == [(("function",), '{"query": "x"}')]
+        assert parser.feed(', "tail": 1') == []
+        assert parser.feed("}") == [((), '{"function": {"query": "x"}, "tail": 1}')]
+
+    def test_documents_fed_one_after_another(self):
+        """Test that offsets stay valid after a document is closed and its
+        chunks are released."""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"a": 1}') == [((), '{"a": 1}')]
+        assert parser.feed("") == []
+        assert parser.feed('{"b": [') == []
+        assert parser.feed("2]}") == [(("b",), "[2]"), ((), '{"b": [2]}')]
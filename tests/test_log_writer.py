@@ -0,0 +1,143 @@
+"""Tests for the background agent log writer.
+
+This module contains tests for LogWriter and for incremental JSONL
+logging of agents.
+"""
+
+import gzip
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from sgr_agent_core import ExecutionConfig
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.models import AgentContext
+from sgr_agent_core.services.log_writer import LogWriter, resolve_compression
+from sgr_agent_core.tools import CreateReportTool, ReasoningTool
+from tests.conftest import create_test_agent
+
+
+@pytest.fixture
+def writer():
+    writer = LogWriter()
+    yield writer
+    writer.close()
+
+
+def _read_jsonl(path) -> list[dict]:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLogWriter:
+    """Tests for LogWriter."""
+
+    def test_records_appended_in_order(self, writer, tmp_path):
+        path = str(tmp_path / "log.jsonl")
+
+        for i in range(100):
+            writer.write(path, {"step": i, "payload": "данные"})
+        writer.flush()
+
+        assert [record["step"] for record in _read_jsonl(path)] == list(range(100))
+
+    def test_gzip_log_readable_after_close(self, writer, tmp_path):
+        path = str(tmp_path / "log.jsonl.gz")
+
+        writer.write(path, {"step": 1}, "gzip")
+        writer.write(path, {"step": 2}, "gzip")
+        writer.close_file(path)
+        writer.flush()
+
+        assert _read_jsonl(path) == [{"step": 1}, {"step": 2}]
+
+    def test_close_writes_pending_records(self, tmp_path):
+        writer = LogWriter()
+        path = str(tmp_path / "log.jsonl")
+
+        writer.write(path, {"value": object()})
+        writer.close()
+
+        assert len(_read_jsonl(path)) == 1
+
+    def test_write_error_does_not_stop_writer(self, writer, tmp_path):
+        writer.write(str(tmp_path / "missing" / "log.jsonl"), {"step": 1})
+        path = str(tmp_path / "log.jsonl")
+        writer.write(path, {"step": 2})
+        writer.flush()
+
+        assert _read_jsonl(path) == [{"step": 2}]
+
+    def test_zstd_falls_back_to_gzip_without_zstandard(self):
+        with patch("sgr_agent_core.services.log_writer.importlib.util.find_spec", return_value=None):
+            assert resolve_compression("zstd") == "gzip"
+        assert resolve_compression("none") == "none"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_shared_writer(self, tmp_path):
+        path = str(tmp_path / "log.jsonl")
+        LogWriter.get().write(path, {"step": 1})
+
+        await LogWriter.shutdown()
+
+        assert LogWriter._instance is None
+        assert _read_jsonl(path) == [{"step": 1}]
+
+
+class TestAgentLog:
+    """Tests for incremental agent logging."""
+
+    def test_steps_written_as_they_happen(self, tmp_path):
+        """Test that step records are in the log file before the agent
+        finishes."""
+        agent = create_test_agent(BaseAgent, execution_config=ExecutionConfig(log_compression="gzip"))
+        mock_config = Mock()
+        mock_config.execution.logs_dir = str(tmp_path)
+        reasoning = ReasoningTool(
+            reasoning_steps=["a", "b"],
+            current_situation="s",
+            plan_status="p",
+            enough_data=False,
+            remaining_steps=["c"],
+            task_completed=False,
+        )
+
+        with patch("sgr_agent_core.agent_config.GlobalConfig", return_value=mock_config):
+            agent._log_reasoning(reasoning)
+            LogWriter.get().flush()
+            (log_file,) = os.listdir(tmp_path)
+            with gzip.open(tmp_path / log_file, "rb") as f:
+                partial = f.read1()
+            agent._save_agent_log()
+        LogWriter.get().flush()
+
+        assert log_file.endswith("-log.jsonl.gz")
+        assert b'"step_type": "reasoning"' in partial
+        records = _read_jsonl(tmp_path / log_file)
+        assert [record["step_type"] for record in records] == ["agent_start", "reasoning", "agent_finish"]
+        assert records[0]["id"] == agent.id
+        assert "api_key" not in records[0]["model_config"]
+
+
+class TestCreateReportTool:
+    """Tests for report writing off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_report_written(self, tmp_path):
+        tool = CreateReportTool(
+            reasoning="done",
+            title="Report",
+            user_request_language_reference="test",
+            content="Text [1]",
+            confidence="high",
+        )
+        config = Mock()
+        config.execution.reports_dir = str(tmp_path / "reports")
+
+        result = json.loads(await tool(AgentContext(), config))
+
+        with open(result["filepath"], encoding="utf-8") as f:
+            assert f.read().startswith("# Report")
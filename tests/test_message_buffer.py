@@ -0,0 +1,151 @@
+"""Tests for incremental context assembly.
+
+This module contains tests for MessageBuffer, MessageView and their use
+in BaseAgent._prepare_context.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from sgr_agent_core import ExecutionConfig
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.message_buffer import MessageBuffer, MessageView
+from sgr_agent_core.services.prompt_loader import PromptLoader
+from tests.conftest import create_test_agent
+
+
+def _messages(count: int, start: int = 0) -> list[dict]:
+    return [{"role": "user" if i % 2 else "assistant", "content": f"message {i}"} for i in range(start, start + count)]
+
+
+class TestMessageBuffer:
+    """Tests for the append-only conversation buffer."""
+
+    def test_appends_keep_revision(self):
+        buffer = MessageBuffer(_messages(2))
+
+        buffer.append({"role": "tool", "content": "result"})
+        buffer.extend(_messages(2))
+        buffer += _messages(1)
+
+        assert len(buffer) == 6
+        assert buffer.revision == 0
+
+    @pytest.mark.parametrize(
+        "rewrite",
+        [
+            lambda b: b.__setitem__(0, {"role": "user", "content": "changed"}),
+            lambda b: b.__delitem__(slice(0, 1)),
+            lambda b: b.insert(0, {"role": "system", "content": "note"}),
+            lambda b: b.pop(),
+            lambda b: b.clear(),
+            lambda b: b.reverse(),
+        ],
+    )
+    def test_rewrites_bump_revision(self, rewrite):
+        buffer = MessageBuffer(_messages(3))
+
+        rewrite(buffer)
+
+        assert buffer.revision == 1
+
+    def test_window_helpers(self):
+        buffer = MessageBuffer(_messages(3))
+        buffer.append({"role": "system", "content": "note"})
+        buffer.extend(_messages(2, start=3))
+
+        assert buffer.system_messages() == [{"role": "system", "content": "note"}]
+        assert [m["content"] for m in buffer.last_non_system(3)] == ["message 2", "message 3", "message 4"]
+        del buffer[0]
+        assert buffer.system_messages() == [{"role": "system", "content": "note"}]
+
+    def test_view_is_fixed_length(self):
+        messages = _messages(3)
+        view = MessageView(messages, 2)
+        messages.extend(_messages(2))
+
+        assert len(view) == 2
+        assert view == messages[:2]
+        assert view[-1] == messages[1]
+        assert view[1:] == [messages[1]]
+        assert list(view) + [messages[2]] == messages[:3]
+        with pytest.raises(IndexError):
+            view[2]
+
+    def test_view_with_tail(self):
+        messages = _messages(3)
+        tail = _messages(2)
+        view = MessageView(messages, 2, tail)
+        messages.append({"role": "user", "content": "later"})
+
+        assert len(view) == 4
+        assert list(view) == messages[:2] + tail
+        assert view[-1] == tail[1]
+        assert view[1:3] == [messages[1], tail[0]]
+        assert view[:2] == messages[:2]
+
+
+class TestIncrementalContext:
+    """Tests for BaseAgent context assembly."""
+
+    def test_conversation_assignment_wraps_list(self):
+        agent = create_test_agent(BaseAgent)
+
+        agent.conversation = _messages(2)
+
+        assert isinstance(agent.conversation, MessageBuffer)
+
+    @pytest.mark.asyncio
+    async def test_prompt_extended_with_new_messages_only(self):
+        """Test that steps extend one assembled prompt and earlier results
+        stay unchanged."""
+        agent = create_test_agent(BaseAgent)
+        agent.conversation.extend(_messages(2))
+
+        first = await agent._prepare_context()
+        assembled = agent._assembled
+        agent.conversation.append({"role": "tool", "content": "result"})
+        second = await agent._prepare_context()
+
+        assert agent._assembled is assembled
+        assert len(second) == len(first) + 1
+        assert second[: len(first)] == first
+        assert second[-1] == {"role": "tool", "content": "result"}
+
+    @pytest.mark.asyncio
+    async def test_prompt_rebuilt_after_rewrite(self):
+        agent = create_test_agent(BaseAgent)
+        agent.conversation.extend(_messages(3))
+        await agent._prepare_context()
+
+        agent.conversation[1] = {"role": "user", "content": "edited"}
+        context = await agent._prepare_context()
+
+        assert list(context[-3:]) == list(agent.conversation)
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_rendered_once(self):
+        """Test that the system prompt is memoized even when the prefix is
+        re-rendered every step."""
+        agent = create_test_agent(BaseAgent, execution_config=ExecutionConfig(stable_prompt_prefix=False))
+
+        with patch.object(PromptLoader, "get_system_prompt", wraps=PromptLoader.get_system_prompt) as render:
+            await agent._prepare_context()
+            await agent._prepare_context()
+
+        render.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_context_window_matches_full_scan(self):
+        """Test that the buffer window equals filtering the full prompt."""
+        agent = create_test_agent(BaseAgent)
+        agent.conversation.extend(_messages(4))
+        agent.conversation.append({"role": "system", "content": "note"})
+        agent.conversation.extend(_messages(3, start=4))
+        messages = list(await agent._prepare_context())
+
+        for keep in (0, 2, 7, 9, 20):
+            non_system = [m for m in messages if m["role"] != "system"]
+            expected = [m for m in messages if m["role"] == "system"] + non_system[max(len(non_system) - keep, 0) :]
+            assert agent._context_window(keep) == expected
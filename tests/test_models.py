@@ -8,6 +8,7 @@ import asyncio
 from datetime import datetime
 
 import pytest
+from openai.types import CompletionUsage
 from pydantic import ValidationError
 
 from sgr_agent_core.models import (
@@ -15,6 +16,7 @@ from sgr_agent_core.models import (
     AgentStatesEnum,
     SearchResult,
     SourceData,
+    TokenUsage,
 )
 
 
@@ -311,3 +313,49 @@ class TestResearchContext:
         reasoning_data = {"step": 1, "action": "search"}
         context.current_step_reasoning = reasoning_data
         assert context.current_step_reasoning == reasoning_data
+
+
+class TestTokenUsage:
+    """Tests for TokenUsage and usage recording in AgentContext."""
+
+    def test_add_with_cached_tokens(self):
+        usage = TokenUsage()
+
+        usage.add(
+            CompletionUsage(
+                prompt_tokens=100,
+                completion_tokens=20,
+                total_tokens=120,
+                prompt_tokens_details={"cached_tokens": 64},
+            )
+        )
+        usage.add(CompletionUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15))
+
+        assert usage == TokenUsage(prompt_tokens=110, completion_tokens=25, total_tokens=135, cached_tokens=64)
+        assert usage.to_openai()["prompt_tokens_details"] == {"cached_tokens": 64}
+
+    def test_add_provider_cache_hit_tokens(self):
+        usage = TokenUsage()
+
+        usage.add(
+            CompletionUsage.model_validate(
+                {"prompt_tokens": 50, "completion_tokens": 5, "total_tokens": 55, "prompt_cache_hit_tokens": 32}
+            )
+        )
+
+        assert usage.cached_tokens == 32
+
+    def test_record_llm_call_per_step(self):
+        context = AgentContext()
+        context.iteration = 1
+        context.record_llm_call(CompletionUsage(prompt_tokens=10, completion_tokens=1, total_tokens=11))
+        context.record_llm_call(None)
+        context.iteration = 2
+        context.record_llm_call(CompletionUsage(prompt_tokens=20, completion_tokens=2, total_tokens=22))
+
+        assert context.llm_calls == 3
+        assert context.llm_calls_per_step == {1: 2, 2: 1}
+        assert context.usage.total_tokens == 33
+        assert {step: usage.total_tokens for step, usage in context.usage_per_step.items()} == {1: 11, 2: 22}
+        restored = AgentContext.model_validate(context.model_dump(mode="json", exclude={"clarification_received"}))
+        assert restored.usage_per_step[2].prompt_tokens == 20
@@ -0,0 +1,73 @@
+"""Tests for NextStepToolsBuilder.
+
+This module contains tests for building NextStepTools models and caching
+them per toolkit.
+"""
+
+import pytest
+
+from sgr_agent_core.next_step_tool import NextStepToolsBuilder, NextStepToolStub
+from sgr_agent_core.tools import ClarificationTool, FinalAnswerTool, WebSearchTool
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    NextStepToolsBuilder.cache_clear()
+    yield
+    NextStepToolsBuilder.cache_clear()
+
+
+class TestNextStepToolsBuilder:
+    """Tests for NextStepTools model building."""
+
+    def test_build_parses_selected_tool(self):
+        """Test that the built model validates the discriminated tool
+        union."""
+        model = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+
+        assert issubclass(model, NextStepToolStub)
+        function_schema = model.model_json_schema()["properties"]["function"]
+        assert len(function_schema["anyOf"]) == 2
+
+
+class TestNextStepToolsCache:
+    """Tests for NextStepTools models cache."""
+
+    def test_same_toolkit_reuses_model(self):
+        """Test that the same tools in any order produce the same model
+        class."""
+        first = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool, ClarificationTool])
+        second = NextStepToolsBuilder.build_NextStepTools([ClarificationTool, WebSearchTool, FinalAnswerTool])
+
+        assert first is second
+        assert NextStepToolsBuilder.cache_info() == {"hits": 1, "misses": 1, "size": 1, "max_size": 256}
+
+    def test_different_toolkits_get_different_models(self):
+        """Test that tool subsets are cached separately."""
+        full = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+        reduced = NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool])
+
+        assert full is not reduced
+        assert NextStepToolsBuilder.cache_info()["misses"] == 2
+
+    def test_schema_does_not_depend_on_tools_order(self):
+        """Test that union order is stable for the same toolkit."""
+        schema = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool]).model_json_schema()
+        NextStepToolsBuilder.cache_clear()
+        reordered = NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool, WebSearchTool]).model_json_schema()
+
+        assert schema == reordered
+
+    def test_cache_size_is_bounded(self, monkeypatch):
+        """Test that least recently used models are evicted over the size
+        limit."""
+        monkeypatch.setattr(NextStepToolsBuilder, "cache_size", 2)
+        web = NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool])
+        # Refresh the first entry so the second one is evicted
+        NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        NextStepToolsBuilder.build_NextStepTools([ClarificationTool])
+
+        assert NextStepToolsBuilder.cache_info()["size"] == 2
+        assert NextStepToolsBuilder.build_NextStepTools([WebSearchTool]) is web
+        assert frozenset([FinalAnswerTool]) not in NextStepToolsBuilder._cache
@@ -0,0 +1,125 @@
+"""Tests for PageContentCache.
+
+This module contains tests for the content-addressed extracted pages
+cache and lazy content loading in ExtractPageContentTool.
+"""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentConfig, HTTPClientConfig, SearchConfig
+from sgr_agent_core.models import AgentContext
+from sgr_agent_core.services.page_cache import PageContentCache
+from sgr_agent_core.services.tavily_search import TavilySearchService
+from sgr_agent_core.tools import ExtractPageContentTool
+
+
+@pytest.fixture
+def page_cache(tmp_path):
+    cache = PageContentCache(str(tmp_path / "pages"), ttl=60, grace=30)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def search_config(tmp_path):
+    yield SearchConfig(
+        tavily_api_key="key", extract_cache_enabled=True, extract_cache_dir=str(tmp_path / "extract"), content_limit=5
+    )
+    TavilySearchService._clients = {}
+    TavilySearchService._http_clients = []
+    for cache in TavilySearchService._page_caches.values():
+        cache.close()
+    TavilySearchService._page_caches = {}
+
+
+class TestPageContentCache:
+    """Tests for PageContentCache storage."""
+
+    @pytest.mark.asyncio
+    async def test_put_lookup_load(self, page_cache):
+        """Test that stored pages are found by URL and loaded by hash."""
+        content_hash, char_count = await page_cache.put("https://example.com", "Page content")
+
+        assert await page_cache.lookup("https://example.com") == (content_hash, char_count)
+        assert await page_cache.load(content_hash) == "Page content"
+        assert await page_cache.lookup("https://missing.com") is None
+
+    @pytest.mark.asyncio
+    async def test_identical_content_is_stored_once(self, page_cache, tmp_path):
+        """Test that the same content behind different URLs is
+        deduplicated."""
+        first, _ = await page_cache.put("https://example.com/a", "Same content")
+        second, _ = await page_cache.put("https://example.com/b", "Same content")
+
+        files = [name for _, _, names in os.walk(tmp_path / "pages" / "objects") for name in names]
+        assert first == second
+        assert len(files) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_pages_are_pruned(self, page_cache, tmp_path):
+        """Test that expired URLs are not returned and their content is
+        removed."""
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=100.0):
+            content_hash, _ = await page_cache.put("https://example.com", "Old content")
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=200.0):
+            assert await page_cache.lookup("https://example.com") is None
+            assert await page_cache.prune() == 1
+
+        assert await page_cache.load(content_hash) is None
+
+    @pytest.mark.asyncio
+    async def test_recently_loaded_content_survives_prune(self, page_cache):
+        """Test that content an agent still loads is kept for the grace
+        period after its URL expires."""
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=100.0):
+            content_hash, _ = await page_cache.put("https://example.com", "Old content")
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=150.0):
+            assert await page_cache.load(content_hash) == "Old content"
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=170.0):
+            assert await page_cache.prune() == 0
+        with patch("sgr_agent_core.services.page_cache.time.time", return_value=200.0):
+            assert await page_cache.prune() == 1
+
+
+class TestLazyExtractedContent:
+    """Tests for extraction through the page cache."""
+
+    @pytest.mark.asyncio
+    async def test_extract_uses_cache_and_keeps_only_hash(self, search_config):
+        """Test that cached pages are not re-downloaded and agents hold only
+        a handle."""
+        service = TavilySearchService(search_config, HTTPClientConfig())
+        response = {"results": [{"url": "https://example.com", "raw_content": "Full page content"}]}
+
+        with patch.object(service._client, "extract", AsyncMock(return_value=response)) as mock_extract:
+            first = await service.extract(["https://example.com"])
+            second = await TavilySearchService(search_config, HTTPClientConfig()).extract(["https://example.com"])
+
+        mock_extract.assert_awaited_once()
+        assert first[0].full_content == ""
+        assert second[0].content_hash == first[0].content_hash
+        assert second[0].char_count == len("Full page content")
+        assert await service.load_content(second[0]) == "Full page content"
+
+    @pytest.mark.asyncio
+    async def test_tool_loads_content_when_formatting(self, search_config):
+        """Test that ExtractPageContentTool formats content loaded from the
+        cache."""
+        service = TavilySearchService(search_config, HTTPClientConfig())
+        response = {"results": [{"url": "https://example.com", "raw_content": "Full page content"}]}
+        mock_extract = AsyncMock(return_value=response)
+        context = AgentContext()
+        tool = ExtractPageContentTool(reasoning="Test", urls=["https://example.com"])
+
+        with (
+            patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService", return_value=service),
+            patch.object(service._client, "extract", mock_extract),
+        ):
+            result = await tool(context, AgentConfig(search=search_config))
+
+        assert "Full " in result
+        assert "page content" not in result
+        assert context.sources["https://example.com"].full_content == ""
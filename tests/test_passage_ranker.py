@@ -0,0 +1,149 @@
+"""Tests for PassageRanker.
+
+This module contains tests for splitting pages into passages, BM25
+passage selection within a character budget and its use in
+ExtractPageContentTool.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import AgentConfig, SearchConfig
+from sgr_agent_core.models import AgentContext, SearchResult, SourceData
+from sgr_agent_core.services.passage_ranker import PassageRanker, split_passages
+from sgr_agent_core.tools import ExtractPageContentTool
+
+BOILERPLATE = "Home | About | Contact | Login | Subscribe to our newsletter for updates."
+PAGE = "\n\n".join(
+    [
+        BOILERPLATE,
+        "Weather forecast: sunny days are expected for the whole week in the region.",
+        "The Eiffel Tower was completed in 1889 and is 330 metres tall including antennas.",
+        "Cookies help us deliver our services. By using the site you agree to cookies.",
+        "Gustave Eiffel's company designed and built the tower for the 1889 World's Fair.",
+    ]
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    PassageRanker.cache_clear()
+    yield
+    PassageRanker.cache_clear()
+
+
+class TestSplitPassages:
+    """Tests for splitting content into passages."""
+
+    def test_offsets_point_to_passage_text(self):
+        """Test that passage offsets locate the passage text in the
+        content."""
+        passages = split_passages(PAGE, passage_size=100)
+
+        assert len(passages) == 5
+        for passage in passages:
+            assert PAGE[passage.start : passage.end] == passage.text
+
+    def test_long_paragraph_split_and_short_merged(self):
+        """Test that long paragraphs are cut at whitespace and short ones are
+        merged."""
+        content = "short one\n\nshort two\n\n" + " ".join(["word"] * 100)
+
+        passages = split_passages(content, passage_size=60)
+
+        assert passages[0].text == "short one\n\nshort two"
+        assert all(len(passage.text) <= 60 for passage in passages)
+        assert all(not passage.text.startswith(" ") for passage in passages)
+
+
+class TestPassageSelection:
+    """Tests for BM25 passage selection."""
+
+    def test_relevant_passages_within_budget_in_page_order(self):
+        """Test that the best matching passages are returned in page order
+        within the budget."""
+        passages = PassageRanker.select(PAGE, "When was the Eiffel tower built?", char_budget=170, passage_size=100)
+
+        assert [passage.text for passage in passages] == [
+            "The Eiffel Tower was completed in 1889 and is 330 metres tall including antennas.",
+            "Gustave Eiffel's company designed and built the tower for the 1889 World's Fair.",
+        ]
+        assert sum(len(passage.text) for passage in passages) <= 170
+
+    def test_no_matching_terms_falls_back_to_head(self):
+        """Test that without matching terms passages are taken from the page
+        head."""
+        passages = PassageRanker.select(PAGE, "quantum", char_budget=80, passage_size=100)
+
+        assert [passage.text for passage in passages] == [BOILERPLATE]
+
+    def test_index_cached_by_content_hash(self):
+        """Test that the page index is built once and reused for other
+        queries."""
+        first = PassageRanker.index(PAGE, content_hash="hash", passage_size=100)
+
+        assert PassageRanker.index(PAGE, content_hash="hash", passage_size=100) is first
+        assert PassageRanker.index(PAGE, passage_size=100) is not first
+
+
+class TestExtractToolPassages:
+    """Tests for passage selection in ExtractPageContentTool."""
+
+    @pytest.mark.asyncio
+    async def test_tool_returns_relevant_passages(self):
+        """Test that a long page is reduced to passages relevant to the search
+        query."""
+        url = "https://example.com/tower"
+        context = AgentContext()
+        context.searches.append(SearchResult(query="Eiffel tower height", citations=[SourceData(number=1, url=url)]))
+        service = Mock(
+            extract=AsyncMock(return_value=[SourceData(number=0, url=url, full_content=PAGE, char_count=len(PAGE))]),
+            load_content=AsyncMock(return_value=PAGE),
+        )
+        config = AgentConfig(search=SearchConfig(content_limit=100, passage_size=100, rank_passages=True))
+        tool = ExtractPageContentTool(reasoning="Need exact numbers", urls=[url])
+
+        with patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService", return_value=service):
+            result = await tool(context, config)
+
+        passage = "The Eiffel Tower was completed in 1889 and is 330 metres tall including antennas."
+        start = PAGE.index(passage)
+        assert f"[chars {start}-{start + len(passage)}]\n{passage}" in result
+        assert "Subscribe" not in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content_limit", [60, 100, 170, 300])
+    async def test_rendered_passages_fit_content_limit(self, content_limit):
+        """Test that passage headers and separators are counted in
+        content_limit."""
+        url = "https://example.com/tower"
+        service = Mock(
+            extract=AsyncMock(return_value=[SourceData(number=0, url=url, full_content=PAGE, char_count=len(PAGE))]),
+            load_content=AsyncMock(return_value=PAGE),
+        )
+        config = AgentConfig(search=SearchConfig(content_limit=content_limit, passage_size=100, rank_passages=True))
+        tool = ExtractPageContentTool(reasoning="Eiffel tower height and construction", urls=[url])
+
+        with patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService", return_value=service):
+            result = await tool(AgentContext(), config)
+
+        output = result.split("**Relevant Passages:**\n", 1)[1].split("\n\n*[Selected", 1)[0]
+        assert "[chars " in output
+        assert len(output) <= content_limit
+
+    @pytest.mark.asyncio
+    async def test_page_head_used_by_default(self):
+        """Test that ranking is opt-in and the page head is sent by
+        default."""
+        url = "https://example.com/tower"
+        service = Mock(
+            extract=AsyncMock(return_value=[SourceData(number=0, url=url, full_content=PAGE, char_count=len(PAGE))]),
+            load_content=AsyncMock(return_value=PAGE),
+        )
+        tool = ExtractPageContentTool(reasoning="Eiffel tower height", urls=[url])
+
+        with patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService", return_value=service):
+            result = await tool(AgentContext(), AgentConfig(search=SearchConfig(content_limit=100)))
+
+        assert f"**Full Content:**\n{PAGE[:100]}\n\n" in result
@@ -191,6 +191,31 @@ class TestPromptLoader:
             current_year = datetime.now().year
             assert str(current_year) in result
 
+    def test_get_initial_user_request_explicit_datetime(self):
+        """Test that the request date can be fixed and is not evaluated at
+        import time."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dummy_file = os.path.join(tmpdir, "dummy.txt")
+            with open(dummy_file, "w", encoding="utf-8") as f:
+                f.write("dummy")
+
+            prompts_config = PromptsConfig(
+                initial_user_request_str="Current Date: {current_date}",
+                system_prompt_file=dummy_file,
+                clarification_response_file=dummy_file,
+                initial_user_request_file=dummy_file,
+            )
+
+            fixed = PromptLoader.get_initial_user_request(
+                [], prompts_config, current_datetime=datetime(2024, 1, 2, 3, 4, 5)
+            )
+            assert fixed == "Current Date: 2024-01-02 03:04:05"
+
+            with patch("sgr_agent_core.services.prompt_loader.datetime") as mock_datetime:
+                mock_datetime.now.return_value = datetime(2030, 6, 7, 8, 9, 10)
+                current = PromptLoader.get_initial_user_request([], prompts_config)
+            assert current == "Current Date: 2030-06-07 08:09:10"
+
     def test_get_initial_user_request_date_format(self):
         """Test that get_initial_user_request includes properly formatted
         date."""
@@ -0,0 +1,102 @@
+"""Tests for SearchCache.
+
+This module contains tests for the in-memory and SQLite tiers of the
+search results cache, TTL expiration and key normalization.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from sgr_agent_core.models import SourceData
+from sgr_agent_core.services.search_cache import SearchCache
+
+
+def _sources():
+    return [SourceData(number=1, url="https://example.com", title="Example", snippet="Snippet")]
+
+
+class TestSearchCacheKey:
+    """Tests for cache key normalization."""
+
+    def test_key_normalizes_query(self):
+        """Test that case and whitespace differences map to the same key."""
+        assert SearchCache.make_key("  Quantum\tComputing ", 5, False) == SearchCache.make_key(
+            "quantum computing", 5, False
+        )
+
+    def test_key_includes_parameters(self):
+        """Test that search parameters are part of the key."""
+        key = SearchCache.make_key("query", 5, False)
+
+        assert key != SearchCache.make_key("query", 10, False)
+        assert key != SearchCache.make_key("query", 5, True)
+
+
+class TestSearchCacheMemory:
+    """Tests for the in-memory tier."""
+
+    @pytest.mark.asyncio
+    async def test_set_get_returns_copies(self):
+        """Test that each hit returns new SourceData objects."""
+        cache = SearchCache(ttl=60, max_entries=10)
+        await cache.set("key", _sources())
+
+        first = await cache.get("key")
+        first[0].number = 99
+        second = await cache.get("key")
+
+        assert second[0].number == 1
+        assert await cache.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiration(self):
+        """Test that expired entries are not returned."""
+        cache = SearchCache(ttl=10, max_entries=10)
+        with patch("sgr_agent_core.services.search_cache.time.time", return_value=100.0):
+            await cache.set("key", _sources())
+        with patch("sgr_agent_core.services.search_cache.time.time", return_value=109.0):
+            assert await cache.get("key") is not None
+        with patch("sgr_agent_core.services.search_cache.time.time", return_value=111.0):
+            assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_lru_limit(self):
+        """Test that the least recently used entry is evicted from memory."""
+        cache = SearchCache(ttl=60, max_entries=2)
+        await cache.set("first", _sources())
+        await cache.set("second", _sources())
+        await cache.get("first")
+        await cache.set("third", _sources())
+
+        assert list(cache._memory) == ["first", "third"]
+
+
+class TestSearchCacheDisk:
+    """Tests for the SQLite tier."""
+
+    @pytest.mark.asyncio
+    async def test_entries_survive_restart(self, tmp_path):
+        """Test that a new cache instance reads entries from disk."""
+        path = str(tmp_path / "cache" / "search.sqlite3")
+        cache = SearchCache(ttl=60, max_entries=10, path=path)
+        await cache.set("key", _sources())
+        cache.close()
+
+        reopened = SearchCache(ttl=60, max_entries=10, path=path)
+        sources = await reopened.get("key")
+
+        assert sources[0].url == "https://example.com"
+        assert "key" in reopened._memory
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_clear(self, tmp_path):
+        """Test that clear empties both tiers."""
+        cache = SearchCache(ttl=60, max_entries=10, path=str(tmp_path / "search.sqlite3"))
+        await cache.set("key", _sources())
+
+        cache.clear()
+
+        assert await cache.get("key") is None
+        cache.close()
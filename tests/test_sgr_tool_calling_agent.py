@@ -0,0 +1,196 @@
+"""Tests for SGRToolCallingAgent.
+
+This module contains tests for the schema-constrained step phases: the
+multi-call path, the fused single-call mode with its fallback, and LLM
+call accounting per step.
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+
+from sgr_agent_core import ExecutionConfig
+from sgr_agent_core.agents import SGRToolCallingAgent
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.services.log_writer import LogWriter
+from sgr_agent_core.tools import ClarificationTool, FinalAnswerTool
+from tests.conftest import create_test_agent
+
+REASONING = {
+    "reasoning_steps": ["Analyze task", "Answer"],
+    "current_situation": "Task is simple",
+    "plan_status": "Ready to answer",
+    "enough_data": True,
+    "remaining_steps": ["Finalize"],
+    "task_completed": True,
+}
+
+FINAL_ANSWER = {
+    "reasoning": "Answer is known",
+    "completed_steps": ["Answered"],
+    "answer": "42",
+    "status": "completed",
+}
+
+
+def _client(*contents: str, usage: CompletionUsage | None = None) -> Mock:
+    """Create an OpenAI client mock returning the given message contents in
+    order."""
+    client = Mock(spec=AsyncOpenAI)
+    completions = [Mock(choices=[Mock(message=Mock(content=content))], usage=usage) for content in contents]
+    client.chat = Mock()
+    client.chat.completions = Mock()
+    client.chat.completions.create = AsyncMock(side_effect=completions)
+    return client
+
+
+def _agent(client: Mock, fused_step: bool) -> SGRToolCallingAgent:
+    agent = create_test_agent(
+        SGRToolCallingAgent,
+        openai_client=client,
+        execution_config=ExecutionConfig(fused_step=fused_step),
+        toolkit=[FinalAnswerTool, ClarificationTool],
+    )
+    agent._context.iteration = 1
+    return agent
+
+
+async def _run_step(agent: SGRToolCallingAgent):
+    reasoning = await agent._reasoning_phase()
+    return reasoning, await agent._select_action_phase(reasoning)
+
+
+class TestMultiCallStep:
+    """Tests for the default multi-call step."""
+
+    @pytest.mark.asyncio
+    async def test_three_calls_per_step(self):
+        """Test that reasoning, selection and args are separate calls counted
+        for the step."""
+        client = _client(
+            json.dumps(REASONING),
+            json.dumps({"tool_name": "finalanswertool", "tool_args": FINAL_ANSWER}),
+            json.dumps(FINAL_ANSWER),
+        )
+        agent = _agent(client, fused_step=False)
+
+        reasoning, tool = await _run_step(agent)
+
+        assert reasoning.task_completed is True
+        assert isinstance(tool, FinalAnswerTool)
+        assert client.chat.completions.create.await_count == 3
+        assert agent._context.llm_calls == 3
+        assert agent._context.llm_calls_per_step == {1: 3}
+
+
+class TestFusedStep:
+    """Tests for the fused single-call step."""
+
+    @pytest.mark.asyncio
+    async def test_single_call_per_step(self):
+        """Test that reasoning and typed tool args come from one call with the
+        combined schema."""
+        fused = {**REASONING, "function": {"tool_name_discriminator": "finalanswertool", **FINAL_ANSWER}}
+        client = _client(json.dumps(fused))
+        agent = _agent(client, fused_step=True)
+
+        reasoning, tool = await _run_step(agent)
+
+        assert client.chat.completions.create.await_count == 1
+        assert agent._context.llm_calls_per_step == {1: 1}
+        assert agent._context.fused_step_fallbacks == 0
+        assert reasoning.remaining_steps == ["Finalize"]
+        assert isinstance(tool, FinalAnswerTool)
+        assert tool.answer == "42"
+
+        schema = client.chat.completions.create.await_args.kwargs["extra_body"]["response_format"]
+        assert schema["name"] == "NextStepTools"
+        assert len(schema["schema"]["properties"]["function"]["anyOf"]) == 2
+        assert [m["tool_calls"][0]["id"] for m in agent.conversation if m.get("tool_calls")] == [
+            "1-reasoning",
+            "1-action",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_output_falls_back(self):
+        """Test that output failing strict validation falls back to separate
+        calls."""
+        invalid = {**REASONING, "function": {"tool_name_discriminator": "finalanswertool", "answer": "42"}}
+        client = _client(
+            json.dumps(invalid),
+            json.dumps(REASONING),
+            json.dumps({"tool_name": "finalanswertool"}),
+            json.dumps(FINAL_ANSWER),
+        )
+        agent = _agent(client, fused_step=True)
+
+        _, tool = await _run_step(agent)
+
+        assert isinstance(tool, FinalAnswerTool)
+        assert agent._context.fused_step_fallbacks == 1
+        assert agent._context.llm_calls_per_step == {1: 4}
+
+    @pytest.mark.asyncio
+    async def test_execute_logs_calls_per_step(self):
+        """Test that a full fused execution completes and logs LLM calls with
+        the tool execution."""
+        fused = {**REASONING, "function": {"tool_name_discriminator": "finalanswertool", **FINAL_ANSWER}}
+        agent = create_test_agent(
+            SGRToolCallingAgent,
+            openai_client=_client(json.dumps(fused)),
+            execution_config=ExecutionConfig(fused_step=True),
+            toolkit=[FinalAnswerTool],
+        )
+
+        with patch.object(agent, "_save_agent_log"):
+            result = await agent.execute()
+
+        assert result == "42"
+        assert agent._context.state == AgentStatesEnum.COMPLETED
+        assert agent.log[-1]["llm_calls"] == 1
+
+
+class TestUsageAccounting:
+    """Tests for token usage of the multi-call step."""
+
+    @pytest.mark.asyncio
+    async def test_usage_summed_and_reported(self, tmp_path):
+        """Test that usage of every call is summed per step and reported in
+        the final chunk, the state and the log."""
+        usage = CompletionUsage(
+            prompt_tokens=100, completion_tokens=10, total_tokens=110, prompt_tokens_details={"cached_tokens": 80}
+        )
+        client = _client(
+            json.dumps(REASONING),
+            json.dumps({"tool_name": "finalanswertool", "tool_args": FINAL_ANSWER}),
+            json.dumps(FINAL_ANSWER),
+            usage=usage,
+        )
+        agent = create_test_agent(
+            SGRToolCallingAgent, openai_client=client, toolkit=[FinalAnswerTool], execution_config=ExecutionConfig()
+        )
+        mock_config = Mock()
+        mock_config.execution.logs_dir = str(tmp_path)
+
+        with patch("sgr_agent_core.agent_config.GlobalConfig", return_value=mock_config):
+            await agent.execute()
+        LogWriter.get().flush()
+
+        assert agent._context.usage.model_dump() == {
+            "prompt_tokens": 300,
+            "completion_tokens": 30,
+            "total_tokens": 330,
+            "cached_tokens": 240,
+        }
+        assert agent._context.usage_per_step[1] == agent._context.usage
+        frames = [frame async for frame in agent.streaming_generator.stream()]
+        final = json.loads(frames[-2].removeprefix("data: "))
+        assert final["usage"]["total_tokens"] == 330
+        assert final["usage"]["prompt_tokens_details"] == {"cached_tokens": 240}
+        (log_file,) = tmp_path.iterdir()
+        records = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert records[-1]["usage"]["total_tokens"] == 330
+        assert [r["usage"]["cached_tokens"] for r in records if r["step_type"] == "tool_execution"] == [240]
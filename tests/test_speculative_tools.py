@@ -0,0 +1,222 @@
+"""Tests for speculative tool calls.
+
+This module contains tests for starting tools from partially streamed
+LLM responses in SGRAgent and ToolCallingAgent, and for confirming or
+cancelling them with the final response.
+"""
+
+import asyncio
+import json
+from typing import ClassVar
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionChunk
+from pydantic import Field
+
+from sgr_agent_core import ExecutionConfig, SearchConfig
+from sgr_agent_core.agents import SGRAgent, ToolCallingAgent
+from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.models import SourceData
+from sgr_agent_core.stream import OpenAIStreamingGenerator
+from sgr_agent_core.tools import FinalAnswerTool, WebSearchTool
+from tests.conftest import create_test_agent
+
+REASONING = {
+    "reasoning_steps": ["Search", "Answer"],
+    "current_situation": "Nothing known yet",
+    "plan_status": "Searching",
+    "enough_data": False,
+    "remaining_steps": ["Search"],
+    "task_completed": False,
+}
+
+events = []
+
+
+class SpeculativeSearchTool(BaseTool):
+    """Test tool that is safe to start speculatively."""
+
+    speculative: ClassVar[bool] = True
+    query: str = Field(description="Query")
+
+    async def fetch(self, context, config) -> str:
+        events.append(f"start {self.query}")
+        await asyncio.sleep(0.01)
+        events.append(f"done {self.query}")
+        return f"Results for {self.query}"
+
+    async def __call__(self, context, config, fetched: str | None = None, **_) -> str:
+        result = fetched if fetched is not None else await self.fetch(context, config)
+        context.searches_used += 1
+        return result
+
+
+class FakeStream:
+    """Stream yielding chunk events and returning the given final
+    message."""
+
+    def __init__(self, deltas: list[dict], final_message):
+        self._deltas = deltas
+        self._final_message = final_message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        for delta in self._deltas:
+            # Let started tool tasks run between chunks, like network waits do
+            await asyncio.sleep(0)
+            chunk = ChatCompletionChunk.model_validate(
+                {
+                    "id": "chunk",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "test",
+                    "choices": [{"index": 0, "delta": delta}],
+                }
+            )
+            yield Mock(type="chunk", chunk=chunk)
+        events.append("stream end")
+
+    async def get_final_completion(self):
+        return Mock(choices=[Mock(message=self._final_message)])
+
+
+@pytest.fixture(autouse=True)
+def clear_events():
+    events.clear()
+
+
+def _agent(agent_class, stream: FakeStream | None = None, speculative_tools: bool = True):
+    client = Mock(spec=AsyncOpenAI)
+    client.chat = Mock()
+    client.chat.completions = Mock()
+    client.chat.completions.stream = Mock(return_value=stream)
+    agent = create_test_agent(
+        agent_class,
+        openai_client=client,
+        execution_config=ExecutionConfig(speculative_tools=speculative_tools),
+        toolkit=[SpeculativeSearchTool, FinalAnswerTool],
+    )
+    agent.streaming_generator = Mock(spec=OpenAIStreamingGenerator)
+    agent._context.iteration = 1
+    return agent
+
+
+def _content_deltas(document: str, size: int = 8) -> list[dict]:
+    return [{"content": document[i : i + size]} for i in range(0, len(document), size)]
+
+
+async def _sgr_step(agent: SGRAgent, streamed_query: str, final_query: str) -> str:
+    response_format = await agent._prepare_tools()
+    function = {"tool_name_discriminator": SpeculativeSearchTool.tool_name}
+    streamed = json.dumps({**REASONING, "function": {**function, "query": streamed_query}})
+    final = response_format.model_validate({**REASONING, "function": {**function, "query": final_query}})
+    # The closing brace of the response arrives in its own chunk, after `function` is complete
+    deltas = _content_deltas(streamed[:-1]) + [{"content": streamed[-1]}]
+    agent.openai_client.chat.completions.stream.return_value = FakeStream(deltas, Mock(parsed=final))
+
+    reasoning = await agent._reasoning_phase()
+    return await agent._action_phase(await agent._select_action_phase(reasoning))
+
+
+class TestSGRAgentSpeculation:
+    """Tests for speculative tool calls in SGRAgent."""
+
+    @pytest.mark.asyncio
+    async def test_tool_started_before_stream_end_and_confirmed(self):
+        """Test that the tool starts once its arguments are streamed and its
+        result is reused."""
+        agent = _agent(SGRAgent)
+
+        result = await _sgr_step(agent, "python", "python")
+
+        assert result == "Results for python"
+        assert events.index("start python") < events.index("stream end")
+        assert events.count("start python") == 1
+        context = agent._context
+        assert (context.speculative_started, context.speculative_confirmed, context.speculative_cancelled) == (1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_mismatching_final_response_cancels(self):
+        """Test that a speculative call is cancelled if the final arguments
+        differ."""
+        agent = _agent(SGRAgent)
+
+        result = await _sgr_step(agent, "python", "rust")
+
+        assert result == "Results for rust"
+        assert "done python" not in events
+        assert (agent._context.speculative_confirmed, agent._context.speculative_cancelled) == (0, 1)
+        assert agent._context.searches_used == 1
+
+    @pytest.mark.asyncio
+    async def test_discarded_search_leaves_context_unchanged(self):
+        """Test that a finished speculative search that is then discarded
+        adds no sources, searches or budget use."""
+        agent = _agent(SGRAgent)
+        agent.config.search = SearchConfig()
+        source = SourceData(number=1, url="https://example.com", title="Example")
+        tool = WebSearchTool(reasoning="r", query="python")
+
+        with patch("sgr_agent_core.tools.web_search_tool.TavilySearchService") as service:
+            service.return_value.search = AsyncMock(return_value=[source])
+            service.return_value.cache_hits = service.return_value.cache_misses = 0
+            agent._start_speculative_call("1-action", tool)
+            await asyncio.sleep(0)
+            await agent._speculative_calls["1-action"][1]
+            agent._cancel_speculative_calls()
+
+        context = agent._context
+        assert (context.sources, context.searches, context.searches_used) == ({}, [], 0)
+        assert context.speculative_cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test that tools are not started early unless enabled."""
+        agent = _agent(SGRAgent, speculative_tools=False)
+
+        await _sgr_step(agent, "python", "python")
+
+        assert events.index("stream end") < events.index("start python")
+        assert agent._context.speculative_started == 0
+
+
+class TestToolCallingAgentSpeculation:
+    """Tests for speculative tool calls in ToolCallingAgent."""
+
+    @pytest.mark.asyncio
+    async def test_completed_tool_call_starts_while_next_streams(self):
+        """Test that a tool call starts while the next tool call arguments
+        are still streamed."""
+        tools = [SpeculativeSearchTool(query="first"), SpeculativeSearchTool(query="second")]
+        deltas = []
+        for index, tool in enumerate(tools):
+            arguments = tool.model_dump_json()
+            deltas.append(
+                {"tool_calls": [{"index": index, "function": {"name": tool.tool_name, "arguments": arguments[:5]}}]}
+            )
+            deltas += [
+                {"tool_calls": [{"index": index, "function": {"arguments": arguments[i : i + 5]}}]}
+                for i in range(5, len(arguments), 5)
+            ]
+        tool_calls = [Mock(function=Mock(parsed_arguments=tool)) for tool in tools]
+        agent = _agent(ToolCallingAgent, FakeStream(deltas, Mock(tool_calls=tool_calls)))
+
+        await agent._action_phase(await agent._select_action_phase())
+
+        assert events.index("start first") < events.index("stream end")
+        assert events.count("start first") == events.count("start second") == 1
+        assert [m["content"] for m in agent.conversation if m["role"] == "tool"] == [
+            "Results for first",
+            "Results for second",
+        ]
+        assert (agent._context.speculative_started, agent._context.speculative_confirmed) == (2, 2)
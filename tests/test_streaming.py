@@ -4,11 +4,14 @@ This module contains comprehensive tests for the StreamingGenerator and
 OpenAIStreamingGenerator classes used for SSE-like streaming.
 """
 
+import asyncio
 import json
+from unittest.mock import patch
 
 import pytest
+from openai.types.chat import ChatCompletionChunk
 
-from sgr_agent_core.stream import OpenAIStreamingGenerator, StreamingGenerator
+from sgr_agent_core.stream import OpenAIStreamingGenerator, StreamingGenerator, StreamReplayBuffer
 
 
 class TestStreamingGenerator:
@@ -581,3 +584,432 @@ class TestOpenAIStreamingGenerator:
         data = json.loads(json_str)
 
         assert len(data["choices"][0]["delta"]["content"]) == 10000
+
+
+def _chunk(delta: dict, finish_reason: str | None = None, **extra) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "upstream-id",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "upstream-model",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            **extra,
+        }
+    )
+
+
+def _payload(item: str) -> dict:
+    assert item.startswith("data: ") and item.endswith("\n\n")
+    return json.loads(item[6:])
+
+
+class TestChunkEncoding:
+    """Tests for pre-rendered chunk encoding."""
+
+    @pytest.mark.parametrize("content", ["plain", 'quote " and \\ slash', "line\nbreak\ttab", "юникод 🚀", "\x00\x1f"])
+    def test_spliced_chunk_matches_json_dump(self, content):
+        """Test that spliced text chunks decode to the same payload as a full
+        JSON dump."""
+        generator = OpenAIStreamingGenerator(model="agent-1")
+
+        generator.add_chunk_from_str(content)
+
+        assert _payload(generator.queue.get_nowait()) == {
+            "id": generator.id,
+            "object": "chat.completion.chunk",
+            "created": generator.created,
+            "model": "agent-1",
+            "system_fingerprint": generator.fingerprint,
+            "choices": [
+                {
+                    "delta": {"content": content, "role": "assistant", "tool_calls": None},
+                    "index": 0,
+                    "finish_reason": None,
+                    "logprobs": None,
+                }
+            ],
+            "usage": None,
+        }
+
+    def test_non_ascii_not_escaped(self):
+        generator = OpenAIStreamingGenerator()
+
+        generator.add_chunk_from_str("привет")
+
+        assert "привет" in generator.queue.get_nowait()
+
+    def test_text_chunk_skips_pydantic_dump(self):
+        """Test that upstream text chunks are spliced without dumping the
+        chunk and without modifying it."""
+        generator = OpenAIStreamingGenerator(model="agent-1")
+        chunk = _chunk({"content": "Hi"})
+
+        with patch.object(ChatCompletionChunk, "model_dump_json") as dump:
+            generator.add_chunk(chunk)
+
+        dump.assert_not_called()
+        data = _payload(generator.queue.get_nowait())
+        assert data["choices"][0]["delta"]["content"] == "Hi"
+        assert (data["id"], data["model"]) == (generator.id, "agent-1")
+        assert chunk.model == "upstream-model"
+
+    @pytest.mark.parametrize("arguments", ['{"a"', ': "при\\"вет\n"}', ""])
+    def test_arguments_chunk_skips_pydantic_dump(self, arguments):
+        """Test that tool call argument deltas are spliced into the envelope
+        and parse back to the upstream delta."""
+        generator = OpenAIStreamingGenerator(model="agent-1")
+        chunk = _chunk({"tool_calls": [{"index": 1, "function": {"arguments": arguments}}]})
+
+        with (
+            patch.object(ChatCompletionChunk, "model_dump_json") as dump_json,
+            patch.object(ChatCompletionChunk, "model_dump") as dump,
+        ):
+            generator.add_chunk(chunk)
+
+        dump_json.assert_not_called()
+        dump.assert_not_called()
+        forwarded = ChatCompletionChunk.model_validate(_payload(generator.queue.get_nowait()))
+        assert forwarded.choices[0].delta.tool_calls == chunk.choices[0].delta.tool_calls
+        assert (forwarded.id, forwarded.model) == (generator.id, "agent-1")
+
+    @pytest.mark.parametrize(
+        "chunk",
+        [
+            _chunk({"tool_calls": [{"index": 0, "id": "call_1", "type": "function", "function": {"name": "f"}}]}),
+            _chunk({"content": ""}, finish_reason="stop"),
+            _chunk({"content": "Hi", "reasoning_content": "thinking"}),
+        ],
+    )
+    def test_other_chunks_forwarded_in_full(self, chunk):
+        generator = OpenAIStreamingGenerator(model="agent-1")
+
+        generator.add_chunk(chunk)
+
+        data = _payload(generator.queue.get_nowait())
+        expected = chunk.model_dump(mode="json")
+        assert data["choices"] == expected["choices"]
+        assert (data["id"], data["model"]) == (generator.id, "agent-1")
+        assert chunk.model == "upstream-model"
+
+
+def _contents(generator: StreamingGenerator) -> list[str | None]:
+    """Drain queued frames, returning text contents or the frame type."""
+    items = []
+    while not generator.queue.empty():
+        item = generator.queue.get_nowait()
+        if item is None or item == "data: [DONE]\n\n":
+            items.append(item)
+            continue
+        choice = _payload(item)["choices"][0]
+        if choice["delta"].get("tool_calls"):
+            items.append("<tool_call>")
+        elif choice["finish_reason"]:
+            items.append("<finish>")
+        else:
+            items.append(choice["delta"]["content"])
+    return items
+
+
+class TestDeltaCoalescing:
+    """Tests for merging text deltas into fewer frames."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_within_interval_merged(self):
+        generator = OpenAIStreamingGenerator(coalesce_interval=0.01)
+
+        for token in ["Hel", "lo", ", ", "world"]:
+            generator.add_chunk_from_str(token)
+        assert generator.queue.qsize() == 0
+        await asyncio.sleep(0.02)
+
+        assert _contents(generator) == ["Hello, world"]
+        assert (generator.deltas_received, generator.frames_sent) == (4, 1)
+
+    @pytest.mark.asyncio
+    async def test_byte_threshold_flushes_immediately(self):
+        generator = OpenAIStreamingGenerator(coalesce_interval=10, coalesce_max_bytes=8)
+
+        generator.add_chunk_from_str("abcd")
+        generator.add_chunk_from_str("ef")
+        generator.add_chunk_from_str("ghij")
+        generator.add_chunk_from_str("k")
+
+        assert _contents(generator) == ["abcdefghij"]
+        generator.flush()
+        assert _contents(generator) == ["k"]
+
+    @pytest.mark.asyncio
+    async def test_tool_call_and_finish_flush_pending_text_first(self):
+        generator = OpenAIStreamingGenerator(coalesce_interval=10)
+
+        generator.add_chunk_from_str("thinking")
+        generator.add_tool_call("1-action", "search", "{}")
+        generator.add_chunk_from_str("result")
+        generator.finish("done")
+
+        assert _contents(generator) == ["thinking", "<tool_call>", "result", "<finish>", "data: [DONE]\n\n", None]
+
+    def test_without_event_loop_sent_immediately(self):
+        generator = OpenAIStreamingGenerator(coalesce_interval=0.05)
+
+        generator.add_chunk_from_str("text")
+
+        assert _contents(generator) == ["text"]
+
+    def test_disabled_by_default(self):
+        generator = OpenAIStreamingGenerator()
+
+        generator.add_chunk_from_str("a")
+        generator.add_chunk_from_str("b")
+
+        assert _contents(generator) == ["a", "b"]
+
+    def test_counters(self):
+        generator = OpenAIStreamingGenerator()
+
+        generator.add_chunk_from_str("привет")
+        frame = generator.queue.get_nowait()
+
+        assert generator.frames_sent == 1
+        assert generator.bytes_sent == len(frame.encode())
+
+
+async def _read(generator: StreamingGenerator, frames: int) -> list[str]:
+    """Read frames through stream() like an SSE client, then
+    disconnect."""
+    stream = generator.stream()
+    items = [await anext(stream) for _ in range(frames)]
+    await stream.aclose()
+    return items
+
+
+class TestBoundedBuffer:
+    """Tests for the bounded client buffer and overflow policies."""
+
+    def test_unbounded_by_default(self):
+        generator = StreamingGenerator()
+
+        for _ in range(100):
+            generator.add("x" * 1000)
+
+        assert generator.queue.qsize() == 100
+        assert generator.buffered_bytes == generator.peak_buffered_bytes == 100_000
+
+    @pytest.mark.asyncio
+    async def test_buffered_bytes_released_when_read(self):
+        generator = StreamingGenerator(max_buffered_bytes=100)
+        generator.add("a" * 10)
+        generator.add("b" * 20)
+        generator.finish()
+
+        assert [item async for item in generator.stream()] == ["a" * 10, "b" * 20]
+        assert generator.buffered_bytes == 0
+        assert generator.peak_buffered_bytes == 30
+        assert not generator.detached
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_client(self):
+        generator = StreamingGenerator(max_buffered_bytes=10, overflow="block")
+        generator.add("a" * 10)
+        generator.add("b")
+
+        drain = asyncio.create_task(generator.drain())
+        await asyncio.sleep(0)
+        assert not drain.done()
+        stream = generator.stream()
+        await anext(stream)
+        await asyncio.wait_for(drain, 1)
+        assert generator.buffered_bytes == 1
+
+    @pytest.mark.asyncio
+    async def test_drain_returns_for_other_policies(self):
+        generator = StreamingGenerator(max_buffered_bytes=1, overflow="drop")
+        generator.add("full")
+
+        await asyncio.wait_for(generator.drain(), 1)
+
+    def test_drop_text_deltas_keeps_structural_frames(self):
+        generator = OpenAIStreamingGenerator(max_buffered_bytes=1, overflow="drop")
+
+        generator.add_chunk_from_str("first")
+        generator.add_chunk_from_str("dropped")
+        generator.add_tool_call("1-action", "search", "{}")
+        generator.finish("done")
+
+        assert _contents(generator) == ["first", "<tool_call>", "<finish>", "data: [DONE]\n\n", None]
+        assert generator.frames_dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_merges_while_full(self):
+        generator = OpenAIStreamingGenerator(max_buffered_bytes=1, overflow="coalesce")
+        generator.add_chunk_from_str("first")
+        generator.add_chunk_from_str("a")
+        generator.add_chunk_from_str("b")
+
+        frames = await _read(generator, 2)
+
+        assert [_payload(frame)["choices"][0]["delta"]["content"] for frame in frames] == ["first", "ab"]
+        assert generator.frames_dropped == 0
+
+    def test_coalesce_detaches_client_too_far_behind(self):
+        generator = OpenAIStreamingGenerator(max_buffered_bytes=1, overflow="coalesce", coalesce_max_bytes=4)
+        generator.add_chunk_from_str("first")
+        for content in "abcde":
+            generator.add_chunk_from_str(content)
+
+        assert generator.detached
+        assert generator._pending == []
+        assert generator.queue.qsize() == 0
+        frames = [data for _, data, _ in generator.replay._frames_after(0)]
+        assert [_payload(frame)["choices"][0]["delta"]["content"] for frame in frames] == ["first", "abcde"]
+
+    def test_detach_when_full(self):
+        generator = StreamingGenerator(max_buffered_bytes=10, overflow="detach")
+        generator.add("a" * 10)
+        generator.add("b")
+        generator.add("c")
+
+        assert generator.detached
+        assert generator.queue.qsize() == 0
+        assert generator.buffered_bytes == 0
+        assert generator.frames_dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_buffering(self):
+        """Test that a client leaving mid-stream detaches it and a new
+        client attaches again."""
+        generator = StreamingGenerator()
+        generator.add("a")
+        generator.add("b")
+
+        assert await _read(generator, 1) == ["a"]
+        generator.add("c")
+        assert generator.detached
+        assert generator.queue.qsize() == 0
+        assert generator.frames_dropped == 2
+
+        next_frame = asyncio.create_task(anext(generator.stream()))
+        await asyncio.sleep(0)
+        generator.add("d")
+        assert await asyncio.wait_for(next_frame, 1) == "d"
+
+    def test_stats(self):
+        generator = OpenAIStreamingGenerator(max_buffered_bytes=1, overflow="drop")
+        generator.add_chunk_from_str("a")
+        generator.add_chunk_from_str("b")
+
+        stats = generator.stats()
+
+        assert stats["stream_frames"] == 1
+        assert stats["stream_deltas"] == 2
+        assert stats["stream_dropped_frames"] == 1
+        assert stats["stream_buffered_bytes"] == stats["stream_peak_buffered_bytes"] == generator.bytes_sent
+        assert stats["stream_detached"] is False
+
+
+async def _collect(frames) -> list[str]:
+    return [frame async for frame in frames]
+
+
+class TestReplayBuffer:
+    """Tests for stream subscribers and replay."""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_replay_and_follow(self):
+        """Test that subscribers get earlier and new frames with ids
+        while the stream() client still gets every frame."""
+        generator = StreamingGenerator()
+        generator.add("data: a\n\n")
+        first = asyncio.create_task(_collect(generator.subscribe()))
+        second = asyncio.create_task(_collect(generator.subscribe()))
+        await asyncio.sleep(0)
+        assert generator.replay.subscribers == 2
+
+        generator.add("data: b\n\n")
+        generator.finish()
+
+        expected = ["id: 1\ndata: a\n\n", "id: 2\ndata: b\n\n"]
+        assert await asyncio.wait_for(first, 1) == expected
+        assert await asyncio.wait_for(second, 1) == expected
+        assert [frame async for frame in generator.stream()] == ["data: a\n\n", "data: b\n\n"]
+        assert generator.replay.subscribers == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_after_last_event_id(self):
+        generator = StreamingGenerator()
+        for frame in "abc":
+            generator.add(f"data: {frame}\n\n")
+        generator.finish()
+
+        assert await _collect(generator.subscribe(2)) == ["id: 3\ndata: c\n\n"]
+        assert await _collect(generator.subscribe(4)) == []
+        assert len(await _collect(generator.subscribe(100))) == 3
+
+    @pytest.mark.asyncio
+    async def test_end_markers_between_segments_skipped(self):
+        """Test that a subscriber joining after a clarification round
+        replays both rounds."""
+        generator = StreamingGenerator()
+        generator.add("data: question\n\n")
+        generator.finish()
+        generator.add("data: answer\n\n")
+        generator.finish()
+
+        assert await _collect(generator.subscribe()) == ["id: 1\ndata: question\n\n", "id: 3\ndata: answer\n\n"]
+
+    @pytest.mark.asyncio
+    async def test_oldest_frames_evicted(self):
+        replay = StreamReplayBuffer(max_bytes=10)
+        for i in range(5):
+            replay.append(f"{i}" * 4, 4)
+        replay.append(None)
+
+        assert await _collect(replay.subscribe(1)) == ["id: 4\n3333", "id: 5\n4444"]
+
+    @pytest.mark.asyncio
+    async def test_release_trims_to_final_frames_after_subscribers_leave(self):
+        generator = OpenAIStreamingGenerator()
+        generator.add_chunk_from_str("text " * 100)
+        generator.finish("done")
+        subscriber = generator.subscribe()
+        assert (await anext(subscriber)).startswith("id: 1\n")
+
+        generator.release_replay()
+        assert generator.replay.last_id == 4
+        assert len(generator.replay._frames) == 4
+
+        await subscriber.aclose()
+        frames = await _collect(generator.subscribe())
+        assert [frame.split("\n", 1)[0] for frame in frames] == ["id: 2", "id: 3"]
+        assert frames[-1].endswith("data: [DONE]\n\n")
+        assert generator.replay.nbytes < len("text " * 100)
+
+    def test_frames_recorded_for_detached_client(self):
+        generator = StreamingGenerator(max_buffered_bytes=1, overflow="detach")
+
+        generator.add("a")
+        generator.add("b")
+
+        assert generator.detached
+        assert generator.replay.last_id == 2
+
+
+class TestUsage:
+    """Tests for token usage in the stream."""
+
+    def test_finish_reports_usage(self):
+        generator = OpenAIStreamingGenerator()
+        usage = {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+
+        generator.finish("done", usage=usage)
+
+        assert _payload(generator.queue.get_nowait())["usage"] == usage
+
+    def test_usage_only_chunks_not_forwarded(self):
+        generator = OpenAIStreamingGenerator()
+        chunk = _chunk({}, usage={"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2})
+
+        generator.add_chunk(chunk.model_copy(update={"choices": []}))
+
+        assert generator.queue.qsize() == 0
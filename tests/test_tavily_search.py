@@ -0,0 +1,121 @@
+"""Tests for TavilySearchService.
+
+This module contains tests for shared Tavily clients and conversion of
+Tavily responses to SourceData.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from sgr_agent_core.agent_definition import HTTPClientConfig, SearchConfig
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    yield
+    TavilySearchService._clients = {}
+    TavilySearchService._http_clients = []
+    for cache in TavilySearchService._caches.values():
+        cache.close()
+    TavilySearchService._caches = {}
+
+
+class TestTavilyClientSharing:
+    """Tests for the shared Tavily client pool."""
+
+    @pytest.mark.asyncio
+    async def test_services_share_client_per_key(self):
+        """Test that services with the same API key and URL reuse one
+        client."""
+        first = TavilySearchService(SearchConfig(tavily_api_key="key", max_results=3))
+        second = TavilySearchService(SearchConfig(tavily_api_key="key", max_results=8))
+        other = TavilySearchService(SearchConfig(tavily_api_key="other-key"))
+
+        assert first._client is second._client
+        assert other._client is not first._client
+        assert second._config.max_results == 8
+
+    @pytest.mark.asyncio
+    async def test_connection_limits_applied(self):
+        """Test that pool settings are applied to the shared HTTP client."""
+        service = TavilySearchService(
+            SearchConfig(tavily_api_key="key"), HTTPClientConfig(max_connections=4, timeout=15)
+        )
+
+        http_client = TavilySearchService._http_clients[0]
+        assert http_client._transport._pool._max_connections == 4
+        assert http_client.timeout.read == 15
+        assert service._client._client is http_client
+
+    @pytest.mark.asyncio
+    async def test_tavily_proxy_env_vars_applied(self, monkeypatch):
+        """Test that TAVILY_HTTPS_PROXY still routes requests of the shared
+        client through the proxy."""
+        monkeypatch.setenv("TAVILY_HTTPS_PROXY", "http://127.0.0.1:3128")
+        monkeypatch.delenv("TAVILY_HTTP_PROXY", raising=False)
+        TavilySearchService(SearchConfig(tavily_api_key="key"), HTTPClientConfig(max_connections=4))
+
+        http_client = TavilySearchService._http_clients[0]
+        pool = http_client._transport_for_url(httpx.URL("https://api.tavily.com/search"))._pool
+        assert pool._proxy_url.host == b"127.0.0.1"
+        assert pool._max_connections == 4
+        assert http_client._transport_for_url(httpx.URL("http://api.tavily.com")) is http_client._transport
+
+    @pytest.mark.asyncio
+    async def test_close_clients(self):
+        """Test that shutdown closes HTTP clients and new services get a fresh
+        client."""
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"))
+        http_client = TavilySearchService._http_clients[0]
+
+        await TavilySearchService.close_clients()
+
+        assert http_client.is_closed
+        assert TavilySearchService(SearchConfig(tavily_api_key="key"))._client is not service._client
+
+
+class TestTavilySearch:
+    """Tests for search and extract calls."""
+
+    @pytest.mark.asyncio
+    async def test_search_converts_results(self):
+        """Test that search passes the configured timeout and returns
+        sources."""
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), HTTPClientConfig(timeout=12))
+        response = {
+            "results": [
+                {"url": "https://example.com", "title": "Example", "content": "Snippet", "raw_content": "Full"},
+                {"url": "", "title": "Skipped"},
+            ]
+        }
+
+        with patch.object(service._client, "search", AsyncMock(return_value=response)) as mock_search:
+            sources = await service.search("query", max_results=2)
+
+        assert mock_search.await_args.kwargs["timeout"] == 12
+        assert len(sources) == 1
+        assert sources[0].full_content == "Full"
+        assert sources[0].char_count == 4
+
+    @pytest.mark.asyncio
+    async def test_search_uses_cache(self, tmp_path):
+        """Test that repeated normalized queries are served from cache and
+        counted."""
+        config = SearchConfig(tavily_api_key="key", cache_enabled=True, cache_path=str(tmp_path / "cache.sqlite3"))
+        response = {"results": [{"url": "https://example.com", "title": "Example", "content": "Snippet"}]}
+        first, second = TavilySearchService(config), TavilySearchService(config)
+
+        with patch.object(first._client, "search", AsyncMock(return_value=response)) as mock_search:
+            sources = await first.search("Quantum  computing", max_results=3)
+            sources[0].number = 42
+            cached = await second.search("quantum computing ", max_results=3)
+            await second.search("quantum computing", max_results=5)
+
+        assert mock_search.await_count == 2
+        assert (first.cache_hits, first.cache_misses) == (0, 1)
+        assert (second.cache_hits, second.cache_misses) == (1, 1)
+        assert cached[0].url == "https://example.com"
+        assert cached[0].number == 0
@@ -0,0 +1,179 @@
+"""Tests for token counting and token-based context budgets.
+
+This module contains tests for tokenizers, MessageTokenCounter and the
+context reduction of SGRToolCallingAgent.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+from pydantic import ValidationError
+
+from sgr_agent_core import ExecutionConfig
+from sgr_agent_core.agents import SGRToolCallingAgent
+from sgr_agent_core.services.token_counter import (
+    EstimateTokenizer,
+    MessageTokenCounter,
+    get_tokenizer,
+)
+from sgr_agent_core.tools import FinalAnswerTool
+from tests.conftest import create_test_agent
+
+
+class TestEstimateTokenizer:
+    """Tests for the offline token estimator."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("", 0),
+            ("Hello, world!", 4),
+            ("internationalization", 4),
+            ("Привет", 2),
+            ("2025", 2),
+            ("   ", 0),
+        ],
+    )
+    def test_count(self, text, expected):
+        """Test token counts of short texts."""
+        assert EstimateTokenizer().count(text) == expected
+
+    def test_spans_match_count(self):
+        """Test that spans() and count() agree."""
+        tokenizer = EstimateTokenizer()
+        text = "Schema-guided reasoning агентов, 2025 edition: internationalization!"
+
+        assert len(tokenizer.spans(text)) == tokenizer.count(text)
+
+    def test_truncate_head_and_tail(self):
+        """Test that truncation keeps the requested number of tokens from
+        either end."""
+        tokenizer = EstimateTokenizer()
+        text = "one two three four five"
+
+        assert tokenizer.truncate(text, 2) == "one two"
+        assert tokenizer.truncate(text, 2, keep="tail") == " four five"
+        assert tokenizer.truncate(text, 10) == text
+        assert tokenizer.truncate(text, 0) == ""
+
+
+class TestGetTokenizer:
+    """Tests for tokenizer selection by name."""
+
+    def test_estimate_is_default(self):
+        assert isinstance(get_tokenizer(), EstimateTokenizer)
+
+    def test_tiktoken_falls_back_to_estimate_when_not_installed(self):
+        """Test that a missing tiktoken package doesn't break agents."""
+        get_tokenizer.cache_clear()
+        with patch("sgr_agent_core.services.token_counter.importlib.util.find_spec", return_value=None):
+            tokenizer = get_tokenizer("tiktoken:o200k_base")
+        get_tokenizer.cache_clear()
+
+        assert isinstance(tokenizer, EstimateTokenizer)
+
+    def test_tiktoken_falls_back_to_estimate_when_encoding_unavailable(self):
+        """Test that an encoding that can't be downloaded doesn't break
+        agents."""
+        get_tokenizer.cache_clear()
+        with patch("sgr_agent_core.services.token_counter.TiktokenTokenizer", side_effect=ConnectionError("offline")):
+            tokenizer = get_tokenizer("tiktoken:o200k_base")
+        get_tokenizer.cache_clear()
+
+        assert isinstance(tokenizer, EstimateTokenizer)
+
+    def test_unknown_tokenizer_rejected_by_config(self):
+        with pytest.raises(ValidationError):
+            ExecutionConfig(tokenizer="sentencepiece")
+
+    def test_unknown_tiktoken_encoding_rejected_by_config(self):
+        pytest.importorskip("tiktoken")
+        with pytest.raises(ValidationError):
+            ExecutionConfig(tokenizer="tiktoken:o300k_base")
+
+
+class TestMessageTokenCounter:
+    """Tests for message token counting."""
+
+    def test_message_includes_overhead_and_tool_calls(self):
+        counter = MessageTokenCounter(EstimateTokenizer())
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"type": "function", "id": "1", "function": {"name": "search", "arguments": '{"q": 1}'}}],
+        }
+
+        assert counter.count_message(message) == counter.message_overhead + 1 + 7
+
+    def test_multimodal_content(self):
+        """Test that text parts are counted and images cost a fixed
+        amount."""
+        counter = MessageTokenCounter(EstimateTokenizer(), image_tokens=100)
+        content = [
+            {"type": "text", "text": "What is this?"},
+            {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 10_000}},
+        ]
+
+        assert counter.count_content(content) == 4 + 100
+
+    def test_content_counts_are_cached(self):
+        """Test that repeated content is tokenized once."""
+        tokenizer = Mock(count=Mock(return_value=3))
+        counter = MessageTokenCounter(tokenizer)
+        message = {"role": "tool", "content": "result"}
+
+        counter.count_messages([message, dict(message), message])
+
+        tokenizer.count.assert_called_once_with("result")
+
+
+class TestSGRToolCallingAgentContext:
+    """Tests for token budgets of SGRToolCallingAgent prompts."""
+
+    def _agent(self, **execution) -> SGRToolCallingAgent:
+        agent = create_test_agent(
+            SGRToolCallingAgent,
+            openai_client=Mock(spec=AsyncOpenAI),
+            execution_config=ExecutionConfig(**execution),
+            toolkit=[FinalAnswerTool],
+        )
+        agent._context.iteration = 1
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_tool_outputs_truncated_to_token_limit(self):
+        agent = self._agent(tool_output_max_tokens=5)
+        agent.conversation = [{"role": "tool", "content": "word " * 100, "tool_call_id": "1-action"}]
+
+        messages = await agent._prepare_small_context()
+
+        tool_message = messages[-1]
+        assert tool_message["content"].startswith("word word word word word\n")
+        assert tool_message["content"].endswith("...[tool output truncated]...")
+
+    @pytest.mark.asyncio
+    async def test_prompt_fits_token_budget(self):
+        """Test that old messages are dropped to fit the budget and the
+        newest message is kept."""
+        agent = self._agent(keep_last_messages=10, context_budget_tokens=1000)
+        agent.conversation = [{"role": "user", "content": f"message {i} " + "text " * 300} for i in range(5)]
+
+        messages = await agent._prepare_small_context()
+
+        assert agent.token_counter.count_messages(messages) <= 1000
+        assert messages[-1]["content"].startswith("message 4")
+        assert not any(m["content"].startswith("message 0") for m in messages)
+
+    @pytest.mark.asyncio
+    async def test_newest_message_clipped_if_nothing_fits(self):
+        """Test that the tail of the newest message is kept when it alone
+        exceeds the budget."""
+        agent = self._agent(context_budget_tokens=2000)
+        agent.conversation = [{"role": "user", "content": "text " * 5000 + "END"}]
+
+        messages = await agent._prepare_small_context()
+
+        assert messages[-1]["content"].endswith("END")
+        assert len(messages) == 2
+        assert agent.token_counter.count_messages(messages) <= 2000
@@ -0,0 +1,228 @@
+"""Tests for ToolCallingAgent.
+
+This module contains tests for executing several tool calls from one LLM
+response concurrently.
+"""
+
+import asyncio
+from typing import ClassVar
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from pydantic import Field
+
+from sgr_agent_core import ExecutionConfig, SearchConfig
+from sgr_agent_core.agents import ToolCallingAgent
+from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.tools import ClarificationTool, WebSearchTool
+from tests.conftest import create_test_agent
+
+concurrency = {"running": 0, "max_running": 0}
+
+
+class SlowTool(BaseTool):
+    """Test tool that tracks how many calls run at the same time."""
+
+    tool_name = "slowtool"
+    concurrency_safe: ClassVar[bool] = True
+    value: str = Field(description="Value to return")
+    delay: float = Field(default=0.01, description="Seconds to sleep")
+
+    async def __call__(self, context, config, **_) -> str:
+        concurrency["running"] += 1
+        concurrency["max_running"] = max(concurrency["max_running"], concurrency["running"])
+        await asyncio.sleep(self.delay)
+        concurrency["running"] -= 1
+        return self.value
+
+
+class OrderedTool(BaseTool):
+    """Test tool that is not concurrency-safe and records when it runs."""
+
+    tool_name = "orderedtool"
+    value: str = Field(description="Value to return")
+
+    async def __call__(self, context, config, **_) -> str:
+        events.append((self.value, concurrency["running"]))
+        return self.value
+
+
+class FailingTool(BaseTool):
+    """Concurrency-safe test tool that fails."""
+
+    tool_name = "failingtool"
+    concurrency_safe: ClassVar[bool] = True
+
+    async def __call__(self, context, config, **_) -> str:
+        raise RuntimeError("tool failed")
+
+
+events = []
+
+
+class FakeStream:
+    """Minimal stream returning a completion with the given tools
+    called."""
+
+    def __init__(self, tools: list[BaseTool], usage: CompletionUsage | None = None):
+        tool_calls = [Mock(function=Mock(parsed_arguments=tool)) for tool in tools]
+        self._completion = Mock(choices=[Mock(message=Mock(tool_calls=tool_calls))], usage=usage)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def get_final_completion(self):
+        return self._completion
+
+
+@pytest.fixture(autouse=True)
+def reset_concurrency():
+    concurrency.update(running=0, max_running=0)
+    events.clear()
+
+
+def _agent(tools: list[BaseTool], max_parallel_tool_calls: int = 4) -> ToolCallingAgent:
+    client = Mock(spec=AsyncOpenAI)
+    client.chat = Mock()
+    client.chat.completions = Mock()
+    client.chat.completions.stream = Mock(return_value=FakeStream(tools))
+    agent = create_test_agent(
+        ToolCallingAgent,
+        openai_client=client,
+        execution_config=ExecutionConfig(max_parallel_tool_calls=max_parallel_tool_calls),
+        toolkit=[SlowTool, OrderedTool, FailingTool, ClarificationTool],
+    )
+    agent._context.iteration = 1
+    return agent
+
+
+class TestParallelToolCalls:
+    """Tests for parallel execution of tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_all_tool_calls_recorded_in_order(self):
+        """Test that every tool call is executed and results keep the
+        response order."""
+        tools = [SlowTool(value="first", delay=0.03), SlowTool(value="second"), SlowTool(value="third")]
+        agent = _agent(tools)
+
+        selected = await agent._select_action_phase()
+        result = await agent._action_phase(selected)
+
+        assert selected is tools[0]
+        assert result == "first"
+        call_ids = ["1-action", "1-action-1", "1-action-2"]
+        assert [call["id"] for call in agent.conversation[-4]["tool_calls"]] == call_ids
+        assert agent.conversation[-3:] == [
+            {"role": "tool", "content": value, "tool_call_id": call_id}
+            for value, call_id in zip(["first", "second", "third"], call_ids)
+        ]
+        assert concurrency["max_running"] == 3
+        assert [entry["agent_tool_execution_result"] for entry in agent.log] == ["first", "second", "third"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that no more tool calls than the configured cap run at
+        once."""
+        agent = _agent([SlowTool(value=str(i)) for i in range(5)], max_parallel_tool_calls=2)
+
+        await agent._action_phase(await agent._select_action_phase())
+
+        assert concurrency["max_running"] == 2
+        assert len([m for m in agent.conversation if m["role"] == "tool"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_other_tools_run_after_concurrent_ones_in_order(self):
+        """Test that tools that are not concurrency-safe run one by one
+        after the concurrent calls finished."""
+        tools = [OrderedTool(value="report"), SlowTool(value="search"), OrderedTool(value="answer")]
+        agent = _agent(tools)
+
+        result = await agent._action_phase(await agent._select_action_phase())
+
+        assert result == "report"
+        assert events == [("report", 0), ("answer", 0)]
+        assert [m["content"] for m in agent.conversation if m["role"] == "tool"] == ["report", "search", "answer"]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_calls(self):
+        """Test that a failing call cancels the others and skips the
+        remaining tools."""
+        agent = _agent([SlowTool(value="slow", delay=10), FailingTool(), OrderedTool(value="answer")])
+
+        # The slow call would outlive the timeout unless it was cancelled
+        with pytest.raises(RuntimeError, match="tool failed"):
+            await asyncio.wait_for(agent._action_phase(await agent._select_action_phase()), 1)
+
+        assert events == []
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_streamed(self):
+        """Test that each tool call is passed to the streaming generator."""
+        agent = _agent([SlowTool(value="a"), SlowTool(value="b")])
+        agent.streaming_generator = Mock()
+
+        await agent._select_action_phase()
+
+        call_ids = [call.args[0] for call in agent.streaming_generator.add_tool_call.call_args_list]
+        assert call_ids == ["1-action", "1-action-1"]
+
+    @pytest.mark.asyncio
+    async def test_usage_recorded(self):
+        """Test that streamed calls request usage and record it for the
+        step."""
+        agent = _agent([SlowTool(value="a")])
+        usage = CompletionUsage(prompt_tokens=30, completion_tokens=5, total_tokens=35)
+        agent.openai_client.chat.completions.stream.return_value = FakeStream([SlowTool(value="a")], usage)
+
+        await agent._select_action_phase()
+
+        kwargs = agent.openai_client.chat.completions.stream.call_args.kwargs
+        assert kwargs["stream_options"] == {"include_usage": True}
+        assert agent._context.llm_calls_per_step == {1: 1}
+        assert agent._context.usage_per_step[1].total_tokens == 35
+
+    @pytest.mark.asyncio
+    async def test_parallel_searches_limited_to_search_budget(self):
+        """Test that parallel search calls beyond the remaining budget are
+        not sent to the search API."""
+        tools = [WebSearchTool(reasoning="Test", query=f"query {i}") for i in range(4)]
+        agent = _agent(tools)
+        agent.config.search = SearchConfig(tavily_api_key="key", max_searches=4)
+        agent._context.searches_used = 2
+        service = Mock(cache_hits=0, cache_misses=0)
+        service.search = AsyncMock(return_value=[])
+
+        with patch("sgr_agent_core.tools.web_search_tool.TavilySearchService", return_value=service):
+            await agent._action_phase(await agent._select_action_phase())
+
+        assert service.search.await_count == 2
+        assert agent._context.searches_used == 4
+        assert agent._context.searches_in_flight == 0
+        results = [message["content"] for message in agent.conversation[-4:]]
+        assert sum("Search limit of 4 reached" in result for result in results) == 2
+
+    @pytest.mark.asyncio
+    async def test_clarification_is_selected_action(self):
+        """Test that a clarification call is returned so the agent pauses
+        after the step."""
+        clarification = ClarificationTool(
+            reasoning="Need details",
+            unclear_terms=["term"],
+            assumptions=["one", "two"],
+            questions=["Which one?"],
+        )
+        agent = _agent([SlowTool(value="a"), clarification])
+
+        assert await agent._select_action_phase() is clarification
@@ -9,6 +9,7 @@ from unittest.mock import patch
 
 from sgr_agent_core.tools import (
     AdaptPlanTool,
+    BatchWebSearchTool,
     ClarificationTool,
     CreateReportTool,
     ExtractPageContentTool,
@@ -91,6 +92,16 @@ class TestToolsInitialization:
         assert tool.tool_name == "websearchtool"
         assert tool.query == "test query"
 
+    def test_batch_web_search_tool_initialization(self):
+        """Test BatchWebSearchTool initialization."""
+        tool = BatchWebSearchTool(
+            reasoning="Test",
+            queries=["first query", "second query"],
+        )
+        assert tool.tool_name == "batchwebsearchtool"
+        assert len(tool.queries) == 2
+        assert tool.max_results == 5
+
     def test_extract_page_content_tool_initialization(self):
         """Test ExtractPageContentTool initialization."""
         with patch("sgr_agent_core.tools.extract_page_content_tool.TavilySearchService"):